@@ -11,12 +11,13 @@ from gsuid_core.help.draw_new_plugin_help import get_new_help
 from ..version import DeltaUID_version
 from ..utils.const import ICON_PATH, PLUGIN_NAME
 from ..utils.image import get_footer
-from ..utils.resource_manager import resource_manager
+from ..utils.resource_manager import assets
 
 # 保持向后兼容导出
 ICON = ICON_PATH
 HELP_DATA = Path(__file__).parent / "help.json"
 ICON_PATH_MODULE = Path(__file__).parent / "icon_path"
+HELP_TEXTURE = Path(__file__).parent / "texture2d"
 
 PREFIX = get_plugin_available_prefix(PLUGIN_NAME)
 
@@ -30,15 +31,15 @@ async def get_help():
     return await get_new_help(
         plugin_name=PLUGIN_NAME,
         plugin_info={f"v{DeltaUID_version}": ""},
-        plugin_icon=resource_manager.load_image(ICON_PATH),
+        plugin_icon=assets.get(ICON_PATH).copy(),
         plugin_help=await get_help_data(),
         plugin_prefix=PREFIX,
         help_mode="dark",
-        banner_bg=resource_manager.get_texture("banner_bg.jpg"),
+        banner_bg=assets.get(HELP_TEXTURE / "banner_bg.jpg").copy(),
         banner_sub_text="鼠鼠我啊，要百万撤离了！",
-        help_bg=resource_manager.get_texture("bg.jpg"),
-        cag_bg=resource_manager.get_texture("cag_bg.png"),
-        item_bg=resource_manager.get_texture("item.png"),
+        help_bg=assets.get(HELP_TEXTURE / "bg.jpg").copy(),
+        cag_bg=assets.get(HELP_TEXTURE / "cag_bg.png").copy(),
+        item_bg=assets.get(HELP_TEXTURE / "item.png").copy(),
         icon_path=ICON_PATH_MODULE,
         footer=get_footer(),
         enable_cache=True,
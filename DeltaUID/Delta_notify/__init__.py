@@ -1,26 +1,51 @@
-import random
-import asyncio
+from typing import Dict, Tuple, Optional
 
-from gsuid_core.aps import scheduler
-
-# from gsuid_core.logger import logger
+from gsuid_core.server import on_core_start, on_core_shutdown
 from gsuid_core.subscribe import gs_subscribe
+from gsuid_core.utils.database.models import Subscribe
+
+from .notifier import UserKey, tqc_notifier
+from ..utils.scheduler import DueScheduler
+from ..utils.const import TQC_IDLE_RECHECK
+from ..utils.database.models import DFBind, DFUser
+
+TQCItem = Tuple[Subscribe, Optional[DFUser]]
+
+
+async def _load_tqc_subscribers() -> Dict[UserKey, TQCItem]:
+    datas = await gs_subscribe.get_subscribe("ss特勤处订阅") or []
+    uid_map = await DFBind.get_uid_map(s.user_id for s in datas)
+    users = await DFUser.select_by_uids(uid_map.values())
+    items = {
+        (s.user_id, s.bot_id): (s, users.get(uid_map.get((s.user_id, s.bot_id), "")))
+        for s in datas
+    }
+    tqc_notifier.retain(items)
+    return items
+
+
+async def _check_tqc(key: UserKey, item: TQCItem) -> bool:
+    ok, next_at = await tqc_notifier.check(*item)
+    tqc_scheduler.reschedule(key, next_at)
+    return ok
+
+
+# 按各用户最早的预计完成时间检查特勤处, 取代固定间隔轮询
+tqc_scheduler: DueScheduler[UserKey, TQCItem] = DueScheduler(
+    "特勤处推送",
+    _load_tqc_subscribers,
+    _check_tqc,
+    default_interval=TQC_IDLE_RECHECK,
+    after_batch=tqc_notifier.save,
+)
 
-from ..Delta_user.msg_info import MsgInfo
-from ..utils.database.models import DFUser
 
+@on_core_start
+async def df_tqc_start():
+    tqc_scheduler.start()
 
-@scheduler.scheduled_job("cron", minute="*/2")
-async def df_tqc_rank():
-    await asyncio.sleep(random.randint(0, 1))
-    datas = await gs_subscribe.get_subscribe("ss特勤处订阅")
-    if not datas:
-        return
 
-    for subscribe in datas:
-        user_data = await DFUser.select_data(subscribe.user_id, subscribe.bot_id)
-        if user_data is None:
-            return
-        msg = MsgInfo(user_data.user_id, user_data.bot_id)
-        tqc = await msg.get_tqc()
-        await subscribe.send(tqc)
+@on_core_shutdown
+async def df_tqc_stop():
+    await tqc_scheduler.stop()
+    await tqc_notifier.save()
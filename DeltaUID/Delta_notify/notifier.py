@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import asyncio
+from typing import Any, Dict, List, Tuple, Iterable, Optional
+from pathlib import Path
+
+from gsuid_core.logger import logger
+from gsuid_core.data_store import get_res_path
+from gsuid_core.utils.database.models import Subscribe
+
+from ..utils.models import TQCData
+from ..Delta_user.msg_info import MsgInfo
+from ..utils.database.models import DFUser
+from ..utils.const import TQC_MAX_RECHECK, TQC_FINISH_GRACE, TQC_IDLE_RECHECK
+
+# (user_id, bot_id)
+UserKey = Tuple[str, str]
+
+TQC_SNAPSHOT_PATH = get_res_path() / "DeltaUID" / "tqc_snapshots.json"
+# 对比状态变化用到的字段; left_time/progress 等随时间变化的字段不保存
+SNAPSHOT_FIELDS = ("place_name", "status", "object_name", "push_time")
+
+
+def snapshot(devices: List[TQCData]) -> List[TQCData]:
+    """只保留设备状态中用于对比的字段"""
+    return [
+        {k: device[k] for k in SNAPSHOT_FIELDS if k in device}  # type: ignore[misc]
+        for device in devices
+    ]
+
+
+def diff_devices(old: List[TQCData], new: List[TQCData], now: float) -> List[str]:
+    """对比前后两次特勤处状态, 返回需要推送的状态变化"""
+    previous = {device["place_name"]: device for device in old}
+    changes: List[str] = []
+    for device in new:
+        before = previous.get(device["place_name"])
+        if before is None or before.get("status") != "producing":
+            continue
+        if device.get("status") == "producing" and device.get(
+            "push_time"
+        ) == before.get("push_time"):
+            continue
+        # 之前在生产: 现在空闲, 或者已过预计完成时间后换了一批
+        if device.get("status") != "producing" or before.get("push_time", 0) <= now:
+            place = device["place_name"]
+            changes.append(
+                f"{place}：{before.get('object_name', '')} 生产完成，设备已空闲"
+            )
+    return changes
+
+
+def next_check(devices: List[TQCData], now: float) -> float:
+    """下一次需要检查的时间: 最早的预计完成时间, 全部空闲时按固定间隔复查
+
+    已过预计完成时间但仍显示生产中(状态接口缓存或上游时钟偏差)时,
+    至少间隔 TQC_FINISH_GRACE 再查, 避免每秒重复请求.
+    """
+    push_times = [
+        device.get("push_time", 0)
+        for device in devices
+        if device.get("status") == "producing"
+    ]
+    if not push_times:
+        return now + TQC_IDLE_RECHECK
+    due = max(min(push_times), now) + TQC_FINISH_GRACE
+    return min(due, now + TQC_MAX_RECHECK)
+
+
+class TQCNotifier:
+    """特勤处状态推送
+
+    每个订阅用户保存上一次的设备状态, 只推送状态变化(生产完成/设备空闲),
+    并给出按最早预计完成时间计算的下一次检查时间.
+    设备状态保存在 TQC_SNAPSHOT_PATH, 重启后首次检查仍与停机前的状态对比,
+    停机期间完成的生产同样会推送.
+    """
+
+    def __init__(self, path: Path = TQC_SNAPSHOT_PATH):
+        self.path = path
+        self._snapshots: Dict[UserKey, List[TQCData]] = {}
+        self._loaded = False
+        self._dirty = False
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, mode="r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"[DF] 读取特勤处状态 {self.path} 失败: {e}")
+            return
+        for entry in data:
+            key = (entry["user_id"], entry["bot_id"])
+            self._snapshots.setdefault(key, entry["devices"])
+
+    def _write(self, data: List[Dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, mode="w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    async def save(self) -> None:
+        """有变化时把设备状态写回磁盘, 每批检查结束后调用"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        data = [
+            {"user_id": user_id, "bot_id": bot_id, "devices": devices}
+            for (user_id, bot_id), devices in self._snapshots.items()
+        ]
+        try:
+            await asyncio.to_thread(self._write, data)
+        except OSError as e:
+            self._dirty = True
+            logger.error(f"[DF] 保存特勤处状态失败: {e}")
+
+    def retain(self, keys: Iterable[UserKey]) -> None:
+        """丢弃已取消订阅用户的状态"""
+        self._load()
+        alive = set(keys)
+        for key in [k for k in self._snapshots if k not in alive]:
+            del self._snapshots[key]
+            self._dirty = True
+
+    async def check(
+        self, subscribe: Subscribe, user_data: Optional[DFUser]
+    ) -> Tuple[bool, float]:
+        """检查单个订阅用户的特勤处状态并推送变化, 返回 (是否成功, 下一次检查时间)"""
+        key = (subscribe.user_id, subscribe.bot_id)
+        now = time.time()
+        if user_data is None:
+            logger.debug(
+                f"[DF]特勤处订阅用户 {subscribe.user_id} 未绑定三角洲账号，跳过"
+            )
+            return False, now + TQC_IDLE_RECHECK
+
+        devices = await MsgInfo(
+            user_data.user_id, user_data.bot_id, user_data
+        ).get_tqc()
+        if isinstance(devices, str):
+            logger.debug(f"[DF]特勤处订阅用户 {subscribe.user_id}: {devices}")
+            return False, now + TQC_IDLE_RECHECK
+
+        self._load()
+        old = self._snapshots.get(key)
+        current = snapshot(devices)
+        # 只在状态真正变化时标记, 避免每批检查都重写状态文件
+        if current != old:
+            self._snapshots[key] = current
+            self._dirty = True
+        # 新订阅的首次检查只记录状态, 不推送
+        changes = diff_devices(old, devices, now) if old is not None else []
+        if changes:
+            await subscribe.send("\n".join(changes))
+        return True, next_check(devices, now)
+
+
+tqc_notifier = TQCNotifier()
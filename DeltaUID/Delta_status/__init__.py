@@ -2,12 +2,28 @@ from pathlib import Path
 
 from PIL import Image
 
+from gsuid_core.sv import SV
+from gsuid_core.bot import Bot
+from gsuid_core.models import Event
 from gsuid_core.subscribe import gs_subscribe
+from gsuid_core.data_store import get_res_path
 from gsuid_core.status.plugin_status import register_status
 
+from ..utils.metrics import metrics
+from ..utils.avatar_cache import avatar_cache
+from ..utils.api.api import get_api_snapshot
 from ..utils.database.models import DFBind, DFUser
+from ..Delta_user.image import (
+    render_pool,
+    render_cache,
+    benchmark_cards,
+    get_asset_stats,
+)
 
 ICON = Path(__file__).parent.parent.parent / "icon.png"
+METRICS_PATH = get_res_path() / "DeltaUID" / "metrics.json"
+
+df_metrics = SV("ss接口统计", pm=1)
 
 
 def get_ICON():
@@ -58,6 +74,83 @@ async def get_sign_num():
     return len(datas) if datas else 0
 
 
+async def get_api_rpm():
+    return sum(m["rpm"] for m in metrics.endpoint_summary().values())
+
+
+async def get_api_slowest():
+    endpoints = metrics.endpoint_summary()
+    if not endpoints:
+        return "无"
+    name, data = max(endpoints.items(), key=lambda x: x[1]["p95_ms"])
+    return f"{name} p95 {data['p95_ms']}ms"
+
+
+async def get_api_error_rate():
+    endpoints = [m for m in metrics.endpoints.values() if m.total]
+    total = sum(m.total for m in endpoints)
+    errors = sum(m.errors for m in endpoints)
+    return f"{errors / total:.2%}" if total else "0.00%"
+
+
+def _tick_status(name: str):
+    async def get_tick():
+        tick = metrics.tick_summary().get(name)
+        if tick is None:
+            return "未运行"
+        return f"{tick['last_s']}s (p95 {tick['p95_s']}s)"
+
+    return get_tick
+
+
+def format_snapshot(snapshot: dict) -> str:
+    lines = [f"运行 {snapshot['uptime']}s"]
+    for name, data in snapshot["endpoints"].items():
+        lines.append(
+            f"{name}: {data['rpm']}次/分 p50 {data['p50_ms']}ms p95 {data['p95_ms']}ms "
+            f"p99 {data['p99_ms']}ms 错误率 {data['error_rate']:.2%} 重试 {data['retries']}"
+        )
+    for name, data in snapshot["ticks"].items():
+        lines.append(
+            f"[{name}] 上轮 {data['last_s']}s p95 {data['p95_s']}s 最长 {data['max_s']}s"
+        )
+    cache = snapshot["cache"]
+    lines.append(f"缓存: {cache['entries']}条 命中率 {cache['hit_rate']:.2%}")
+    if "render" in snapshot:
+        render = snapshot["render"]
+        lines.append(
+            f"出图缓存: {render['entries']}张 {render['bytes'] / 1048576:.1f}MB "
+            f"命中率 {render['hit_rate']:.2%} 合并 {render['shared']}"
+        )
+    for name, data in snapshot.get("images", {}).items():
+        lines.append(
+            f"{name}: {data['entries']}张 {data['bytes'] / 1048576:.1f}/{data['max_bytes'] / 1048576:.0f}MB "
+            f"命中率 {data['hit_rate']:.2%} 淘汰 {data['evictions']}"
+        )
+    lines.append(
+        f"限流: 等待 {snapshot['rate_limit']['delayed']}次 共 {snapshot['rate_limit']['wait_time']}s"
+    )
+    return "\n".join(lines)
+
+
+@df_metrics.on_fullmatch(("接口统计"), block=True)
+async def send_metrics_msg(bot: Bot, ev: Event):
+    snapshot = get_api_snapshot()
+    snapshot["render"] = render_cache.stats()
+    snapshot["images"] = {
+        "纹理缓存": await render_pool.run(get_asset_stats),
+        "头像缓存": avatar_cache.stats(),
+    }
+    metrics.dump(METRICS_PATH, snapshot)
+    await bot.send(format_snapshot(snapshot))
+
+
+@df_metrics.on_fullmatch(("出图测试"), block=True)
+async def send_encode_benchmark(bot: Bot, ev: Event):
+    await bot.send("正在测试各编码预设，请稍候")
+    await bot.send(await render_pool.run(benchmark_cards))
+
+
 register_status(
     get_ICON(),
     "DeltaUID",
@@ -65,5 +158,10 @@ register_status(
         "账户数量": get_add_num,
         "用户数量": get_user_num,
         "推送数量": get_sign_num,
+        "接口请求/分": get_api_rpm,
+        "接口错误率": get_api_error_rate,
+        "最慢接口": get_api_slowest,
+        "战绩推送耗时": _tick_status("战绩推送"),
+        "特勤处推送耗时": _tick_status("特勤处推送"),
     },
 )
@@ -1,18 +1,37 @@
-import random
+import re
+import time
 import asyncio
-from typing import cast
+from typing import Dict, List, Tuple, Optional, cast
 
 from gsuid_core.sv import SV
 from gsuid_core.aps import scheduler
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
+from gsuid_core.server import on_core_start, on_core_shutdown
 from gsuid_core.subscribe import gs_subscribe
-from gsuid_core.utils.image.image_tools import get_pic, get_event_avatar
+from gsuid_core.utils.database.models import Subscribe
 
-from .image import draw_record_sol, draw_record_tdm, draw_df_info_img
+from .image import render_pool, draw_record_sol, draw_record_tdm, draw_df_info_img
 from .utils import get_user_id, check_last_call, update_last_call
-from .msg_info import MsgInfo, create_item_json
+from .msg_info import (
+    ERROR_LOGIN_EXPIRED,
+    ERROR_UNBOUND_ACCOUNT,
+    MsgInfo,
+    record_price_history,
+    refresh_item_catalog,
+)
+from ..utils.scheduler import DueScheduler
+from ..utils.item_catalog import item_catalog
+from ..utils.avatar_cache import avatar_cache
+from ..utils.price_history import price_history
+from ..utils.const import RECORD_POLL_INTERVAL
+from ..utils.activity import activity_tracker
+from ..utils.api.utils import BROADCAST_EXPIRED_MINUTES
+from ..utils.api.limiter import background_priority
+from ..utils.api.api import close_global_client
+from ..utils.database.models import DFBind, DFUser
+from ..utils.database.record_buffer import record_buffer
 from ..utils.models import InfoData, WeeklyData, RecordSolData, RecordTdmData
 
 # 用户调用记录：{user_id: last_call_timestamp}
@@ -70,20 +89,25 @@ async def get_record(bot: Bot, ev: Event):
     index, record = await data.get_record(ev.text.strip() if ev.text else "")
 
     if any(isinstance(x, str) for x in [msg, week_data, record]):
-        await bot.send(next(x for x in [msg, week_data, record] if isinstance(x, str)), at_sender=True)
+        await bot.send(
+            next(x for x in [msg, week_data, record] if isinstance(x, str)),
+            at_sender=True,
+        )
         return
     logger.info(record)
     if index == 1:
         record_sol = cast(list[RecordSolData], record)
         img = await draw_record_sol(
-            await get_event_avatar(ev),
+            await avatar_cache.get_event_avatar(ev),
             record_sol,
             cast(WeeklyData, week_data),
             cast(InfoData, msg),
         )
     elif index == 2:
         record_tdm = cast(list[RecordTdmData], record)
-        img = await draw_record_tdm(await get_event_avatar(ev), record_tdm, cast(InfoData, msg))
+        img = await draw_record_tdm(
+            await avatar_cache.get_event_avatar(ev), record_tdm, cast(InfoData, msg)
+        )
     else:
         img = None
 
@@ -92,6 +116,23 @@ async def get_record(bot: Bot, ev: Event):
     update_last_call(user_id)
 
 
+def _parse_tqc_profit_args(text: str) -> Tuple[Optional[float], Optional[float]]:
+    """解析利润排行参数, 如 "预算50w 8小时" -> (500000, 8)"""
+    hours = None
+    match = re.search(r"(\d+(?:\.\d+)?)\s*(?:h|小时)", text, re.I)
+    if match:
+        hours = float(match.group(1))
+        text = text[: match.start()] + text[match.end() :]
+    budget = None
+    match = re.search(r"(\d+(?:\.\d+)?)\s*(w|万|k|千)?", text, re.I)
+    if match:
+        unit = {"w": 10000, "万": 10000, "k": 1000, "千": 1000}.get(
+            (match.group(2) or "").lower(), 1
+        )
+        budget = float(match.group(1)) * unit
+    return budget, hours
+
+
 @df_tqc.on_command(("特勤处", "tqc"), block=True)
 async def get_tqc(
     bot: Bot,
@@ -117,6 +158,11 @@ async def get_tqc(
             ev,
         )
         await bot.send("取消订阅成功！")
+    elif raw_text.startswith("利润"):
+        logger.info("[DF]正在执行三角洲特勤处利润排行功能")
+        budget, hours = _parse_tqc_profit_args(raw_text[2:])
+        data = MsgInfo(ev.user_id, bot.bot_id)
+        await bot.send(await data.get_best_tqc_price(budget, hours), at_sender=True)
 
     else:
         logger.info("[DF]正在执行三角洲特勤处功能")
@@ -130,7 +176,9 @@ async def watch_record(
     bot: Bot,  # Bot对象，用于与机器人交互
     ev: Event,  # 事件对象，包含事件相关信息
 ):
-    logger.info("[DF]正在执行三角洲战绩订阅功能")  # 记录日志，表示正在执行三角洲战绩订阅功能
+    logger.info(
+        "[DF]正在执行三角洲战绩订阅功能"
+    )  # 记录日志，表示正在执行三角洲战绩订阅功能
 
     user_id = ev.user_id  # 获取用户ID
     data = MsgInfo(user_id, bot.bot_id)  # 创建MsgInfo对象，用于处理消息相关信息
@@ -144,7 +192,7 @@ async def watch_record(
     # uid = await DFBind.get_uid_by_game(user_id, bot.bot_id)
     # if msg and uid:
     #     logger.info("执行")
-    #     record = await data.watch_record(msg["user_name"], uid, await get_pic(msg["avatar"]))
+    #     record = await data.watch_record(uid)
     #     await bot.send(str(record[0])) if record else None
 
 
@@ -190,7 +238,10 @@ async def check_subscriptions(
         await bot.send("您当前没有订阅记录。", at_sender=True)
         return
 
-    await bot.send(f"开始检查您的 {len(user_subscriptions)} 个订阅，每个订阅将进行三次验证...", at_sender=True)
+    await bot.send(
+        f"开始检查您的 {len(user_subscriptions)} 个订阅，每个订阅将进行三次验证...",
+        at_sender=True,
+    )
 
     failed_subscriptions = []
     success_count = 0
@@ -230,7 +281,9 @@ async def check_subscriptions(
                 await asyncio.sleep(30)
 
         if all_failed:
-            failed_subscriptions.append({"subscribe": subscribe, "uid": uid, "reasons": failure_reasons})
+            failed_subscriptions.append(
+                {"subscribe": subscribe, "uid": uid, "reasons": failure_reasons}
+            )
             logger.info(f"[DF]订阅 {i + 1} 三次验证均失败，标记为失效")
         else:
             success_count += 1
@@ -269,7 +322,9 @@ async def check_subscriptions(
 
         report += f"已清理 {cleaned_count} 个失效订阅。"
     elif failed_subscriptions and not cleanup_mode:
-        report += "\n提示：使用'检查订阅 清理'或'清理订阅'命令可以自动清理这些失效订阅。"
+        report += (
+            "\n提示：使用'检查订阅 清理'或'清理订阅'命令可以自动清理这些失效订阅。"
+        )
 
     await bot.send(report, at_sender=True)
 
@@ -285,44 +340,121 @@ async def get_depot(
     await bot.send(message=a, at_sender=True) if a is not None else None
 
 
-@scheduler.scheduled_job("cron", minute="*/2")
-async def df_notify_rank():
-    times = 0
-    logger.debug("[DF]正在执行战绩推送功能")
-    await asyncio.sleep(random.randint(0, 1))
-    datas = await gs_subscribe.get_subscribe("ss战绩订阅")
-    if not datas:
-        return
-    for subscribe in datas:
-        logger.debug(f"[DF]正在为订阅用户 {subscribe.user_id} 推送战绩")
-        uid = subscribe.extra_message
-        if uid is None:
-            logger.debug(f"[DF]用户 {subscribe.user_id} 未绑定三角洲账号，跳过")
-            continue
-        user_id = subscribe.user_id
-        data = MsgInfo(user_id, subscribe.bot_id)
+async def _push_record(
+    subscribe: Subscribe,
+    user_data: Optional[DFUser],
+    max_age_minutes: int = BROADCAST_EXPIRED_MINUTES,
+) -> bool:
+    """为单个订阅用户检查并推送新战绩, 返回 False 表示处理失败"""
+    logger.debug(f"[DF]正在为订阅用户 {subscribe.user_id} 推送战绩")
+    uid = subscribe.extra_message
+    if uid is None:
+        logger.debug(f"[DF]用户 {subscribe.user_id} 未绑定三角洲账号，跳过")
+        return True
+    user_id = subscribe.user_id
+    if user_data is None:
+        logger.debug(f"[DF]{user_id}账号: {ERROR_UNBOUND_ACCOUNT}")
+        return False
+    data = MsgInfo(user_id, subscribe.bot_id, user_data)
+
+    record_sol = await data.watch_record(uid, max_age_minutes)
+    if record_sol in (ERROR_UNBOUND_ACCOUNT, ERROR_LOGIN_EXPIRED):
+        logger.debug(f"[DF]{user_id}账号: {record_sol}")
+        return False
+    if not record_sol:
+        logger.debug(f"[DF]用户 {subscribe.user_id} 未找到新战绩，跳过")
+    elif isinstance(record_sol, list):
+        await subscribe.send(str(record_sol[0]))
+    elif isinstance(record_sol, str | bytes):
+        await subscribe.send(record_sol)
+    else:
+        logger.debug(f"[DF]用户 {subscribe.user_id} 未找到新战绩，跳过")
+    return True
+
+
+RecordItem = Tuple[Subscribe, Optional[DFUser]]
+
+# 三角洲uid -> 订阅了该账号战绩的 (user_id, bot_id)
+_record_keys: Dict[str, List[Tuple[str, str]]] = {}
+
+
+async def _load_subscribers() -> Dict[Tuple[str, str], RecordItem]:
+    """一次性查出所有战绩订阅及其当前绑定的账号数据: (user_id, bot_id) -> (订阅, DFUser)"""
+    datas = await gs_subscribe.get_subscribe("ss战绩订阅") or []
+    uid_map = await DFBind.get_uid_map(s.user_id for s in datas)
+    users = await DFUser.select_by_uids(uid_map.values())
+    items = {
+        (s.user_id, s.bot_id): (s, users.get(uid_map.get((s.user_id, s.bot_id), "")))
+        for s in datas
+    }
+    _record_keys.clear()
+    for key, (subscribe, _) in items.items():
+        if subscribe.extra_message:
+            _record_keys.setdefault(subscribe.extra_message, []).append(key)
+    activity_tracker.retain(_record_keys)
+    return items
+
+
+async def _poll_record(key: Tuple[str, str], item: RecordItem) -> bool:
+    """轮询一个订阅用户的战绩, 按玩家活跃度安排下一次轮询"""
+    subscribe, user_data = item
+    uid = subscribe.extra_message
+    if uid is None:
+        return await _push_record(subscribe, user_data)
+    now = time.time()
+    ok = await _push_record(
+        subscribe, user_data, activity_tracker.max_age_minutes(uid, now)
+    )
+    record_scheduler.reschedule(key, now + activity_tracker.next_interval(uid, now))
+    return ok
 
-        msg = await data.get_msg_info()
-        if isinstance(msg, str):
-            logger.debug(f"[DF]{user_id}账号: {msg}")
-            continue
 
-        record_sol = await data.watch_record(msg["user_name"], uid, await get_pic(msg["avatar"]))
-        if not record_sol:
-            logger.debug(f"[DF]用户 {subscribe.user_id} 未找到新战绩，跳过")
-            continue
-        elif isinstance(record_sol, list):
-            await subscribe.send(str(record_sol[0]))
-            times += 1
+def _on_player_active(uid: str) -> None:
+    """玩家使用了交互命令, 立即恢复其战绩轮询"""
+    for key in _record_keys.get(uid, []):
+        record_scheduler.reschedule(key, time.time())
 
-        elif isinstance(record_sol, str | bytes):
-            await subscribe.send(record_sol)
-            times += 1
-        else:
-            logger.debug(f"[DF]用户 {subscribe.user_id} 未找到新战绩，跳过")
-            continue
-    if times > 0:
-        logger.debug(f"[DF] 共为 {times} 个用户推送战绩")
+
+activity_tracker.listen(_on_player_active)
+
+# 按各用户的下次到期时间轮询战绩, 取代固定间隔的全员轮询
+record_scheduler: DueScheduler[Tuple[str, str], RecordItem] = DueScheduler(
+    "战绩推送",
+    _load_subscribers,
+    _poll_record,
+    default_interval=RECORD_POLL_INTERVAL,
+    after_batch=record_buffer.flush,
+)
+
+
+@on_core_start
+async def df_record_start():
+    render_pool.start()
+    record_scheduler.start()
+
+
+@scheduler.scheduled_job("cron", hour="*/6", minute=17)
+async def df_refresh_item_catalog():
+    logger.debug("[DF]正在刷新物品目录")
+    with background_priority():
+        await refresh_item_catalog()
+
+
+@scheduler.scheduled_job("cron", minute=5)
+async def df_record_price_history():
+    logger.debug("[DF]正在记录价格历史")
+    with background_priority():
+        await record_price_history()
+
+
+@on_core_shutdown
+async def df_shutdown():
+    """退出前停止战绩轮询与渲染执行器, 写回缓冲中的战绩记录和价格历史并关闭连接池"""
+    await record_scheduler.stop()
+    render_pool.stop()
+    await record_buffer.flush()
+    await price_history.flush()
+    await close_global_client()
 
 
 @df_pa.on_command("价格", block=True)
@@ -335,24 +467,58 @@ async def handle_price_query(bot: Bot, event: Event) -> None:
     logger.info(f"[DF] 用户 {event.user_id} 正在执行价格查询")
     data = MsgInfo(event.user_id, bot.bot_id)
     item_name = event.text.strip() if event.text else ""
-    # 物品检索id
-    a = await create_item_json(event, bot, dl=False)
-    item_id: str | None = None
-    if isinstance(a, list) and len(a) > 0:
-        for item in a:
-            if str(item.get("objectName", "")) == item_name:
-                item_id = str(item.get("objectID", ""))
-                # logger.info(f"[DF] 用户 {event.user_id} 输入物品名称 {item_id} 对应物品id {item_id}")
-                break
-    else:
-        await bot.send(a, at_sender=True)
+    if not item_name:
+        await bot.send("请输入物品名称", at_sender=True)
         return
-
-    if item_id is None:
-        await bot.send("请输入物品id", at_sender=True)
+    queries = [q for q in re.split(r"[\s,，、;；]+", item_name) if q]
+    # 目录为空时先同步拉取一次, 之后由定时任务在后台刷新
+    if not len(item_catalog) and not await refresh_item_catalog():
+        await bot.send("物品目录暂不可用，请稍后再试", at_sender=True)
+        return
+    # 多个物品合并为一张表格
+    if len(queries) > 1:
+        await bot.send(await data.get_item_prices(queries), at_sender=True)
+        return
+    items = item_catalog.search(item_name)
+    if len(items) > 1:
+        names = "\n".join(
+            f"{i + 1}. {item['objectName']}" for i, item in enumerate(items)
+        )
+        await bot.send(f"找到多个相似物品，请输入完整名称:\n{names}", at_sender=True)
+        return
+    if not items:
+        await bot.send("未找到该物品", at_sender=True)
         return
+
+    item_id = str(items[0]["objectID"])
+    item_name = items[0]["objectName"]
     item_price_data = await data.get_item_price(item_id, item_name)
     if item_price_data:
         await bot.send(item_price_data, at_sender=True)
     else:
         await bot.send("未找到该物品", at_sender=True)
+
+
+@df_pa.on_command("走势", block=True)
+async def handle_price_trend(bot: Bot, event: Event) -> None:
+    """根据本地价格历史查询物品价格趋势"""
+    logger.info(f"[DF] 用户 {event.user_id} 正在执行价格趋势查询")
+    item_name = event.text.strip() if event.text else ""
+    if not item_name:
+        await bot.send("请输入物品名称", at_sender=True)
+        return
+    items = item_catalog.search(item_name)
+    if len(items) > 1:
+        names = "\n".join(
+            f"{i + 1}. {item['objectName']}" for i, item in enumerate(items)
+        )
+        await bot.send(f"找到多个相似物品，请输入完整名称:\n{names}", at_sender=True)
+        return
+    if not items:
+        await bot.send("未找到该物品", at_sender=True)
+        return
+    data = MsgInfo(event.user_id, bot.bot_id)
+    await bot.send(
+        await data.get_price_trend(str(items[0]["objectID"]), items[0]["objectName"]),
+        at_sender=True,
+    )
@@ -1,4 +1,4 @@
-from copy import deepcopy
+import asyncio
 from typing import Any, Dict, cast
 from functools import lru_cache
 
@@ -10,14 +10,7 @@ from gsuid_core.models import Event
 from gsuid_core.data_store import get_res_path
 
 # from gsuid_core.utils.cache import gs_cache
-from gsuid_core.utils.fonts.fonts import core_font as df_font
-from gsuid_core.utils.image.convert import convert_img
-from gsuid_core.utils.image.image_tools import (
-    get_pic,
-    easy_paste,
-    get_event_avatar,
-    draw_pic_with_ring,
-)
+from gsuid_core.utils.image.image_tools import get_pic, easy_paste
 
 from ..utils.image import TEXT_PATH as TEXTURE
 from ..utils.models import (
@@ -30,7 +23,18 @@ from ..utils.models import (
     RecordSolData,
     RecordTdmData,
 )
+from ..utils.fonts import fonts
 from ..utils.api.utils import Util
+from ..utils.resource_manager import assets
+from ..utils.api.cache import ResponseCache
+from ..utils.avatar_cache import avatar_cache
+from ..utils.encoder import benchmark, encode_card, format_benchmark
+from ..utils.render_pool import RenderPool, content_key, image_digest
+from ..utils.const import (
+    RENDER_CACHE_TTL,
+    RENDER_CACHE_MAX_BYTES,
+    RENDER_CACHE_MAX_ENTRIES,
+)
 
 MAIN_PATH = get_res_path() / "DeltaUID"
 # 路径常量
@@ -53,83 +57,110 @@ FONT_XLARGE = 40
 FONT_XXLARGE = 44
 
 # 布局常量
-AVATAR_SIZE = 150
-HEADER_SIZE = 200
 MARGIN = 20
 ITEM_SPACING = 220
 
-
-# 图片缓存机制
-@lru_cache(maxsize=128)
-def load_image_cached(path: str, mode: str = "RGBA") -> Image.Image:
-    """缓存加载图片，提高性能"""
-    return Image.open(path).convert(mode)
-
-
-@lru_cache(maxsize=64)
-def load_image_resized(path: str, size: tuple[int, int], mode: str = "RGBA") -> Image.Image:
-    """缓存加载并调整大小的图片"""
-    return Image.open(path).convert(mode).resize(size, Image.Resampling.LANCZOS)
-
-
-# 预加载常用图片
-footer = load_image_cached(str(TEXTURE / "footer.png"))
-
-# 全局字体缓存
-_font_cache: Dict[int, Any] = {}
+# 纯文字列表图片
+TEXT_CARD_WIDTH = 800
+TEXT_CARD_MARGIN = 50
+TEXT_CARD_FONT = 24
+TEXT_CARD_LINE = 34
+
+# 卡片布局或贴图变化时递增, 使旧的出图缓存失效
+TEMPLATE_VERSION = 1
+
+
+# 常用图片(共享只读)
+footer = assets.get("footer.png")
+
+# 渲染用到的全部字号
+FONT_SIZES = (
+    24,
+    FONT_SMALL,
+    FONT_MEDIUM,
+    33,
+    FONT_LARGE,
+    FONT_XLARGE,
+    FONT_XXLARGE,
+    84,
+)
+# 各卡片上的固定标签及字号, worker 预热时预先测量
+FONT_LABELS = (
+    ("排位分", FONT_MEDIUM),
+    ("本局收获", 24),
+    ("战损", 24),
+    ("时长", 24),
+    ("击杀", 24),
+    ("总收入", 25),
+    ("总损失", 25),
+    ("总盈利", 25),
+)
 
 
-def get_cached_font(size: int) -> Any:
-    """获取缓存的字体，避免重复创建"""
-    if size not in _font_cache:
-        _font_cache[size] = df_font(size)
-    return _font_cache[size]
+# 头像在标题中的中心位置(头像底框中心再向上偏移 10px)
+TITLE_AVATAR_POS = (150, 160)
+TITLE_AVATAR_CENTER = (150, 150)
 
 
-# 标题相关图片缓存
-@lru_cache(maxsize=8)
+# 标题相关图片
 def get_title_bg() -> Image.Image:
     """获取标题背景图片"""
-    return Image.open(TEXTURE / "header.png")
+    return assets.get("header.png")
 
 
-@lru_cache(maxsize=8)
 def get_header_center() -> Image.Image:
     """获取头像背景图片"""
-    return Image.open(TEXTURE / "头像背景.png").convert("RGBA")
+    return assets.get("头像背景.png")
+
+
+@lru_cache(maxsize=1)
+def get_title_base() -> Image.Image:
+    """标题背景与头像底框预先合成的静态层"""
+    title = get_title_bg().copy()
+    easy_paste(title, get_header_center(), TITLE_AVATAR_POS, "cc")
+    return title
 
 
-async def draw_title(data: InfoData, avatar: Image.Image | None, mode: int = 0) -> Image.Image:
+async def get_title_avatar(
+    data: InfoData, avatar: Image.Image | None
+) -> Image.Image | None:
+    """标题头像: 未传入时按data中的头像URL从头像缓存获取"""
+    if avatar is None:
+        avatar = await avatar_cache.get(data.get("avatar", ""), "ring")
+    return avatar
+
+
+def draw_title(
+    data: InfoData, avatar: Image.Image | None, mode: int = 0
+) -> Image.Image:
     """绘制用户头像标题区域 - 优化版本
 
     Args:
         data: 用户数据
-        avatar: 用户头像图片，如果为None则从data获取头像URL
+        avatar: 已加圆环的用户头像，为None时不绘制头像
         mode: 显示模式 (0=全部, 1=全战, 2=烽火)
 
     Returns:
         绘制完成的标题图片
     """
-    # 使用缓存的图片，避免重复加载
-    title = get_title_bg().copy()
-    header_center = get_header_center().copy()
-
-    # 获取头像
-    if avatar is None:
-        avatar_url = data["avatar"]
-        avatar = await get_pic(avatar_url)
-
-    if avatar.mode != "RGBA":
-        avatar = avatar.convert("RGBA")
-    font_xlarge = get_cached_font(FONT_XLARGE)
-    font_large = get_cached_font(FONT_LARGE)
-    font_medium = get_cached_font(FONT_MEDIUM)
-
-    # 添加圆环
-    avatar = await draw_pic_with_ring(avatar.resize((AVATAR_SIZE, AVATAR_SIZE), Image.Resampling.LANCZOS), HEADER_SIZE)
-
-    easy_paste(header_center, avatar, (150, 150), "cc")
-    easy_paste(title, header_center, (150, 160), "cc")
+    # 复制预合成的静态层, 只绘制头像和文字
+    title = get_title_base().copy()
+
+    font_xlarge = fonts.get(FONT_XLARGE)
+    font_large = fonts.get(FONT_LARGE)
+    font_medium = fonts.get(FONT_MEDIUM)
+
+    if avatar is not None:
+        center = get_header_center()
+        easy_paste(
+            title,
+            avatar,
+            (
+                TITLE_AVATAR_POS[0] - center.width // 2 + TITLE_AVATAR_CENTER[0],
+                TITLE_AVATAR_POS[1] - center.height // 2 + TITLE_AVATAR_CENTER[1],
+            ),
+            "cc",
+        )
 
     # 绘制文字
     title_draw = ImageDraw.Draw(title)
@@ -140,19 +171,25 @@ async def draw_title(data: InfoData, avatar: Image.Image | None, mode: int = 0)
     y_offset = 150
     if mode in [0, 2]:
         rank_sol = Util.get_rank_by_score_sol(int(data["rankpoint"]))
-        texts_to_draw.append((f"烽火段位: {rank_sol}", (290, y_offset), WHITE, font_large, "lt"))
+        texts_to_draw.append(
+            (f"烽火段位: {rank_sol}", (290, y_offset), WHITE, font_large, "lt")
+        )
         y_offset += 45
 
     if mode in [0, 1]:
         rank_tdm = Util.get_rank_by_score_tdm(int(data["tdmrankpoint"]))
-        texts_to_draw.append((f"全战段位:{rank_tdm}", (290, y_offset), WHITE, font_large, "lt"))
+        texts_to_draw.append(
+            (f"全战段位:{rank_tdm}", (290, y_offset), WHITE, font_large, "lt")
+        )
         if mode == 0:
             y_offset += 45
 
     # 时间
     time = data.get("time")
     if time:
-        texts_to_draw.append((f"截至时间: {time}", (290, y_offset), WHITE, font_large, "lt"))
+        texts_to_draw.append(
+            (f"截至时间: {time}", (290, y_offset), WHITE, font_large, "lt")
+        )
 
     # 排位分
     texts_to_draw.append((data["rankpoint"], (860, 250), WHITE, font_large, "mm"))
@@ -164,7 +201,28 @@ async def draw_title(data: InfoData, avatar: Image.Image | None, mode: int = 0)
     return title
 
 
-async def draw_one_msg(
+def _msg_positions(pos: tuple[int, int]) -> tuple[tuple[int, int], tuple[int, int]]:
+    """信息项的 (数值位置, 名称位置)"""
+    x_pos = pos[0] + 45
+    y_pos = pos[1] + 30
+    return (x_pos, y_pos), (x_pos, y_pos + 40)
+
+
+def draw_msg_label(
+    draw: ID, name: str, pos: tuple[int, int], size: int = FONT_MEDIUM
+) -> None:
+    """只绘制信息项的名称, 用于预先绘制静态层"""
+    draw.text(_msg_positions(pos)[1], name, GREEN, fonts.get(size), "mm")
+
+
+def draw_msg_value(
+    draw: ID, value: str, pos: tuple[int, int], size: int = FONT_MEDIUM
+) -> None:
+    """只绘制信息项的数值"""
+    draw.text(_msg_positions(pos)[0], value, WHITE, fonts.get(size + 5), "mm")
+
+
+def draw_one_msg(
     draw: ID,
     name: str,
     value: str,
@@ -180,240 +238,259 @@ async def draw_one_msg(
         pos: 位置坐标
         size: 字体大小
     """
-    # 使用缓存的字体
-    value_size = size + 5
-    name_y_offset = 40
-    x_pos = pos[0] + 45
-    y_pos = pos[1] + 30
-    y_pos_name = y_pos + name_y_offset
+    draw_msg_value(draw, value, pos, size)
+    draw_msg_label(draw, name, pos, size)
+
+
+# 信息卡布局: 各区域的Y轴位置
+INFO_TQC_Y = 300
+INFO_PROPERTY_Y = 800
+INFO_SOL_Y = 1020
+INFO_TDM_Y = 1380
+INFO_DAILY_Y = 1640
+INFO_FOOTER_Y = 2000
+INFO_STATS_X, INFO_STATS_INDENT = 120, 160
+INFO_PROPERTY_BARS = ((60, "money1.png"), (500, "money2.png"))
+
+# 统计区域的 (名称, 字段), 每区两行
+SOL_STATS: tuple[tuple[tuple[str, str], ...], ...] = (
+    (
+        ("撤离率", "solescaperatio"),
+        ("总场数", "soltotalfght"),
+        ("撤离数", "solttotalescape"),
+        ("总击杀", "soltotalkill"),
+        ("赚损比", "profitLossRatio"),
+    ),
+    (
+        ("总带出", "totalGainedPrice"),
+        ("游戏时长", "totalGameTime"),
+        ("绝密KD", "highKillDeathRatio"),
+        ("机密KD", "medKillDeathRatio"),
+        ("普通KD", "lowKillDeathRatio"),
+    ),
+)
+TDM_STATS: tuple[tuple[tuple[str, str], ...], ...] = (
+    (
+        ("胜率", "tdmsuccessratio"),
+        ("总场数", "tdmtotalfight"),
+        ("胜利数", "totalwin"),
+        ("总击杀", "tdmtotalkill"),
+        ("排位分", "tdmrankpoint"),
+    ),
+    (
+        ("击杀/min", "avgkillperminute"),
+        ("游戏时长", "tdmduration"),
+        ("分数/min", "avgScorePerMinute"),
+        ("载具摧毁", "totalVehicleDestroyed"),
+        ("载具击杀", "totalVehicleKill"),
+    ),
+)
+
 
-    # 预获取字体对象
-    font_value = df_font(value_size)
-    font_label = df_font(size)
+def _stats_positions(y_pos: int, stats: tuple[tuple[tuple[str, str], ...], ...]):
+    for row, items in enumerate(stats):
+        for i, (name, key) in enumerate(items):
+            yield name, key, (INFO_STATS_X + INFO_STATS_INDENT * i, y_pos + 120 * row)
 
-    # 批量绘制 - 减少函数调用开销
-    draw.text((x_pos, y_pos), value, WHITE, font_value, "mm")
-    draw.text((x_pos, y_pos_name), name, GREEN, font_label, "mm")
 
+@lru_cache(maxsize=1)
+def get_info_template() -> Image.Image:
+    """信息卡的静态骨架: 背景、各区域横幅、资产栏、统计名称、日报收益栏与页脚
+
+    只在首次使用时绘制一次, 之后每次出图复制这一层再绘制动态内容.
+    标题区域位于最上层, 由 draw_title 单独生成后覆盖.
+    """
+    img = assets.get("bg.jpg").copy()
+    img_draw = ImageDraw.Draw(img)
 
-async def draw_tqc_section(img: Image.Image, tqc_data: list[TQCData], y_pos: int) -> None:
-    """绘制特勤处信息区域
+    # 特勤处
+    tqc_bg = assets.get("banner6.png")
+    img.paste(tqc_bg, (0, INFO_TQC_Y), tqc_bg)
+
+    # 仓库资产
+    prop_bg = assets.get("banner1.png")
+    img.paste(prop_bg, (0, INFO_PROPERTY_Y - 120), prop_bg)
+    prop_bar = assets.get("仓库bar.png")
+    for x, icon in INFO_PROPERTY_BARS:
+        bar = prop_bar.copy()
+        easy_paste(bar, assets.get(icon, "icon_small"), (30, 20), "lt")
+        easy_paste(img, bar, (x, INFO_PROPERTY_Y), "lt")
+
+    # 烽火 / 全面战场统计
+    for banner, y_pos, stats in (
+        ("banner2.png", INFO_SOL_Y, SOL_STATS),
+        ("banner3.png", INFO_TDM_Y, TDM_STATS),
+    ):
+        stats_bg = assets.get(banner)
+        img.paste(stats_bg, (0, y_pos - 100), stats_bg)
+        for name, _, pos in _stats_positions(y_pos, stats):
+            draw_msg_label(img_draw, name, pos)
+
+    # 日报
+    day_bg = assets.get("banner4.png")
+    img.paste(day_bg, (0, INFO_DAILY_Y), day_bg)
+    day_money = assets.get("物品栏.png").copy()
+    easy_paste(day_money, assets.get("money1.png", "icon_large"), (90, 170), "lt")
+    easy_paste(img, day_money, (30, INFO_DAILY_Y + 50), "lt")
+
+    img.paste(footer, (0, INFO_FOOTER_Y), footer)
+    return img
+
+
+def draw_tqc_section(img: Image.Image, tqc_data: list[TQCData], y_pos: int) -> None:
+    """绘制特勤处设备栏(横幅在静态层中)
 
     Args:
         img: 目标图片
         tqc_data: 特勤处数据
         y_pos: Y轴位置
     """
-    tqc_bg = Image.open(TEXTURE / "banner6.png")
-    tqc_bar = Image.open(TEXTURE / "物品栏.png").convert("RGBA")
-
-    img.paste(tqc_bg, (0, y_pos), tqc_bg)
+    tqc_bar = assets.get("物品栏.png")
+    font = fonts.get(FONT_SMALL)
 
     for i, tqc_item in enumerate(tqc_data[:4]):  # 最多显示4个
-        tqc_sth = deepcopy(tqc_bar)
+        tqc_sth = tqc_bar.copy()
         tqc_sth_draw = ImageDraw.Draw(tqc_sth)
 
         # 绘制地点名称
-        tqc_sth_draw.text(
-            (150, 100),
-            f"{tqc_item['place_name']}",
-            GREEN,
-            df_font(FONT_SMALL),
-            "mm",
-        )
+        tqc_sth_draw.text((150, 100), f"{tqc_item['place_name']}", GREEN, font, "mm")
 
         # 绘制状态信息
         if tqc_item.get("status") == "producing":
             try:
-                item_icon = (
-                    Image.open(MAIN_PATH / f"res/{tqc_item['object_id']}.png").convert("RGBA").resize((250, 250))
+                item_icon = assets.get(
+                    MAIN_PATH / f"res/{tqc_item['object_id']}.png", "item"
                 )
                 easy_paste(tqc_sth, item_icon, (150, 250), "cc")
             except FileNotFoundError:
                 logger.warning(f"物品图标 {tqc_item['object_id']} 不存在")
 
             tqc_sth_draw.text(
-                (150, 170),
-                f"{tqc_item['object_name']}",
-                GREEN,
-                df_font(FONT_SMALL),
-                "mm",
-            )
-            tqc_sth_draw.text(
-                (150, 220),
-                f"{tqc_item['left_time']}",
-                GREEN,
-                df_font(FONT_SMALL),
-                "mm",
+                (150, 170), f"{tqc_item['object_name']}", GREEN, font, "mm"
             )
+            tqc_sth_draw.text((150, 220), f"{tqc_item['left_time']}", GREEN, font, "mm")
         else:
-            tqc_sth_draw.text((150, 220), "空闲中", GREEN, df_font(FONT_SMALL), "mm")
+            tqc_sth_draw.text((150, 220), "空闲中", GREEN, font, "mm")
 
         easy_paste(img, tqc_sth, (i * ITEM_SPACING + MARGIN, y_pos + 40), "lt")
 
 
-async def draw_property_section(img: Image.Image, data: InfoData, y_pos: int) -> None:
-    """绘制仓库资产信息区域
+def draw_property_section(img: Image.Image, data: InfoData, y_pos: int) -> None:
+    """绘制仓库资产数值(横幅与资产栏在静态层中)
 
     Args:
         img: 目标图片
         data: 用户数据
         y_pos: Y轴位置
     """
-    prop_bg = Image.open(TEXTURE / "banner1.png")
-    prop_bar = Image.open(TEXTURE / "仓库bar.png").convert("RGBA")
-    money_icon = Image.open(TEXTURE / "money1.png").convert("RGBA").resize((50, 50))
-    asset_icon = Image.open(TEXTURE / "money2.png").convert("RGBA").resize((50, 50))
-
-    img.paste(prop_bg, (0, y_pos - 120), prop_bg)
-
-    # 现金信息
-    prop_bar_1 = deepcopy(prop_bar)
-    prop_draw_1 = ImageDraw.Draw(prop_bar_1)
-    prop_draw_1.text((90, 30), f"现金: {data['money']}", WHITE, df_font(FONT_MEDIUM), "lt")
-    easy_paste(prop_bar_1, money_icon, (30, 20), "lt")
-    easy_paste(img, prop_bar_1, (60, y_pos), "lt")
-
-    # 总资产信息
-    prop_bar_2 = deepcopy(prop_bar)
-    prop_draw_2 = ImageDraw.Draw(prop_bar_2)
-    prop_draw_2.text(
-        (90, 30),
-        f"仓库总资产: {data['propcapital']}",
-        WHITE,
-        df_font(FONT_MEDIUM),
-        "lt",
-    )
-    easy_paste(prop_bar_2, asset_icon, (30, 20), "lt")
-    easy_paste(img, prop_bar_2, (500, y_pos), "lt")
+    img_draw = ImageDraw.Draw(img)
+    font = fonts.get(FONT_MEDIUM)
+    texts = (f"现金: {data['money']}", f"仓库总资产: {data['propcapital']}")
+    for (x, _), text in zip(INFO_PROPERTY_BARS, texts):
+        img_draw.text((x + 90, y_pos + 30), text, WHITE, font, "lt")
 
 
-async def draw_sol_stats_section(img: Image.Image, data: InfoData, y_pos: int) -> None:
-    """绘制烽火战绩统计区域
+def _draw_stats_values(img: Image.Image, data: InfoData, y_pos: int, stats) -> None:
+    img_draw = ImageDraw.Draw(img)
+    for _, key, pos in _stats_positions(y_pos, stats):
+        draw_msg_value(img_draw, str(data[key]), pos)
+
+
+def draw_sol_stats_section(img: Image.Image, data: InfoData, y_pos: int) -> None:
+    """绘制烽火战绩统计数值(横幅与名称在静态层中)
 
     Args:
         img: 目标图片
         data: 用户数据
         y_pos: Y轴位置
     """
-    sol_bg = Image.open(TEXTURE / "banner2.png")
-    img.paste(sol_bg, (0, y_pos - 100), sol_bg)
-
-    img_draw = ImageDraw.Draw(img)
-    base_x, indent = 120, 160
-
-    # 第一行统计
-    sol_stats_row1 = [
-        ("撤离率", data["solescaperatio"]),
-        ("总场数", data["soltotalfght"]),
-        ("撤离数", data["solttotalescape"]),
-        ("总击杀", data["soltotalkill"]),
-        ("赚损比", data["profitLossRatio"]),
-    ]
+    _draw_stats_values(img, data, y_pos, SOL_STATS)
 
-    for i, (name, value) in enumerate(sol_stats_row1):
-        await draw_one_msg(img_draw, name, value, (base_x + indent * i, y_pos))
-
-    # 第二行统计
-    sol_stats_row2 = [
-        ("总带出", data["totalGainedPrice"]),
-        ("游戏时长", data["totalGameTime"]),
-        ("绝密KD", data["highKillDeathRatio"]),
-        ("机密KD", data["medKillDeathRatio"]),
-        ("普通KD", data["lowKillDeathRatio"]),
-    ]
-
-    for i, (name, value) in enumerate(sol_stats_row2):
-        await draw_one_msg(img_draw, name, value, (base_x + indent * i, y_pos + 120))
 
-
-async def draw_tdm_stats_section(img: Image.Image, data: InfoData, y_pos: int) -> None:
-    """绘制全面战场统计区域
+def draw_tdm_stats_section(img: Image.Image, data: InfoData, y_pos: int) -> None:
+    """绘制全面战场统计数值(横幅与名称在静态层中)
 
     Args:
         img: 目标图片
         data: 用户数据
         y_pos: Y轴位置
     """
-    tdm_bg = Image.open(TEXTURE / "banner3.png")
-    img.paste(tdm_bg, (0, y_pos - 100), tdm_bg)
-
-    img_draw = ImageDraw.Draw(img)
-    base_x, indent = 120, 160
-
-    # 第一行统计
-    tdm_stats_row1 = [
-        ("胜率", data["tdmsuccessratio"]),
-        ("总场数", data["tdmtotalfight"]),
-        ("胜利数", data["totalwin"]),
-        ("总击杀", data["tdmtotalkill"]),
-        ("排位分", data["tdmrankpoint"]),
-    ]
-
-    for i, (name, value) in enumerate(tdm_stats_row1):
-        await draw_one_msg(img_draw, name, value, (base_x + indent * i, y_pos))
-
-    # 第二行统计
-    tdm_stats_row2 = [
-        ("击杀/min", data["avgkillperminute"]),
-        ("游戏时长", data["tdmduration"]),
-        ("分数/min", data["avgScorePerMinute"]),
-        ("载具摧毁", data["totalVehicleDestroyed"]),
-        ("载具击杀", data["totalVehicleKill"]),
-    ]
-
-    for i, (name, value) in enumerate(tdm_stats_row2):
-        await draw_one_msg(img_draw, name, value, (base_x + indent * i, y_pos + 120))
+    _draw_stats_values(img, data, y_pos, TDM_STATS)
 
 
-async def draw_daily_section(img: Image.Image, day_data: DayInfoData, y_pos: int) -> None:
-    """绘制日报信息区域
+def draw_daily_section(
+    img: Image.Image,
+    day_data: DayInfoData,
+    item_pics: list[Image.Image],
+    y_pos: int,
+) -> None:
+    """绘制日报收益与热门物品(横幅与收益栏在静态层中)
 
     Args:
         img: 目标图片
         day_data: 日报数据
+        item_pics: 热门物品图片, 与 top_collections 中的物品一一对应
         y_pos: Y轴位置
     """
-    day_bg = Image.open(TEXTURE / "banner4.png")
-    day_bar = Image.open(TEXTURE / "物品栏.png").convert("RGBA")
-    money_icon = Image.open(TEXTURE / "money1.png").convert("RGBA").resize((120, 120))
-
-    img.paste(day_bg, (0, y_pos), day_bg)
+    day_bar = assets.get("物品栏.png")
+    font = fonts.get(FONT_SMALL)
 
     # 收益信息
-    day_money = deepcopy(day_bar)
-    day_money_draw = ImageDraw.Draw(day_money)
-    day_money_draw.text(
-        (150, 100),
+    img_draw = ImageDraw.Draw(img)
+    img_draw.text(
+        (30 + 150, y_pos + 50 + 100),
         f"收益: {day_data['profit_str']}",
         GREEN,
-        df_font(FONT_SMALL),
+        font,
         "mm",
     )
-    easy_paste(day_money, money_icon, (90, 170), "lt")
-    easy_paste(img, day_money, (30, y_pos + 50), "lt")
 
     # 热门物品
-    for i, item in enumerate(day_data["top_collections"]["details"][:3]):
-        day_item = deepcopy(day_bar)
+    for i, (item, item_pic) in enumerate(
+        zip(day_data["top_collections"]["details"][:3], item_pics)
+    ):
+        day_item = day_bar.copy()
         day_item_draw = ImageDraw.Draw(day_item)
-        day_item_draw.text(
-            (150, 100),
-            f"{item['objectName']}",
-            GREEN,
-            df_font(FONT_SMALL),
-            "mm",
-        )
+        day_item_draw.text((150, 100), f"{item['objectName']}", GREEN, font, "mm")
 
-        item_pic = await get_pic(item["pic"], size=(120, 120))
         easy_paste(day_item, item_pic, (90, 170), "mm")
         easy_paste(img, day_item, (i * ITEM_SPACING + 240, y_pos + 50), "lt")
 
 
+def render_info_img(
+    data: InfoData,
+    day: DayInfoData,
+    tqc: list[TQCData],
+    avatar: Image.Image | None,
+    item_pics: list[Image.Image],
+) -> bytes:
+    """在渲染执行器中绘制用户信息图片, 参数均为纯数据
+
+    复制预先绘制好的静态骨架, 只绘制随用户变化的内容.
+    """
+    img = get_info_template().copy()
+    header = draw_title(data, avatar)
+
+    draw_tqc_section(img, tqc, INFO_TQC_Y)
+    draw_property_section(img, data, INFO_PROPERTY_Y)
+    draw_sol_stats_section(img, data, INFO_SOL_Y)
+    draw_tdm_stats_section(img, data, INFO_TDM_Y)
+    draw_daily_section(img, day, item_pics, INFO_DAILY_Y)
+
+    # 添加标题
+    img.paste(header, (0, 0), header)
+
+    return encode_card(img, "info")
+
+
 # @gs_cache()
-async def draw_df_info_img(data: InfoData, day: DayInfoData, tqc: list[TQCData], ev: Event) -> bytes:
+async def draw_df_info_img(
+    data: InfoData, day: DayInfoData, tqc: list[TQCData], ev: Event
+) -> bytes:
     """绘制用户信息完整图片
 
+    在事件循环中只获取头像和物品图片, 绘制与编码交给渲染执行器.
+
     Args:
         data: 用户数据
         day: 日报数据
@@ -423,29 +500,24 @@ async def draw_df_info_img(data: InfoData, day: DayInfoData, tqc: list[TQCData],
     Returns:
         图片字节数据
     """
-    img = Image.open(TEXTURE / "bg.jpg").convert("RGBA")
-    header = await draw_title(data, await get_event_avatar(ev))
-
-    # 特勤处区域 (300)
-    await draw_tqc_section(img, tqc, 300)
+    avatar = await avatar_cache.get_event_avatar(ev)
 
-    # 仓库资产区域 (800)
-    await draw_property_section(img, data, 800)
-
-    # 烽火战绩区域 (1020)
-    await draw_sol_stats_section(img, data, 1020)
-
-    # 全面战场区域 (1380)
-    await draw_tdm_stats_section(img, data, 1380)
-
-    # 日报区域 (1640)
-    await draw_daily_section(img, day, 1640)
-
-    # 添加标题和底部
-    img.paste(header, (0, 0), header)
-    img.paste(footer, (0, 2000), footer)
+    async def render() -> bytes:
+        item_pics = await asyncio.gather(
+            *(
+                get_pic(item["pic"], size=(120, 120))
+                for item in day["top_collections"]["details"][:3]
+            )
+        )
+        return await render_pool.run(
+            render_info_img, data, day, tqc, avatar, list(item_pics)
+        )
 
-    return await convert_img(img)
+    return await render_cache.get_or_load(
+        render_key("info", avatar, data, day, tqc_key(tqc)),
+        render,
+        RENDER_CACHE_TTL,
+    )
 
 
 async def draw_record_sol(
@@ -453,14 +525,26 @@ async def draw_record_sol(
     data: list[RecordSolData],
     week_data: WeeklyData,
     msg: InfoData,
-):
+) -> bytes:
     logger.info(data)
     logger.info(week_data)
     logger.info(msg)
-    if len(data) == 0:
-        img = Image.open(TEXTURE / "bg.jpg").convert("RGBA").resize((1000, 2300))
-    else:
-        img = Image.open(TEXTURE / "bg.jpg").convert("RGBA").resize((2000, 2300))
+    avatar = await get_title_avatar(msg, avatar)
+    return await render_cache.get_or_load(
+        render_key("record_sol", avatar, data, week_data, msg),
+        lambda: render_pool.run(render_record_sol, avatar, data, week_data, msg),
+        RENDER_CACHE_TTL,
+    )
+
+
+def render_record_sol(
+    avatar: Image.Image | None,
+    data: list[RecordSolData],
+    week_data: WeeklyData,
+    msg: InfoData,
+) -> bytes:
+    """在渲染执行器中绘制周报与烽火战绩"""
+    img = assets.get("bg.jpg", "week_bg" if len(data) == 0 else "week_bg_wide").copy()
 
     data_one = cast(
         InfoData,
@@ -470,38 +554,38 @@ async def draw_record_sol(
             "time": week_data["statDate_str"],
         },
     )
-    header = await draw_title(data_one, avatar, 2)
+    header = draw_title(data_one, avatar, 2)
     img.paste(header, (0, 0), header)
     img_draw = ImageDraw.Draw(img)
 
-    money_banner = Image.open(week_path / "banner1.png")
-    fight_banner = Image.open(week_path / "banner2.png")
-    friend_banner = Image.open(week_path / "banner3.png")
-    history_bg = Image.open(week_path / "banner4.png")
-    money_bg = Image.open(week_path / "bar1.png")
+    money_banner = assets.get(week_path / "banner1.png")
+    fight_banner = assets.get(week_path / "banner2.png")
+    friend_banner = assets.get(week_path / "banner3.png")
+    history_bg = assets.get(week_path / "banner4.png")
+    money_bg = assets.get(week_path / "bar1.png")
 
-    friend_bg = Image.open(week_path / "friend.png")
-    hero_bg = Image.open(week_path / "hero.png").resize((315, 460))
+    friend_bg = assets.get(week_path / "friend.png")
+    hero_bg = assets.get(week_path / "hero.png", "week_hero")
 
     # 左侧
     # 收益
     easy_paste(img, money_banner, (0, 330), "lt")
 
     def money_draw(text, value, x, y):
-        money_img = deepcopy(money_bg)
+        money_img = money_bg.copy()
         money_draw = ImageDraw.Draw(money_img)
         money_draw.text(
             (100, 20),
             text,
             "white",
-            df_font(25),
+            fonts.get(25),
             "lt",
         )
         money_draw.text(
             (100, 50),
             value,
             "yellow",
-            df_font(33),
+            fonts.get(33),
             "lt",
         )
         easy_paste(img, money_img, (x, y), "lt")
@@ -515,31 +599,31 @@ async def draw_record_sol(
     fight_x = 120
     fight_y = 700
     easy_paste(img, fight_banner, (0, fight_y - 110), "lt")
-    await draw_one_msg(
+    draw_one_msg(
         img_draw,
         "在线时长",
         week_data["total_Online_Time_str"],
         (fight_x, fight_y),
     )
-    await draw_one_msg(
+    draw_one_msg(
         img_draw,
         "总场数",
         week_data["total_sol_num"],
         (fight_x + fight_x_indent, fight_y),
     )
-    await draw_one_msg(
+    draw_one_msg(
         img_draw,
         "撤离数",
         week_data["total_exacuation_num"],
         (fight_x + fight_x_indent * 2, fight_y),
     )
-    await draw_one_msg(
+    draw_one_msg(
         img_draw,
         "K/D",
         f"{week_data['total_Kill_Player']}/{week_data['total_Death_Count']}",
         (fight_x + fight_x_indent * 3, fight_y),
     )
-    await draw_one_msg(
+    draw_one_msg(
         img_draw,
         "百万撤离",
         f"{week_data['GainedPrice_overmillion_num']}次",
@@ -548,28 +632,30 @@ async def draw_record_sol(
 
     # 战斗干员
     def draw_hero(hero: str, times: int, x: int, y: int):
-        hero_img = deepcopy(hero_bg)
-        hero_avatar = Image.open(avatar_path / f"{hero}.png").resize((245, 255))
+        hero_img = hero_bg.copy()
+        hero_avatar = assets.get(avatar_path / f"{hero}.png", "week_hero_avatar")
         easy_paste(hero_img, hero_avatar, (35, 60), "lt")
         hero_draw = ImageDraw.Draw(hero_img)
         hero_draw.text(
             (154, 360),
             hero,
             "white",
-            df_font(40),
+            fonts.get(40),
             "mm",
         )
         hero_draw.text(
             (154, 400),
             f"{times}次",
             "yellow",
-            df_font(30),
+            fonts.get(30),
             "mm",
         )
         easy_paste(img, hero_img, (x, y), "lt")
 
     for i in range(min(3, len(week_data["total_ArmedForceId_num_list"]))):
-        hero_name = Util.get_armed_force_name(week_data["total_ArmedForceId_num_list"][i]["ArmedForceId"])
+        hero_name = Util.get_armed_force_name(
+            week_data["total_ArmedForceId_num_list"][i]["ArmedForceId"]
+        )
         draw_hero(
             hero_name,
             week_data["total_ArmedForceId_num_list"][i]["inum"],
@@ -580,48 +666,48 @@ async def draw_record_sol(
     # 队友协作
     easy_paste(img, friend_banner, (0, 1300), "lt")
 
-    async def draw_friend(friend: FriendData, x: int, y: int):
-        friend_img = deepcopy(friend_bg)
+    def draw_friend(friend: FriendData, x: int, y: int):
+        friend_img = friend_bg.copy()
 
         friend_draw = ImageDraw.Draw(friend_img)
         friend_draw.text(
             (225, 80),
             friend["charac_name"],
             "black",
-            df_font(35),
+            fonts.get(35),
             "mm",
         )
-        await draw_one_msg(
+        draw_one_msg(
             friend_draw,
             "撤离",
             f"{friend['escape_num']}",
             (50, 110),
         )
-        await draw_one_msg(
+        draw_one_msg(
             friend_draw,
             "失败",
             f"{friend['fail_num']}",
             (175, 110),
         )
-        await draw_one_msg(
+        draw_one_msg(
             friend_draw,
             "K/D",
             f"{friend['kill_num']}/{friend['death_num']}",
             (300, 110),
         )
-        await draw_one_msg(
+        draw_one_msg(
             friend_draw,
             "带出",
             f"{friend['gained_str']}",
             (50, 210),
         )
-        await draw_one_msg(
+        draw_one_msg(
             friend_draw,
             "战损",
             f"{friend['consume_str']}",
             (175, 210),
         )
-        await draw_one_msg(
+        draw_one_msg(
             friend_draw,
             "利润",
             f"{friend['profit_str']}",
@@ -632,7 +718,7 @@ async def draw_record_sol(
     for i in range(4):
         if len(week_data["friend_list"]) < i + 1:
             break
-        await draw_friend(
+        draw_friend(
             week_data["friend_list"][i],
             60 + i % 2 * 450,
             1404 + i // 2 * 400,
@@ -645,8 +731,8 @@ async def draw_record_sol(
         img.paste(footer, (0, 2130), footer)
     else:
         easy_paste(img, history_bg, (1000, 90), "lt")
-        record_win = Image.open(TEXTURE / "frame_win.png")
-        record_fail = Image.open(TEXTURE / "frame_fail.png")
+        record_win = assets.get("frame_win.png")
+        record_fail = assets.get("frame_fail.png")
 
         for i in range(min(len(data), 10)):
             xy = (1000, 220 + i * 200)
@@ -655,27 +741,29 @@ async def draw_record_sol(
                 (1650, 380 + i * 200),
                 data[i]["time"],
                 GREEN,
-                df_font(25),
+                fonts.get(25),
                 "lt",
             )
 
             # 地图
             img_base = Image.new("RGBA", (1000, 164), (255, 255, 255, 0))
             map_path = TEXTURE / "mapsol" / f"{data[i]['map_name']}.png"
-            bg_map = Image.open(map_path).convert("RGBA").resize((844, 120))
+            bg_map = assets.get(map_path, "record_map")
             easy_paste(img_base, bg_map, (78, 22), "lt")
 
             # 头像
-            avatar = Image.open(avatar_path / f"{data[i]['armed_force']}.png").resize((120, 120))
+            avatar = assets.get(
+                avatar_path / f"{data[i]['armed_force']}.png", "icon_large"
+            )
             easy_paste(img_base, avatar, (140, 20), "lt")
 
             # 内容
 
             if data[i]["result"] == "撤离成功":
-                bg = deepcopy(record_win)
+                bg = record_win
 
             elif data[i]["result"] == "撤离失败":
-                bg = deepcopy(record_fail)
+                bg = record_fail
 
             else:
                 continue
@@ -687,45 +775,59 @@ async def draw_record_sol(
                 (122, 33),
                 data[i]["result"][2:],
                 "black",
-                df_font(30),
+                fonts.get(30),
                 "mm",
             )
             draw_bg.text(
                 (195, 125),
                 f"击杀{data[i]['kill_count']}",
                 "black",
-                df_font(25),
+                fonts.get(25),
                 "mm",
             )
             draw_bg.text(
                 (900, 45),
                 f"{data[i]['map_name']}",
                 "white",
-                df_font(40),
+                fonts.get(40),
                 "rm",
             )
             draw_bg.text(
                 (900, 90),
                 f"利润{data[i]['profit']}/带出{data[i]['price']}",
                 GREEN,
-                df_font(30),
+                fonts.get(30),
                 "rm",
             )
             draw_bg.text(
                 (900, 126),
                 f"存活:{data[i]['duration']}",
                 "white",
-                df_font(25),
+                fonts.get(25),
                 "rm",
             )
             img.paste(img_base, xy, img_base)
 
         img.paste(footer, (500, 2170), footer)
-    return await convert_img(img)
+    return encode_card(img, "record_sol")
+
+
+async def draw_record_tdm(
+    avatar: Image.Image | None, data: list[RecordTdmData], msg: InfoData
+) -> bytes:
+    avatar = await get_title_avatar(msg, avatar)
+    return await render_cache.get_or_load(
+        render_key("record_tdm", avatar, data, msg),
+        lambda: render_pool.run(render_record_tdm, avatar, data, msg),
+        RENDER_CACHE_TTL,
+    )
 
 
-async def draw_record_tdm(avatar: Image.Image | None, data: list[RecordTdmData], msg: InfoData):
-    img = Image.open(TEXTURE / "bg.jpg").convert("RGBA")
+def render_record_tdm(
+    avatar: Image.Image | None, data: list[RecordTdmData], msg: InfoData
+) -> bytes:
+    """在渲染执行器中绘制全面战场战绩"""
+    img = assets.get("bg.jpg").copy()
     data_one = cast(
         InfoData,
         {
@@ -734,9 +836,9 @@ async def draw_record_tdm(avatar: Image.Image | None, data: list[RecordTdmData],
             "tdmrankpoint": msg["tdmrankpoint"],
         },
     )
-    header = await draw_title(data_one, avatar, 1)
+    header = draw_title(data_one, avatar, 1)
     img.paste(header, (0, 0), header)
-    return await convert_img(img)
+    return encode_card(img, "record_tdm")
 
 
 # async def draw_scb(avatar: Image.Image | None, msg: InfoData):
@@ -753,41 +855,165 @@ async def draw_record_tdm(avatar: Image.Image | None, data: list[RecordTdmData],
 #     return await convert_img(img)
 
 
-async def draw_sol_record(avatar: Image.Image, data: RecordSol, win: bool = True):
-    img = Image.open(record_path / "bg.png").convert("RGBA")
-    line = Image.open(record_path / "line.png").convert("RGBA")
-    easy_paste(img, line, (0, 0), "lt")
+async def draw_sol_record(
+    avatar: Image.Image | None, data: RecordSol, win: bool = True
+) -> bytes:
+    """绘制单局烽火战绩播报卡片, avatar 为已加圆环的头像"""
+    return await render_cache.get_or_load(
+        render_key("sol_record", avatar, data),
+        lambda: render_pool.run(render_sol_record, avatar, data),
+        RENDER_CACHE_TTL,
+    )
+
 
-    header_center = Image.open(TEXTURE / "头像背景.png").convert("RGBA")
+def render_sol_record(avatar: Image.Image | None, data: RecordSol) -> bytes:
+    """在渲染执行器中绘制单局烽火战绩播报卡片"""
+    img = assets.get(record_path / "bg.png").copy()
+    easy_paste(img, assets.get(record_path / "line.png"), (0, 0), "lt")
+
+    header_center = get_header_center().copy()
 
-    avatar = await draw_pic_with_ring(avatar.convert("RGBA").resize((150, 150)), 200)
-    easy_paste(header_center, avatar, (150, 150), "cc")
+    if avatar is not None:
+        easy_paste(header_center, avatar, (150, 150), "cc")
     easy_paste(img, header_center, (30, 30), "lt")
     # 干员图标
-    armed_img = await Util.armed_to_img(data["armedforceid"])
-    armed_img = armed_img.resize((432, 692), Image.Resampling.LANCZOS)
-    armed_img = armed_img.rotate(-9.2, expand=True)
+    armed_img = assets.get(
+        Util.armed_to_path(data["armedforceid"]), "record_armed"
+    ).rotate(-9.2, expand=True)
     easy_paste(img, armed_img, (956, 81), "lt")
     # 文字部分
     img_draw = ImageDraw.Draw(img)
-    img_draw.text((330, 60), data["user_name"], "white", font=df_font(40))
+    img_draw.text((330, 60), data["user_name"], "white", font=fonts.get(40))
     result_c = GREEN if data["result"] == "撤离成功" else "red"
-    img_draw.text((330, 110), data["result"], result_c, font=df_font(44))
+    img_draw.text((330, 110), data["result"], result_c, font=fonts.get(44))
 
     title_c = GREEN if data["title"] == "百万撤离！" else "red"
-    img_draw.text((117.6, 321.7), data["title"], title_c, font=df_font(84))
-
-    img_draw.text((145, 450), f"{data['map_name'][-2:]}行动", "grey", font=df_font(24))
-    img_draw.text((145, 490), data["map_name"].split("-")[0], "white", font=df_font(44))
-    img_draw.text((385, 450), "时长", "grey", font=df_font(24))
-    img_draw.text((385, 490), data["duration"], "white", font=df_font(44))
-    img_draw.text((630, 450), "击杀", "grey", font=df_font(24))
-    img_draw.text((630, 490), f"{data['kill_count']}", "white", font=df_font(44))
-
-    img_draw.text((130, 575), "本局收获", "grey", font=df_font(24))
-    img_draw.text((130, 615), f"{data['price']}", "white", font=df_font(44))
-    img_draw.text((385, 575), "战损", "grey", font=df_font(24))
-    img_draw.text((385, 615), f"{data['loss']}", "white", font=df_font(44))
-
-    easy_paste(img, footer.resize((800, 104)), (0, 780), "lt")
-    return await convert_img(img)
+    img_draw.text((117.6, 321.7), data["title"], title_c, font=fonts.get(84))
+
+    img_draw.text(
+        (145, 450), f"{data['map_name'][-2:]}行动", "grey", font=fonts.get(24)
+    )
+    img_draw.text(
+        (145, 490), data["map_name"].split("-")[0], "white", font=fonts.get(44)
+    )
+    img_draw.text((385, 450), "时长", "grey", font=fonts.get(24))
+    img_draw.text((385, 490), data["duration"], "white", font=fonts.get(44))
+    img_draw.text((630, 450), "击杀", "grey", font=fonts.get(24))
+    img_draw.text((630, 490), f"{data['kill_count']}", "white", font=fonts.get(44))
+
+    img_draw.text((130, 575), "本局收获", "grey", font=fonts.get(24))
+    img_draw.text((130, 615), f"{data['price']}", "white", font=fonts.get(44))
+    img_draw.text((385, 575), "战损", "grey", font=fonts.get(24))
+    img_draw.text((385, 615), f"{data['loss']}", "white", font=fonts.get(44))
+
+    easy_paste(img, assets.get("footer.png", "record_footer"), (0, 780), "lt")
+    return encode_card(img, "sol_record")
+
+
+def wrap_text(text: str, size: int, width: int) -> list[str]:
+    """按像素宽度逐字换行, 字宽取自字体管理器的测量缓存"""
+    lines = []
+    for raw in text.rstrip("\n").split("\n"):
+        line, line_width = "", 0.0
+        for char in raw:
+            char_width = fonts.length(char, size)
+            if line and line_width + char_width > width:
+                lines.append(line)
+                line, line_width = "", 0.0
+            line += char
+            line_width += char_width
+        lines.append(line)
+    return lines
+
+
+def draw_text_image(text: str) -> Image.Image:
+    """绘制纯文字列表(白底黑字)"""
+    lines = wrap_text(text, TEXT_CARD_FONT, TEXT_CARD_WIDTH - 2 * TEXT_CARD_MARGIN)
+    img = Image.new(
+        "RGB",
+        (TEXT_CARD_WIDTH, TEXT_CARD_LINE * len(lines) + TEXT_CARD_MARGIN),
+        "white",
+    )
+    img_draw = ImageDraw.Draw(img)
+    font = fonts.get(TEXT_CARD_FONT)
+    for i, line in enumerate(lines):
+        img_draw.text(
+            (TEXT_CARD_MARGIN, TEXT_CARD_MARGIN // 2 + i * TEXT_CARD_LINE),
+            line,
+            BLACK,
+            font,
+        )
+    return img
+
+
+def render_text_card(text: str) -> bytes:
+    """在渲染执行器中绘制纯文字列表, 以调色板 PNG 编码"""
+    return encode_card(draw_text_image(text), "text")
+
+
+async def draw_text_card(text: str) -> bytes:
+    """绘制纯文字列表图片, 取代 text2pic 以便在渲染执行器中绘制并使用调色板编码"""
+    return await render_cache.get_or_load(
+        render_key("text", None, text),
+        lambda: render_pool.run(render_text_card, text),
+        RENDER_CACHE_TTL,
+    )
+
+
+def warm_up() -> None:
+    """预加载纹理、字体与静态图层, 在渲染 worker 启动时执行"""
+    assets.preload()
+    fonts.preload(FONT_SIZES)
+    fonts.premeasure(FONT_LABELS)
+    get_title_base()
+    get_info_template()
+    logger.debug("[DF] 渲染 worker 预热完成")
+
+
+def benchmark_cards() -> str:
+    """比较各编码预设在信息卡骨架、带战绩周报背景和文字列表上的耗时与体积"""
+    samples = {
+        "信息卡": get_info_template(),
+        "周报": assets.get("bg.jpg", "week_bg_wide"),
+        "文字列表": draw_text_image(
+            "\n".join(f"{i}: [收集品 | 金色] 示例物品 (2*2 | 1.5kg)" for i in range(30))
+        ),
+    }
+    return "\n".join(
+        format_benchmark(f"[{name}] {img.width}x{img.height}", benchmark(img))
+        for name, img in samples.items()
+    )
+
+
+def get_asset_stats() -> Dict[str, Any]:
+    """渲染 worker 中纹理缓存与字体的统计"""
+    return {**assets.stats(), "fonts": fonts.stats()}
+
+
+def render_key(card: str, avatar: Image.Image | None, *payload: Any) -> str:
+    """出图缓存键: 卡片类型、模板版本、头像内容与全部渲染数据的摘要"""
+    return content_key(card, TEMPLATE_VERSION, image_digest(avatar), *payload)
+
+
+def tqc_key(tqc: list[TQCData]) -> list[tuple]:
+    """特勤处数据中在出图缓存有效期内保持不变的部分
+
+    left_time 由 push_time 按秒倒计时得出, 直接参与摘要会让缓存键每次都不同;
+    缓存命中时剩余时间最多滞后 RENDER_CACHE_TTL.
+    """
+    return [
+        (
+            item.get("place_name"),
+            item.get("status"),
+            item.get("object_id"),
+            item.get("push_time"),
+        )
+        for item in tqc
+    ]
+
+
+render_pool = RenderPool(warm_up)
+# 相同输入在 RENDER_CACHE_TTL 内直接复用编码后的图片
+render_cache: ResponseCache[bytes] = ResponseCache(
+    RENDER_CACHE_MAX_ENTRIES, RENDER_CACHE_MAX_BYTES
+)
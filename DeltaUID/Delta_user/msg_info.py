@@ -1,10 +1,11 @@
 import re
 import sys
 import json
+import time
 import asyncio
 import datetime
 import urllib.parse
-from typing import Any, Dict, List, Tuple, Union, Optional, cast
+from typing import Any, Dict, List, Tuple, Union, Literal, Optional, cast
 from functools import lru_cache
 from dataclasses import dataclass
 
@@ -15,11 +16,9 @@ from gsuid_core.logger import logger
 from gsuid_core.models import Event
 from gsuid_core.subscribe import gs_subscribe
 from gsuid_core.data_store import get_res_path
-from gsuid_core.utils.image.convert import text2pic
 from gsuid_core.utils.download_resource.download_file import download
 
-from .image import draw_sol_record
-from .utils import read_item_json
+from .image import draw_text_card, draw_sol_record
 from ..utils.models import (
     BigRed,
     TQCData,
@@ -30,18 +29,27 @@ from ..utils.models import (
     WeeklyData,
     DayInfoData,
     DayListData,
-    ItemHourPriceData,
-    PlaceWithProfitData,
+    TQCPriceData,
 )
 from ..utils.api.api import DeltaApi
 from ..utils.api.utils import Util
+from ..utils.api.coalesce import SingleFlight
+from ..utils.const import TQC_PLACES, PRICE_TREND_HOURS, PRICE_QUERY_MAX_ITEMS
+from ..utils.activity import activity_tracker
+from ..utils.avatar_cache import avatar_cache
+from ..utils.item_catalog import item_catalog
+from ..utils.tqc_profit import rank_recipes
+from ..utils.price_history import price_history
+from ..utils.price_service import next_stat_hour, price_service
 from ..Delta_user.utils import get_user_id
 from ..utils.database.models import DFBind, DFUser
+from ..utils.database.record_buffer import record_buffer
 
 # 常量定义
 INTERVAL = 120
 BROADCAST_EXPIRED_MINUTES = 7
 SAFEHOUSE_CHECK_INTERVAL = 600
+RECORD_PROFILE_TTL = 3600  # 战绩播报昵称/头像地址缓存时间(秒)
 
 # 错误消息常量
 ERROR_UNBOUND_ACCOUNT = '未绑定三角洲账号，请先用"鼠鼠登录"命令登录'
@@ -58,6 +66,12 @@ RESOURCE_PATH = MAIN_PATH / "res"
 RESOURCE_PATH.mkdir(parents=True, exist_ok=True)
 last_call_times = {}
 
+# 战绩播报昵称/头像地址缓存: {uid: (过期时间, 昵称, 头像地址)}, 头像图片由 avatar_cache 缓存
+_record_profile_cache: Dict[str, Tuple[float, str, str]] = {}
+
+# 物品目录刷新登记表, 避免并发重复拉取
+_catalog_flight = SingleFlight()
+
 
 # 战绩结果映射
 @lru_cache(maxsize=32)
@@ -159,7 +173,10 @@ class RecordParams:
 
             # 无效参数
             else:
-                return None, "请输入正确参数，格式：三角洲战绩 [模式] [页码] L[战绩条数上限]"
+                return (
+                    None,
+                    "请输入正确参数，格式：三角洲战绩 [模式] [页码] L[战绩条数上限]",
+                )
 
         return params, ""
 
@@ -174,10 +191,11 @@ class MsgInfo:
         _delta_api: DeltaAPI实例缓存
     """
 
-    def __init__(self, user_id: str, bot_id: str):
+    def __init__(self, user_id: str, bot_id: str, user_data: Optional[DFUser] = None):
         self.user_id = user_id
         self.bot_id = bot_id
-        self.user_data: Optional[DFUser] = None
+        # 批量任务可预先注入已查询的用户数据, 避免逐个查库
+        self.user_data: Optional[DFUser] = user_data
         self._delta_api: Optional[DeltaApi] = None
 
     async def _fetch_user_data(self) -> Optional[DFUser]:
@@ -189,6 +207,8 @@ class MsgInfo:
         if uid is None:
             return None
 
+        # 后台任务都会注入用户数据, 走到这里的是交互命令, 视为玩家活跃
+        activity_tracker.touch(uid)
         self.user_data = cast(DFUser, await DFUser.select_data_by_uid(uid))
         return self.user_data
 
@@ -230,7 +250,9 @@ class MsgInfo:
         """
         return await self._fetch_user_data() is not None
 
-    async def _process_daily_data(self, deltaapi: DeltaApi, sol_detail: dict) -> Union[DayInfoData, str]:
+    async def _process_daily_data(
+        self, deltaapi: DeltaApi, sol_detail: dict
+    ) -> Union[DayInfoData, str]:
         """处理日报原始数据 - 优化版本
 
         Args:
@@ -260,7 +282,9 @@ class MsgInfo:
             logger.error(f"处理日报数据异常: {str(e)}")
             return "处理日报数据时发生异常"
 
-    async def _get_user_collections(self, deltaapi: DeltaApi, collection_top: dict) -> DayListData:
+    async def _get_user_collections(
+        self, deltaapi: DeltaApi, collection_top: dict
+    ) -> DayListData:
         """获取用户藏品信息 - 优化版本
 
         Args:
@@ -285,7 +309,9 @@ class MsgInfo:
                 return await self._fetch_collection_info(deltaapi, object_id)
 
         # 创建任务列表
-        tasks = [fetch_with_semaphore(item.get("objectID", "0")) for item in collection_list]
+        tasks = [
+            fetch_with_semaphore(item.get("objectID", "0")) for item in collection_list
+        ]
         collection_results = await asyncio.gather(*tasks, return_exceptions=True)
 
         # 处理结果
@@ -309,7 +335,9 @@ class MsgInfo:
             "details": collection_details,
         }
 
-    async def _fetch_collection_info(self, deltaapi: DeltaApi, object_id: str) -> Optional[dict]:
+    async def _fetch_collection_info(
+        self, deltaapi: DeltaApi, object_id: str
+    ) -> Optional[dict]:
         """获取单个藏品详细信息 - 优化版本
 
         Args:
@@ -407,12 +435,20 @@ class MsgInfo:
             return ERROR_SERVER_BUSY
 
         # 处理基本数据
-        propcapital = Util.trans_num_easy_for_read(basic_info["data"]["propcapital"]) if basic_info["status"] else "0"
+        propcapital = (
+            Util.trans_num_easy_for_read(basic_info["data"]["propcapital"])
+            if basic_info["status"]
+            else "0"
+        )
 
         # 检查所有响应是否成功
         if not all([player_info_res["status"], sol_info["status"], tdm_info["status"]]):
             # 检查是否是登录过期
-            if player_info_res.get("login_expired") or sol_info.get("login_expired") or tdm_info.get("login_expired"):
+            if (
+                player_info_res.get("login_expired")
+                or sol_info.get("login_expired")
+                or tdm_info.get("login_expired")
+            ):
                 return ERROR_LOGIN_EXPIRED
             return ERROR_SERVER_BUSY
 
@@ -451,7 +487,13 @@ class MsgInfo:
             "avgkillperminute": f"{int(game_data['avgkillperminute']) / 100:.2f}",
             "tdmtotalfight": game_data["tdmtotalfight"],
             "totalwin": game_data["totalwin"],
-            "tdmtotalkill": str(int(int(game_data["tdmduration"]) * int(game_data["avgkillperminute"]) / 100)),
+            "tdmtotalkill": str(
+                int(
+                    int(game_data["tdmduration"])
+                    * int(game_data["avgkillperminute"])
+                    / 100
+                )
+            ),
             "tdmduration": Util.seconds_to_duration(int(game_data["tdmduration"]) * 60),
             "tdmsuccessratio": game_data["tdmsuccessratio"],
         }
@@ -469,9 +511,13 @@ class MsgInfo:
 
         return {
             "profitLossRatio": (
-                Util.trans_num_easy_for_read(int(sol_data["profitLossRatio"]) // 100) if sol_info["data"] else "未知"
+                Util.trans_num_easy_for_read(int(sol_data["profitLossRatio"]) // 100)
+                if sol_info["data"]
+                else "未知"
+            ),
+            "totalGainedPrice": Util.trans_num_easy_for_read(
+                sol_data["totalGainedPrice"]
             ),
-            "totalGainedPrice": Util.trans_num_easy_for_read(sol_data["totalGainedPrice"]),
             "totalGameTime": Util.seconds_to_duration(sol_data["totalGameTime"]),
             **kd_ratios,
         }
@@ -625,12 +671,17 @@ class MsgInfo:
             room_ids = [r.get("RoomId", "") for r in operator_records]
 
             detail_results = await asyncio.gather(
-                *[deltaapi.get_tdm_detail(cookie, openid, rid) for rid in room_ids], return_exceptions=True
+                *[deltaapi.get_tdm_detail(cookie, openid, rid) for rid in room_ids],
+                return_exceptions=True,
             )
 
             detail_map = {}
             for rid, detail_res in zip(room_ids, detail_results):
-                if isinstance(detail_res, dict) and detail_res.get("status") and detail_res.get("data"):
+                if (
+                    isinstance(detail_res, dict)
+                    and detail_res.get("status")
+                    and detail_res.get("data")
+                ):
                     mpDetailList = detail_res["data"].get("mpDetailList", [])
                     for mpDetail in mpDetailList:
                         if mpDetail.get("isCurrentUser", False):
@@ -663,7 +714,9 @@ class MsgInfo:
                         RescueTeammateCount = rescue_val
 
                 TotalScore = record.get("TotalScore", 0)
-                avgScorePerMinute = int(TotalScore * 60 / gametime) if gametime > 0 else 0
+                avgScorePerMinute = (
+                    int(TotalScore * 60 / gametime) if gametime > 0 else 0
+                )
                 ArmedForceId = record.get("ArmedForceId", "")
                 ArmedForce = Util.get_armed_force_name(ArmedForceId)
 
@@ -737,7 +790,9 @@ class MsgInfo:
             place_name = device.get("placeName", "")
 
             if object_id > 0 and left_time > 0:
-                object_name = relate_map.get(str(object_id), {}).get("objectName", f"物品{object_id}")
+                object_name = relate_map.get(str(object_id), {}).get(
+                    "objectName", f"物品{object_id}"
+                )
                 total_time = device.get("totalTime", 0)
                 progress = 100 - (left_time / total_time * 100) if total_time > 0 else 0
 
@@ -748,12 +803,17 @@ class MsgInfo:
                         "status": "producing",
                         "object_name": object_name,
                         "left_time": Util.seconds_to_duration(left_time),
-                        "finish_time": datetime.datetime.fromtimestamp(push_time).strftime("%m-%d %H:%M:%S"),
+                        "finish_time": datetime.datetime.fromtimestamp(
+                            push_time
+                        ).strftime("%m-%d %H:%M:%S"),
+                        "push_time": push_time,
                         "progress": round(progress, 2),  # 保留两位小数
                     }
                 )
             else:
-                devices.append({"place_name": place_name, "status": "idle"})
+                devices.append(
+                    {"place_name": place_name, "status": "idle", "push_time": 0}
+                )
 
         if not devices:
             return "特勤处状态获取成功，但没有数据"
@@ -789,7 +849,9 @@ class MsgInfo:
         assert self.user_data is not None
         try:
             deltaapi = DeltaApi(self.user_data.platform)
-            res = await deltaapi.get_daily_report(self.user_data.cookie, self.user_data.uid)
+            res = await deltaapi.get_daily_report(
+                self.user_data.cookie, self.user_data.uid
+            )
 
             if not res.get("status"):
                 # 检查是否是登录过期
@@ -824,11 +886,18 @@ class MsgInfo:
 
         player_info_res, weekly_res1, weekly_res2 = await asyncio.gather(
             deltaapi.get_player_info(access_token=access_token, openid=openid),
-            deltaapi.get_weekly_report(access_token=access_token, openid=openid, statDate=statDate1),
-            deltaapi.get_weekly_report(access_token=access_token, openid=openid, statDate=statDate2),
+            deltaapi.get_weekly_report(
+                access_token=access_token, openid=openid, statDate=statDate1
+            ),
+            deltaapi.get_weekly_report(
+                access_token=access_token, openid=openid, statDate=statDate2
+            ),
         )
 
-        if not (player_info_res["status"] and "charac_name" in player_info_res["data"]["player"]):
+        if not (
+            player_info_res["status"]
+            and "charac_name" in player_info_res["data"]["player"]
+        ):
             return "获取角色信息失败，可能需要重新登录"
 
         user_name = player_info_res["data"]["player"]["charac_name"]
@@ -853,10 +922,14 @@ class MsgInfo:
                 # 解析使用干员信息
                 total_ArmedForceId_num = res["data"].get("total_ArmedForceId_num", "")
                 total_ArmedForceId_num = total_ArmedForceId_num.replace("'", '"')
-                total_ArmedForceId_num_list = list(map(json.loads, total_ArmedForceId_num.split("#")))
+                total_ArmedForceId_num_list = list(
+                    map(json.loads, total_ArmedForceId_num.split("#"))
+                )
 
                 if total_ArmedForceId_num_list and total_ArmedForceId_num_list[0] != 0:
-                    total_ArmedForceId_num_list.sort(key=lambda x: x["inum"], reverse=True)
+                    total_ArmedForceId_num_list.sort(
+                        key=lambda x: x["inum"], reverse=True
+                    )
                 else:
                     total_ArmedForceId_num_list = []
 
@@ -890,7 +963,9 @@ class MsgInfo:
                 total_exacuation_num = res["data"].get("total_exacuation_num", "0")
 
                 # 解析百万撤离次数
-                GainedPrice_overmillion_num = res["data"].get("GainedPrice_overmillion_num", "0")
+                GainedPrice_overmillion_num = res["data"].get(
+                    "GainedPrice_overmillion_num", "0"
+                )
 
                 # 解析游玩地图信息
                 total_mapid_num = res["data"].get("total_mapid_num", "")
@@ -911,8 +986,12 @@ class MsgInfo:
                     if friends_sol_record:
                         for friend in friends_sol_record:
                             friend_dict = {}
-                            Friend_is_Escape1_num = friend.get("Friend_is_Escape1_num", 0)
-                            Friend_is_Escape2_num = friend.get("Friend_is_Escape2_num", 0)
+                            Friend_is_Escape1_num = friend.get(
+                                "Friend_is_Escape1_num", 0
+                            )
+                            Friend_is_Escape2_num = friend.get(
+                                "Friend_is_Escape2_num", 0
+                            )
                             if Friend_is_Escape1_num + Friend_is_Escape2_num <= 0:
                                 continue
 
@@ -924,16 +1003,38 @@ class MsgInfo:
                             )
                             if res["status"]:
                                 charac_name = res["data"].get("charac_name", "")
-                                charac_name = urllib.parse.unquote(charac_name) if charac_name else "未知好友"
-                                Friend_Escape1_consume_Price = friend.get("Friend_Escape1_consume_Price", 0)
-                                Friend_Escape2_consume_Price = friend.get("Friend_Escape2_consume_Price", 0)
-                                Friend_Sum_Escape1_Gained_Price = friend.get("Friend_Sum_Escape1_Gained_Price", 0)
-                                Friend_Sum_Escape2_Gained_Price = friend.get("Friend_Sum_Escape2_Gained_Price", 0)
-                                Friend_is_Escape1_num = friend.get("Friend_is_Escape1_num", 0)
-                                Friend_is_Escape2_num = friend.get("Friend_is_Escape2_num", 0)
-                                Friend_total_sol_KillPlayer = friend.get("Friend_total_sol_KillPlayer", 0)
-                                Friend_total_sol_DeathCount = friend.get("Friend_total_sol_DeathCount", 0)
-                                Friend_total_sol_num = friend.get("Friend_total_sol_num", 0)
+                                charac_name = (
+                                    urllib.parse.unquote(charac_name)
+                                    if charac_name
+                                    else "未知好友"
+                                )
+                                Friend_Escape1_consume_Price = friend.get(
+                                    "Friend_Escape1_consume_Price", 0
+                                )
+                                Friend_Escape2_consume_Price = friend.get(
+                                    "Friend_Escape2_consume_Price", 0
+                                )
+                                Friend_Sum_Escape1_Gained_Price = friend.get(
+                                    "Friend_Sum_Escape1_Gained_Price", 0
+                                )
+                                Friend_Sum_Escape2_Gained_Price = friend.get(
+                                    "Friend_Sum_Escape2_Gained_Price", 0
+                                )
+                                Friend_is_Escape1_num = friend.get(
+                                    "Friend_is_Escape1_num", 0
+                                )
+                                Friend_is_Escape2_num = friend.get(
+                                    "Friend_is_Escape2_num", 0
+                                )
+                                Friend_total_sol_KillPlayer = friend.get(
+                                    "Friend_total_sol_KillPlayer", 0
+                                )
+                                Friend_total_sol_DeathCount = friend.get(
+                                    "Friend_total_sol_DeathCount", 0
+                                )
+                                Friend_total_sol_num = friend.get(
+                                    "Friend_total_sol_num", 0
+                                )
 
                                 friend_dict["charac_name"] = charac_name
                                 friend_dict["sol_num"] = Friend_total_sol_num
@@ -941,11 +1042,17 @@ class MsgInfo:
                                 friend_dict["death_num"] = Friend_total_sol_DeathCount
                                 friend_dict["escape_num"] = Friend_is_Escape1_num
                                 friend_dict["fail_num"] = Friend_is_Escape2_num
-                                friend_dict["gained_str"] = Util.trans_num_easy_for_read(
-                                    Friend_Sum_Escape1_Gained_Price + Friend_Sum_Escape2_Gained_Price
+                                friend_dict["gained_str"] = (
+                                    Util.trans_num_easy_for_read(
+                                        Friend_Sum_Escape1_Gained_Price
+                                        + Friend_Sum_Escape2_Gained_Price
+                                    )
                                 )
-                                friend_dict["consume_str"] = Util.trans_num_easy_for_read(
-                                    Friend_Escape1_consume_Price + Friend_Escape2_consume_Price
+                                friend_dict["consume_str"] = (
+                                    Util.trans_num_easy_for_read(
+                                        Friend_Escape1_consume_Price
+                                        + Friend_Escape2_consume_Price
+                                    )
                                 )
                                 profit = (
                                     Friend_Sum_Escape1_Gained_Price
@@ -999,162 +1106,167 @@ class MsgInfo:
             return res["data"].get("collections", [])
         return []
 
-    async def watch_record(self, user_name: str, uid: str, avatar: Image.Image):
-        self.cookie = await DFUser.get_user_cookie_by_uid(uid)
-        if not self.cookie:
-            logger.warning(f"获取三角洲账号{uid}的cookie失败")
-            return ERROR_UNBOUND_ACCOUNT
+    async def _get_record_profile(
+        self, deltaapi: DeltaApi
+    ) -> Optional[Tuple[str, Optional[Image.Image]]]:
+        """获取战绩播报所需的昵称与带圆环的头像(带缓存), 仅在确有新战绩需要渲染时调用"""
         if not self.user_data:
+            return None
+
+        uid = self.user_data.uid
+        now = time.time()
+        cached = _record_profile_cache.get(uid)
+        if cached is not None and cached[0] > now:
+            return cached[1], await avatar_cache.get(cached[2], "ring")
+
+        res = await deltaapi.get_player_info(
+            access_token=self.user_data.cookie,
+            openid=uid,
+            with_currency=False,
+        )
+        if not res["status"] or not res["data"].get("player"):
+            logger.warning(f"获取三角洲账号{uid}的玩家信息失败")
+            return None
+
+        player = res["data"]["player"]
+        avatar_url = Util.avatar_trans(player["picurl"])
+        _record_profile_cache[uid] = (
+            now + RECORD_PROFILE_TTL,
+            player["charac_name"],
+            avatar_url,
+        )
+        return player["charac_name"], await avatar_cache.get(avatar_url, "ring")
+
+    @staticmethod
+    def _observe_match(uid: str, record: dict, mode: Literal["sol", "tdm"]) -> None:
+        event_time_str = record.get("dtEventTime", "")
+        if not event_time_str:
+            return
+        try:
+            event_time = Util.parse_event_time(
+                event_time_str, record.get("GameTime", 0), mode
+            )
+        except (TypeError, ValueError):
+            return
+        activity_tracker.observe_match(uid, event_time.timestamp())
+
+    async def watch_record(
+        self, uid: str, max_age_minutes: int = BROADCAST_EXPIRED_MINUTES
+    ):
+        """检查并生成新战绩播报
+
+        先只拉取烽火/战场第一页战绩与已记录的战绩ID比较,
+        只有确实存在需要播报的新战绩时才获取昵称、头像并渲染.
+        最新战绩ID写入 record_buffer, 由调用方在本轮结束时统一 flush.
+        最新战绩的时间同时记入 activity_tracker, 用于调整轮询间隔.
+
+        Args:
+            uid: 三角洲uid
+            max_age_minutes: 可播报的烽火战绩最大时长(分钟)
+        """
+        if not await self._validate_user() or not self.user_data:
             return ERROR_UNBOUND_ACCOUNT
 
         assert self.user_data is not None
-        deltaapi = DeltaApi(self.user_data.platform)
-        logger.debug(f"开始获取玩家{user_name}的战绩")
+        deltaapi = await self._get_delta_api()
+        cookie = self.user_data.cookie
+        last_sol, last_tdm = record_buffer.get(uid, self.bot_id, self.user_data)
+
+        sol_res, tdm_res = await asyncio.gather(
+            deltaapi.get_record(cookie, uid, MODE_SOL, 1),
+            deltaapi.get_record(cookie, uid, MODE_TDM, 1),
+        )
 
-        msg_info = []
         record_id = record_id_tdm = None
-        # 获取之前的最新战绩ID
-        latest_record_data = await self.user_data.get_latest_record(uid)
-        for mode in ["sol", "tdm"]:
-            if mode == "sol":
-                type_id = 4
-            elif mode == "tdm":
-                type_id = 5
+        new_sol = new_tdm = None
+
+        # sol模式
+        gun_records = sol_res["data"].get("gun", []) if sol_res["status"] else []
+        if gun_records:
+            latest_record: dict = gun_records[0]  # 第一条是最新的
+            self._observe_match(uid, latest_record, "sol")
+            # 检查时间限制
+            if not Util.is_record_within_time_limit(latest_record, max_age_minutes):
+                logger.debug(f"最新战绩时间超过{max_age_minutes}分钟，跳过播报")
             else:
-                type_id = 4
-            res = await deltaapi.get_record(self.user_data.cookie, uid, type_id, 1)
-
-            if res["status"]:
-                # sol模式
-                if mode == "sol":
-                    # 处理gun模式战绩
-                    gun_records = res["data"].get("gun", [])
-                    if not gun_records:
-                        # logger.debug(f"玩家{user_name}没有gun模式战绩")
-                        continue
-
-                    # 获取最新战绩
-                    if gun_records:
-                        latest_record: dict = gun_records[0]  # 第一条是最新的
-                        logger.debug(f"最新战绩：{latest_record}")
-
-                        # 检查时间限制
-                        if not Util.is_record_within_time_limit(latest_record):
-                            logger.debug(f"最新战绩时间超过{BROADCAST_EXPIRED_MINUTES}分钟，跳过播报")
-                            continue
-
-                        # 生成战绩ID
-                        record_id = Util.generate_record_id(latest_record)
-                        logger.debug(f"[DF][sol]最新战绩ID：{record_id}")
-
-                        # 如果是新战绩（ID不同）
-                        if latest_record_data is None or latest_record_data != record_id:
-                            RoomId = latest_record.get("RoomId", "")
-                            res = await deltaapi.get_tdm_detail(
-                                self.user_data.cookie,
-                                self.user_data.uid,
-                                RoomId,
-                            )
-                            logger.info(f"[DF][sol]获取战绩详情：{res}")
-                            if res["status"] and res["data"]:
-                                mpDetailList = res["data"].get("mpDetailList", [])
-                                for mpDetail in mpDetailList:
-                                    if mpDetail.get("isCurrentUser", False):
-                                        rescueTeammateCount = mpDetail.get("rescueTeammateCount", 0)
-                                        if rescueTeammateCount > 0:
-                                            latest_record["RescueTeammateCount"] = rescueTeammateCount
-                                            break
-                            else:
-                                logger.error(f"获取战绩详情失败: {res}")
-
-                        else:
-                            logger.debug(f"[DF][sol]没有新战绩需要播报: {user_name}")
-                            continue
-                        logger.info(f"[DF][sol]最近：{latest_record}")
-                        msg = await self.format_record_message(latest_record, user_name)
-                        if isinstance(msg, str) or msg is None:
-                            return msg
-                        else:
-                            msg["user_name"] = user_name
-                            msg_info = await draw_sol_record(avatar.resize((150, 150)), msg)
-                        # logger.info(f"[DF][sol]格式化战绩消息：{msg}")
-                        # msg_info.append(a)
-                    else:
-                        continue
-                # tdm模式
-                elif mode == "tdm":
-                    # logger.debug(f"玩家{user_name}的战绩：{res['data']}")
-
-                    # 处理operator模式战绩
-                    operator_records = res["data"].get("operator", [])
-                    if not operator_records:
-                        # logger.debug(f"玩家{user_name}没有operator模式战绩")
-                        continue
-
-                    # 获取最新战绩
-                    if operator_records:
-                        latest_record = operator_records[0]  # 第一条是最新的
-                        # logger.debug(f"最新战绩：{latest_record}")
-                        # 生成战绩ID
-                        record_id_tdm = Util.generate_record_id(latest_record)
-
-                        # 检查时间限制
-                        if not record_id_tdm:
-                            logger.debug(
-                                f"[DF][tdm]最新战绩ID：{record_id_tdm}最新战绩时间超过{BROADCAST_EXPIRED_MINUTES}分钟，跳过播报"
-                            )
-                            continue
+                record_id = Util.generate_record_id(latest_record)
+                logger.debug(f"[DF][sol]最新战绩ID：{record_id}")
+                if record_id != last_sol:
+                    new_sol = latest_record
+                else:
+                    logger.debug(f"[DF][sol]没有新战绩需要播报: {uid}")
 
-                        # 如果是新战绩（ID不同）
-                        if latest_record_data is None or latest_record_data != record_id_tdm:
-                            # 格式化播报消息
-                            result_tdm = await self.format_tdm_record_message(latest_record, user_name)
-                            msg_info = result_tdm
+        # tdm模式
+        operator_records = (
+            tdm_res["data"].get("operator", []) if tdm_res["status"] else []
+        )
+        if operator_records:
+            latest_record = operator_records[0]  # 第一条是最新的
+            self._observe_match(uid, latest_record, "tdm")
+            record_id_tdm = Util.generate_record_id(latest_record) or None
+            if record_id_tdm is None:
+                logger.debug(
+                    f"[DF][tdm]最新战绩时间超过{BROADCAST_EXPIRED_MINUTES}分钟，跳过播报"
+                )
+            elif record_id_tdm != last_tdm:
+                new_tdm = latest_record
+            else:
+                logger.debug(f"[DF][tdm]没有新战绩需要播报: {uid}")
 
-                        else:
-                            logger.debug(f"[DF][tdm]没有新战绩需要播报: {user_name}")
+        msg_info = []
+        user_name = uid
+        if new_sol is not None or new_tdm is not None:
+            profile = await self._get_record_profile(deltaapi)
+            if profile is None:
+                return ERROR_LOGIN_EXPIRED
+            user_name, avatar = profile
 
-        # 更新最新战绩记录
+            if new_sol is not None:
+                # 非百万撤离/战损的战绩不播报, 但仍需记录战绩ID避免下轮重复渲染
+                msg_info = (
+                    await self._render_sol_record(deltaapi, new_sol, user_name, avatar)
+                    or []
+                )
+            if new_tdm is not None:
+                # 格式化播报消息
+                msg_info = await self.format_tdm_record_message(new_tdm, user_name)
 
-        await self.update_record(
-            record_id,
-            record_id_tdm,
-            user_name,
-            uid=uid,
-        )
+        # 更新最新战绩记录, 仅在变化时标记待写回
+        record_buffer.set(uid, self.bot_id, record_id, record_id_tdm)
         return msg_info
 
-    async def update_record(
+    async def _render_sol_record(
         self,
-        latest_record_sol: str | None,
-        latest_record_tdm: str | None,
+        deltaapi: DeltaApi,
+        record: dict,
         user_name: str,
-        uid: str,
+        avatar: Optional[Image.Image],
     ):
-        self.user_data = await self._fetch_user_data()
-        if not self.user_data:
-            return ERROR_UNBOUND_ACCOUNT
-
+        """补全救援数据并渲染烽火战绩播报卡片"""
         assert self.user_data is not None
-        if latest_record_sol is None:
-            logger.debug(f"玩家{user_name}没有sol模式战绩")
-            latest_record_sol = self.user_data.latest_record
-
-        if latest_record_tdm is None:
-            logger.debug(f"玩家{user_name}没有tdm模式战绩")
-            latest_record_tdm = self.user_data.latest_tdm_record
+        res = await deltaapi.get_tdm_detail(
+            self.user_data.cookie,
+            self.user_data.uid,
+            record.get("RoomId", ""),
+        )
+        logger.info(f"[DF][sol]获取战绩详情：{res}")
+        if res["status"] and res["data"]:
+            mpDetailList = res["data"].get("mpDetailList", [])
+            for mpDetail in mpDetailList:
+                if mpDetail.get("isCurrentUser", False):
+                    rescueTeammateCount = mpDetail.get("rescueTeammateCount", 0)
+                    if rescueTeammateCount > 0:
+                        record["RescueTeammateCount"] = rescueTeammateCount
+                        break
+        else:
+            logger.error(f"获取战绩详情失败: {res}")
 
-        try:
-            await self.user_data.update_record(
-                uid=uid,
-                bot_id=self.bot_id,
-                latest_record=latest_record_sol,
-                latest_tdm_record=latest_record_tdm,
-            )
-            logger.debug(f"更新战绩记录成功: {user_name}")
-        except Exception as e:
-            logger.error(f"更新战绩记录失败: {user_name}: {e}")
-            return f"更新战绩记录失败: {user_name}"
+        logger.info(f"[DF][sol]最近：{record}")
+        msg = await self.format_record_message(record, user_name)
+        if isinstance(msg, str) or msg is None:
+            return msg
+        msg["user_name"] = user_name
+        return await draw_sol_record(avatar, msg)
 
     @staticmethod
     def _format_duration(seconds: int) -> str:
@@ -1172,7 +1284,9 @@ class MsgInfo:
             return str(price), price >= 0
 
     @staticmethod
-    async def format_record_message(record_data: dict, user_name: str) -> RecordSol | str | None:
+    async def format_record_message(
+        record_data: dict, user_name: str
+    ) -> RecordSol | str | None:
         """格式化战绩播报消息"""
         try:
             duration_seconds = record_data.get("DurationS", 0)
@@ -1245,7 +1359,9 @@ class MsgInfo:
             return None
 
     @staticmethod
-    async def format_tdm_record_message(record_data: dict, user_name: str) -> RecordTdm | str | None:
+    async def format_tdm_record_message(
+        record_data: dict, user_name: str
+    ) -> RecordTdm | str | None:
         """格式化战场战绩播报消息"""
         try:
             # 解析时间
@@ -1264,7 +1380,9 @@ class MsgInfo:
             game_time: int = record_data.get("gametime", 0)  # 秒
             game_time_str = Util.seconds_to_duration(game_time)
             # 分均得分（避免除零）
-            avg_score_per_minute: int = int(total_score * 60 / game_time) if game_time and game_time > 0 else 0
+            avg_score_per_minute: int = (
+                int(total_score * 60 / game_time) if game_time and game_time > 0 else 0
+            )
 
             # 触发条件
             trigger_kill = kill_num >= 100
@@ -1291,7 +1409,9 @@ class MsgInfo:
                     "map_name": map_name,
                     "result": match_result,
                     "gametime": game_time_str,
-                    "armed_force": Util.get_armed_force_name(record_data.get("ArmedForceId", 0)),
+                    "armed_force": Util.get_armed_force_name(
+                        record_data.get("ArmedForceId", 0)
+                    ),
                     "kill_count": kill_num,
                     "death_count": death_num,
                     "assist_count": assist_num,
@@ -1391,20 +1511,20 @@ class MsgInfo:
             return None
         # 文字输出
         msg = f"===仓库中共有{data['total']}个大红===\n"
-        try:
-            data_json = read_item_json()
-        except FileNotFoundError as e:
-            logger.error(f"读取item.json失败: {str(e)}")
+        if not len(item_catalog):
+            logger.error(f"物品目录为空, 请先下载资源: {item_catalog.path}")
             return None
         data_list = data["list"]
         for index, item in enumerate(data_list):
             # 核对名称和图片
-            nameid = item["itemId"]
-            item_data = next((i for i in data_json if str(i["objectID"]) == nameid), None)
-            # logger.info(str(item_data))
-            if item_data is not None and str(item_data["objectID"]) == str(item["itemId"]):
+            item_data = item_catalog.get(item["itemId"])
+            if item_data is not None:
                 name = item_data["objectName"]
-                name_type = item_data["thirdClassCN"] if item_data.get("thirdClassCN") else item_data["secondClassCN"]
+                name_type = (
+                    item_data["thirdClassCN"]
+                    if item_data.get("thirdClassCN")
+                    else item_data["secondClassCN"]
+                )
                 # pic = item_data["prePic"]
                 length = item_data["length"]
                 width = item_data["width"]
@@ -1415,12 +1535,14 @@ class MsgInfo:
                     weight = f"{float(weight):.2f}"
                 # avg_price = item_data["avgPrice"]
                 prop = item_data["propsDetail"]
-                prop_local = prop.get("propsSource") if prop.get("propsSource") else "未知"
+                prop_local = (
+                    prop.get("propsSource") if prop.get("propsSource") else "未知"
+                )
                 msg += f"""{index + 1}: [{prop["type"]} | {name_type}] {name} ({length}*{width} | {weight}kg)
     获取日期:{item["time"]}
     掉落位置:{prop_local}
 """
-        return await text2pic(msg)
+        return await draw_text_card(msg)
 
     async def get_item_price(self, item_id: str, item_name: str):
         """获取物品小时均价
@@ -1429,44 +1551,170 @@ class MsgInfo:
             item_id (str): 物品id
 
         Returns:
-            Optional[ItemHourPriceData]: 物品小时均价数据或None
+            Optional[str]: 物品价格文本或None
         """
         if not await self._validate_user() or not self.user_data:
             logger.warning(f"用户{self.user_id}未绑定账号")
             return None
         deltaapi = await self._get_delta_api()
-        cookie = self.user_data.cookie
-        openid = self.user_data.uid
-        res = await deltaapi.get_item_hour_price(cookie, openid, item_id)
-
-        if res["status"] and res["data"]:
-            data = cast(ItemHourPriceData, res["data"])
-            logger.info(data)
-            msg = f"{item_name}: 当前价格{data[item_id]['avg_buyprice']:.0f}哈夫币"
-            return msg
-        else:
-            logger.warning(f"获取物品小时均价失败: {res.get('message', '未知错误')}")
+        prices = await price_service.get_prices(
+            deltaapi, self.user_data.cookie, self.user_data.uid, [item_id]
+        )
+        price = prices.get(item_id)
+        if price is None:
             return None
+        return f"{item_name}: 当前价格{price:.0f}哈夫币"
 
-    async def get_best_tqc_price(self):
-        """获取特勤处利润最佳"""
+    async def get_item_prices(self, queries: List[str]):
+        """批量查询物品小时均价, 合并为一张表格图片
+
+        Args:
+            queries: 物品名称或物品id列表
+
+        Returns:
+            Union[str, bytes]: 错误信息或表格图片
+        """
         if not await self._validate_user() or not self.user_data:
-            logger.warning(f"用户{self.user_id}未绑定账号")
-            return None
+            return ERROR_UNBOUND_ACCOUNT
+        queries = queries[:PRICE_QUERY_MAX_ITEMS]
+
+        # (查询词, 物品id, 物品名称)
+        resolved: List[Tuple[str, Optional[str], str]] = []
+        for query in queries:
+            item = item_catalog.get(query) if query.isdigit() else None
+            if item is None:
+                items = item_catalog.search(query, 1)
+                item = items[0] if items else None
+            if item is None:
+                resolved.append((query, query if query.isdigit() else None, query))
+            else:
+                resolved.append((query, str(item["objectID"]), item["objectName"]))
+
         deltaapi = await self._get_delta_api()
-        cookie = self.user_data.cookie
-        openid = self.user_data.uid
-        tqc = await deltaapi.get_place_list_with_profit(cookie, openid)
-        if tqc["status"] and tqc["data"]:
-            data = cast(List[PlaceWithProfitData], tqc["data"])
-            logger.info(data)
-            msg = "特勤处利润最佳:\n"
-            for index, item in enumerate(data):
-                msg += f"{index + 1}: {item['placeName']} ({item['profit']:.0f}哈夫币)\n"
-            return msg
+        prices = await price_service.get_prices(
+            deltaapi,
+            self.user_data.cookie,
+            self.user_data.uid,
+            [item_id for _, item_id, _ in resolved if item_id],
+        )
+
+        stat_hour = datetime.datetime.fromtimestamp(next_stat_hour() - 3600).strftime(
+            "%m-%d %H:00"
+        )
+        msg = f"===物品小时均价 ({stat_hour})===\n"
+        for index, (query, item_id, name) in enumerate(resolved):
+            price = prices.get(item_id) if item_id else None
+            price_str = f"{price:,.0f}哈夫币" if price is not None else "未找到"
+            matched = f" (匹配: {query})" if name != query else ""
+            msg += f"{index + 1}: {name}{matched} | {price_str}\n"
+        return await draw_text_card(msg)
+
+    async def get_price_trend(
+        self, item_id: str, item_name: str, hours: int = PRICE_TREND_HOURS
+    ):
+        """根据本地价格历史生成价格趋势, 不请求上游接口
+
+        Args:
+            item_id: 物品id
+            item_name: 物品名称
+            hours: 回看小时数
+
+        Returns:
+            Union[str, bytes]: 提示信息或趋势图片
+        """
+        trend = await price_history.trend(item_id, hours)
+        if trend is None:
+            return f"暂无{item_name}的价格历史，请稍后再试"
+
+        def fmt_ts(ts: int) -> str:
+            return datetime.datetime.fromtimestamp(ts).strftime("%m-%d %H:00")
+
+        msg = f"===物品价格趋势 {item_name}===\n"
+        msg += f"区间: {fmt_ts(trend.series[0][0])} ~ {fmt_ts(trend.series[-1][0])} ({len(trend.series)}个整点)\n"
+        msg += f"最新: {trend.last:,.0f}哈夫币 | 涨跌: {trend.change:+.2%}\n"
+        msg += f"最低: {trend.low:,.0f} | 最高: {trend.high:,.0f}\n"
+        for window, value in trend.moving_averages.items():
+            msg += f"{window}小时均线: {value:,.0f}\n"
+        if trend.best_hours:
+            hours_str = "、".join(
+                f"{hour:02d}:00({premium:+.2%})" for hour, premium in trend.best_hours
+            )
+            msg += f"最佳出售时段: {hours_str}\n"
         else:
-            logger.warning(f"获取特勤处利润最佳失败: {tqc.get('message', '未知错误')}")
-            return None
+            msg += "最佳出售时段: 样本不足\n"
+
+        # 各特勤处最近一次记录的利润
+        latest: Dict[str, Tuple[float, float]] = {}
+        for _, place, profit, per_hour in await price_history.profit_series(
+            item_id, hours
+        ):
+            latest[place] = (profit, per_hour)
+        for place, (profit, per_hour) in latest.items():
+            msg += f"特勤处({place})利润: 单次{profit:,.0f} | 每小时{per_hour:,.0f}\n"
+        return await draw_text_card(msg)
+
+    async def get_tqc_places(self) -> Dict[str, TQCPriceData]:
+        """并发获取全部工作台的配方与利润数据, 同时记入价格历史"""
+        if not await self._validate_user() or not self.user_data:
+            return {}
+        deltaapi = await self._get_delta_api()
+        results = await asyncio.gather(
+            *(
+                deltaapi.get_place_list_with_profit(
+                    self.user_data.cookie, self.user_data.uid, place
+                )
+                for place in TQC_PLACES
+            )
+        )
+        places: Dict[str, TQCPriceData] = {}
+        for place, res in zip(TQC_PLACES, results):
+            if res["status"] and res["data"]:
+                places[place] = cast(TQCPriceData, res["data"])
+                price_history.observe_places(place, places[place])
+            else:
+                logger.warning(
+                    f"[DF] 获取特勤处{place}利润失败: {res.get('message', '未知错误')}"
+                )
+        return places
+
+    async def get_best_tqc_price(
+        self, budget: Optional[float] = None, hours: Optional[float] = None
+    ):
+        """获取各工作台利润最佳的配方
+
+        Args:
+            budget: 单次投入上限(哈夫币)
+            hours: 可用的剩余小时数, 只推荐能在此期间完成的配方
+
+        Returns:
+            Union[str, bytes]: 错误信息或排行图片
+        """
+        if not await self._validate_user() or not self.user_data:
+            return ERROR_UNBOUND_ACCOUNT
+        places = await self.get_tqc_places()
+        if not places:
+            return "获取特勤处利润失败，请稍后再试"
+
+        ranked = rank_recipes(places, budget, hours)
+        title = "特勤处利润排行"
+        if budget is not None:
+            title += f" 预算{budget:,.0f}"
+        if hours is not None:
+            title += f" {hours:g}小时内"
+        msg = f"==={title}===\n"
+        for place, recipes in ranked.items():
+            msg += f"【{TQC_PLACES.get(place, place)}】\n"
+            if not recipes:
+                msg += "  没有满足条件的配方\n"
+            for index, recipe in enumerate(recipes):
+                msg += (
+                    f"  {index + 1}. {recipe.name} | 每小时{recipe.profit_per_hour:,.0f}"
+                    f" | 单次{recipe.profit:,.0f} ({recipe.period:g}小时, 投入{recipe.cost:,.0f})"
+                )
+                if hours is not None:
+                    msg += f" | {recipe.batches}批共{recipe.total_profit:,.0f}"
+                msg += "\n"
+        return await draw_text_card(msg)
 
 
 async def create_item_json(ev, bot, dl: bool = True):
@@ -1475,11 +1723,50 @@ async def create_item_json(ev, bot, dl: bool = True):
     depot = await data.get_depot_text()
     if depot is None:
         return "用户仓库为空！"
-    with open(RESOURCE_PATH.parent / "item.json", mode="w", encoding="utf-8") as f:
-        json.dump(depot, f, ensure_ascii=False, indent=4)
+    await item_catalog.save(depot)
     if dl:
         for one in depot:
-            await download(one["pic"], RESOURCE_PATH, name=f"{one['objectID']}.png", tag="[DF]")
+            await download(
+                one["pic"], RESOURCE_PATH, name=f"{one['objectID']}.png", tag="[DF]"
+            )
         return "ss全部资源下载完成!"
     else:
         return depot
+
+
+async def _refresh_item_catalog() -> bool:
+    for user_data in await DFUser.get_all_data():
+        depot = await MsgInfo(
+            user_data.user_id, user_data.bot_id, user_data
+        ).get_depot_text()
+        if depot:
+            await item_catalog.save(depot)
+            logger.info(f"[DF] 物品目录已更新, 共 {len(item_catalog.items)} 个物品")
+            return True
+    logger.warning("[DF] 更新物品目录失败: 没有可用的账号")
+    return False
+
+
+async def record_price_history() -> bool:
+    """用任一有效账号拉取各特勤处利润及物品均价, 追加到本地价格历史"""
+    recorded = False
+    for user_data in await DFUser.get_all_data():
+        if await MsgInfo(
+            user_data.user_id, user_data.bot_id, user_data
+        ).get_tqc_places():
+            recorded = True
+            break
+    if not recorded:
+        logger.warning("[DF] 记录价格历史失败: 没有可用的账号")
+    prices, profits = await price_history.flush()
+    pruned = await price_history.prune()
+    logger.info(
+        f"[DF] 价格历史已更新: 均价{prices}条, 利润{profits}条, 清理过期{pruned}条"
+    )
+    return recorded
+
+
+async def refresh_item_catalog() -> bool:
+    """用任一有效账号从接口拉取物品目录并写入 item.json, 并发调用只执行一次"""
+    result, _ = await _catalog_flight.do("item_catalog", _refresh_item_catalog)
+    return result
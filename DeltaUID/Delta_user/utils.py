@@ -1,13 +1,9 @@
 import sys
-import json
 import time
-from typing import cast
 
 from gsuid_core.models import Event
 from gsuid_core.data_store import get_res_path
 
-from ..utils.models import ItemIdData
-
 MAIN_PATH = get_res_path() / "DeltaUID"
 sys.path.append(str(MAIN_PATH))
 RESOURCE_PATH = MAIN_PATH / "res"
@@ -30,9 +26,3 @@ def check_last_call(user_id: str, limit: int = 60) -> bool:
 
 def update_last_call(user_id: str):
     last_call_times[user_id] = time.time()
-
-
-def read_item_json():
-    with open(RESOURCE_PATH.parent / "item.json", mode="r", encoding="utf-8") as f:
-        data = json.load(f)
-    return cast(list[ItemIdData], data)
@@ -0,0 +1,86 @@
+import math
+import time
+from typing import Dict, List, Callable, Iterable, Optional
+from dataclasses import dataclass
+
+from .api.utils import BROADCAST_EXPIRED_MINUTES
+from .const import RECORD_ACTIVE_WINDOW, RECORD_POLL_INTERVAL, RECORD_POLL_MAX_INTERVAL
+
+
+@dataclass
+class PlayerActivity:
+    """单个玩家的活跃状态"""
+
+    last_active: float = 0.0
+    """最近一局战绩的结束时间或最近一次交互命令的时间"""
+    last_poll: float = 0.0
+    """上一次轮询战绩的时间"""
+    interval: float = RECORD_POLL_INTERVAL
+    """当前轮询间隔(秒)"""
+
+
+class ActivityTracker:
+    """按 openid 记录玩家活跃度, 决定战绩轮询间隔
+
+    最近 RECORD_ACTIVE_WINDOW 内打过对局或使用过命令的玩家按基础间隔轮询,
+    否则每次轮询后间隔翻倍, 直到 RECORD_POLL_MAX_INTERVAL.
+    """
+
+    def __init__(self):
+        self._players: Dict[str, PlayerActivity] = {}
+        self._listeners: List[Callable[[str], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def get(self, openid: str) -> PlayerActivity:
+        return self._players.setdefault(openid, PlayerActivity())
+
+    def listen(self, callback: Callable[[str], None]) -> None:
+        """注册玩家重新活跃(交互命令)时的回调"""
+        self._listeners.append(callback)
+
+    def retain(self, openids: Iterable[str]) -> None:
+        alive = set(openids)
+        for openid in [k for k in self._players if k not in alive]:
+            del self._players[openid]
+
+    def observe_match(self, openid: str, event_time: float) -> None:
+        """记录一局战绩的结束时间"""
+        player = self.get(openid)
+        player.last_active = max(player.last_active, event_time)
+
+    def touch(self, openid: str, now: Optional[float] = None) -> None:
+        """玩家使用了交互命令: 立即恢复基础轮询间隔"""
+        player = self.get(openid)
+        player.last_active = time.time() if now is None else now
+        if player.interval > RECORD_POLL_INTERVAL:
+            player.interval = RECORD_POLL_INTERVAL
+            for callback in self._listeners:
+                callback(openid)
+
+    def is_active(self, openid: str, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return now - self.get(openid).last_active <= RECORD_ACTIVE_WINDOW
+
+    def max_age_minutes(self, openid: str, now: Optional[float] = None) -> int:
+        """本次轮询可播报的战绩最大时长: 至少覆盖距上次轮询的间隔, 避免退避期间漏播"""
+        now = time.time() if now is None else now
+        last_poll = self.get(openid).last_poll
+        if not last_poll:
+            return BROADCAST_EXPIRED_MINUTES
+        return max(BROADCAST_EXPIRED_MINUTES, math.ceil((now - last_poll) / 60) + 1)
+
+    def next_interval(self, openid: str, now: Optional[float] = None) -> float:
+        """记录一次轮询并返回到下一次轮询的间隔"""
+        now = time.time() if now is None else now
+        player = self.get(openid)
+        player.last_poll = now
+        if self.is_active(openid, now):
+            player.interval = RECORD_POLL_INTERVAL
+        else:
+            player.interval = min(player.interval * 2, RECORD_POLL_MAX_INTERVAL)
+        return player.interval
+
+
+activity_tracker = ActivityTracker()
@@ -4,15 +4,38 @@ import time
 import base64
 import asyncio
 import urllib.parse
-from typing import Any, Optional, cast
-from functools import wraps
+from typing import Any, Callable, Optional, cast
 
 import httpx
 
 from gsuid_core.logger import logger
 
+from .limiter import rate_limiter
+from .coalesce import request_flight
 from .utils import LOGIN_APP_ID, API_CONSTANTS, Util
-from ..models import Sign, SignMsg, UserInfo, BigRedData, LoginStatus, TQCPriceData, ItemHourPriceData
+from .pipeline import (
+    ApiRequest,
+    CacheMiddleware,
+    RequestPipeline,
+    RetryMiddleware,
+    MetricsMiddleware,
+    TracingMiddleware,
+    CoalesceMiddleware,
+    RateLimitMiddleware,
+    is_json_ok,
+    response_cache,
+)
+from ..metrics import metrics
+from ..const import API_THROTTLE_PAUSE
+from ..models import (
+    Sign,
+    SignMsg,
+    UserInfo,
+    BigRedData,
+    LoginStatus,
+    TQCPriceData,
+    ItemHourPriceData,
+)
 
 CONSTANTS = API_CONSTANTS
 
@@ -32,13 +55,66 @@ async def get_global_client() -> httpx.AsyncClient:
             if _global_client is None:
                 _global_client = httpx.AsyncClient(
                     timeout=DEFAULT_TIMEOUT,
-                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
-                    follow_redirects=False,  # 不自动跟随重定向，以获取Location header
+                    limits=httpx.Limits(
+                        max_connections=100, max_keepalive_connections=20
+                    ),
                     http2=False,  # 禁用HTTP/2保持与delta-helper一致
+                    follow_redirects=False,  # 不自动跟随重定向，以获取Location header
                 )
     return _global_client
 
 
+async def _send(request: ApiRequest) -> httpx.Response:
+    """请求管道的最内层: 通过全局客户端真正发出请求"""
+    client = await get_global_client()
+    return await client.request(
+        request.method,
+        request.url,
+        params=request.params,
+        data=request.data,
+        cookies=request.cookies,
+        headers=request.headers,
+    )
+
+
+# 所有 DeltaApi 请求共用的管道, 由外到内: 日志 -> 缓存 -> 合并 -> 统计 -> 重试 -> 限流
+api_pipeline = RequestPipeline(
+    _send,
+    [
+        TracingMiddleware(),
+        CacheMiddleware(response_cache),
+        CoalesceMiddleware(request_flight),
+        MetricsMiddleware(metrics.observe),
+        RetryMiddleware(),
+        RateLimitMiddleware(rate_limiter),
+    ],
+)
+
+
+def get_cache_stats() -> dict[str, Any]:
+    """获取接口缓存统计"""
+    return response_cache.stats()
+
+
+def get_coalesce_stats() -> dict[str, int]:
+    """获取请求合并统计"""
+    return request_flight.stats()
+
+
+def get_rate_limit_stats() -> dict[str, Any]:
+    """获取限流统计"""
+    return rate_limiter.stats()
+
+
+def get_api_snapshot() -> dict[str, Any]:
+    """获取接口指标快照, 附带缓存/合并/限流统计"""
+    return metrics.snapshot(
+        cache=get_cache_stats(),
+        coalesce=get_coalesce_stats(),
+        rate_limit=get_rate_limit_stats(),
+    )
+
+
 async def close_global_client():
     """关闭全局客户端 程序退出时调用"""
     global _global_client
@@ -47,27 +123,6 @@ async def close_global_client():
         _global_client = None
 
 
-def api_retry(func):
-    """API请求重试装饰器 使用原生asyncio实现"""
-
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        max_attempts = 3
-        for attempt in range(1, max_attempts + 1):
-            try:
-                return await func(*args, **kwargs)
-            except (httpx.TransportError, httpx.TimeoutException) as e:
-                if attempt == max_attempts:
-                    logger.exception(f"请求失败已达到最大重试次数: {e}")
-                    raise
-                # 指数退避: 1, 2, 4 秒 (multiplier=1, min=1, max=5)
-                wait_time = min(2 ** (attempt - 1), 5)
-                logger.warning(f"请求失败 (尝试 {attempt}/{max_attempts}), {wait_time}秒后重试: {e}")
-                await asyncio.sleep(wait_time)
-
-    return wrapper
-
-
 class DeltaApi:
     def __init__(self, platform: str = "qq"):
         self.platform = platform
@@ -104,7 +159,34 @@ class DeltaApi:
     #         "data": data,
     #     }
 
-    @api_retry
+    async def _request(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        *,
+        params: dict | None = None,
+        data: dict | None = None,
+        cookies: dict | None = None,
+        headers: dict | None = None,
+        openid: str | None = None,
+        cacheable: Callable[[httpx.Response], bool] = is_json_ok,
+    ) -> httpx.Response:
+        """所有接口请求的统一入口, 经过请求管道中的重试/限流/缓存/统计等中间件"""
+        return await api_pipeline(
+            ApiRequest(
+                endpoint=endpoint,
+                method=method,
+                url=url,
+                params=params,
+                data=data,
+                cookies=cookies,
+                headers=headers,
+                openid=openid,
+                cacheable=cacheable,
+            )
+        )
+
     async def _post_request(
         self,
         url: str,
@@ -112,11 +194,13 @@ class DeltaApi:
         params: dict | None = None,
         cookies: dict | None = None,
         headers: dict | None = None,
+        endpoint: str = "post",
     ) -> dict[str, Any]:
         """发送POST请求并解析响应"""
-        client = await get_global_client()
         try:
-            response = await client.post(
+            response = await self._request(
+                endpoint,
+                "POST",
                 url,
                 data=form_data,
                 params=params,
@@ -129,18 +213,19 @@ class DeltaApi:
             logger.exception(f"请求失败: {e}")
             return {"ret": -1}
 
-    @api_retry
     async def _get_request(
         self,
         url: str,
         params: dict | None = None,
         cookies: dict | None = None,
         headers: dict | None = None,
+        endpoint: str = "get",
     ) -> dict[str, Any]:
         """发送GET请求并解析响应"""
-        client = await get_global_client()
         try:
-            response = await client.get(
+            response = await self._request(
+                endpoint,
+                "GET",
                 url,
                 params=params,
                 cookies=cookies,
@@ -171,8 +256,9 @@ class DeltaApi:
         }
 
         try:
-            client = await get_global_client()
-            response = await client.get(url, headers=headers, params=params)
+            response = await self._request(
+                "get_login_token", "GET", url, headers=headers, params=params
+            )
             if response.status_code == 200:
                 return True
             else:
@@ -201,8 +287,9 @@ class DeltaApi:
         url = CONSTANTS["SIG"]
 
         try:
-            client = await get_global_client()
-            response = await client.get(url, headers=headers, params=params)
+            response = await self._request(
+                "get_sig", "GET", url, headers=headers, params=params
+            )
 
             if response.status_code == 200:
                 qrSig = response.cookies.get("qrsig", "")
@@ -237,7 +324,9 @@ class DeltaApi:
                 "message": "获取二维码失败，详情请查看日志",
             }
 
-    async def get_login_status(self, cookie: str, qrSig: str, qrToken: str, loginSig: str) -> LoginStatus:
+    async def get_login_status(
+        self, cookie: str, qrSig: str, qrToken: str, loginSig: str
+    ) -> LoginStatus:
         headers = CONSTANTS["REQUEST_HEADERS_BASE"]
         url = CONSTANTS["GETLOGINSTATUS"]
 
@@ -281,8 +370,14 @@ class DeltaApi:
                 if value != "":
                     httpx_cookies[name] = str(value)
 
-            client = await get_global_client()
-            response = await client.get(url, params=params, cookies=httpx_cookies, headers=headers)
+            response = await self._request(
+                "get_login_status",
+                "GET",
+                url,
+                params=params,
+                cookies=httpx_cookies,
+                headers=headers,
+            )
 
             if response.status_code != 200:
                 return {"code": -5, "message": "响应错误", "data": {}}
@@ -294,9 +389,7 @@ class DeltaApi:
                 return {"code": -1, "message": "qrSig参数不正确", "data": {}}
 
             # 使用正则表达式解析ptuiCB响应
-            pattern = (
-                r"ptuiCB\s*\(\s*'(.*?)'\s*,\s*'(.*?)'\s*,\s*'(.*?)'\s*,\s*'(.*?)'\s*,\s*'(.*?)'\s*,\s*'(.*?)'\s*\)"
-            )
+            pattern = r"ptuiCB\s*\(\s*'(.*?)'\s*,\s*'(.*?)'\s*,\s*'(.*?)'\s*,\s*'(.*?)'\s*,\s*'(.*?)'\s*,\s*'(.*?)'\s*\)"
             matches = re.search(pattern, result)
 
             if not matches:
@@ -326,8 +419,13 @@ class DeltaApi:
             # qq = qq_match.group(1)
 
             # 访问重定向URL获取完整cookie
-            client = await get_global_client()
-            redirect_response = await client.get(q_url, cookies=httpx_cookies, headers=headers)
+            redirect_response = await self._request(
+                "get_login_status",
+                "GET",
+                q_url,
+                cookies=httpx_cookies,
+                headers=headers,
+            )
 
             # 合并所有cookie，保持与PHP版本一致
             all_cookies = {}
@@ -392,9 +490,17 @@ class DeltaApi:
             }
             logger.info(f"[DF] 授权请求参数: {form_data}")
             url = "https://graph.qq.com/oauth2.0/authorize"
-            client = await get_global_client()
-            response = await client.post(url, data=form_data, headers=headers, cookies=cookies)
-            logger.info(f"[DF] 授权请求响应: {response.status_code} {response.text}, 响应头: {response.headers}")
+            response = await self._request(
+                "get_access_token",
+                "POST",
+                url,
+                data=form_data,
+                headers=headers,
+                cookies=cookies,
+            )
+            logger.info(
+                f"[DF] 授权请求响应: {response.status_code} {response.text}, 响应头: {response.headers}"
+            )
             # 从Location头中提取code
             location = response.headers.get("Location", "")
             code_match = re.search(r"code=(.*?)&", location)
@@ -408,8 +514,9 @@ class DeltaApi:
             qc_code = code_match.group(1)
 
             # 访问重定向URL
-            client = await get_global_client()
-            await client.get(location, cookies=cookies, headers=headers)
+            await self._request(
+                "get_access_token", "GET", location, cookies=cookies, headers=headers
+            )
 
             # 第二步：获取openid和access_token
             headers = {
@@ -426,15 +533,23 @@ class DeltaApi:
             }
 
             url = "https://ams.game.qq.com/ams/userLoginSvr"
-            client = await get_global_client()
-            response = await client.get(url, params=params, cookies=cookies, headers=headers)
+            response = await self._request(
+                "get_access_token",
+                "GET",
+                url,
+                params=params,
+                cookies=cookies,
+                headers=headers,
+            )
 
             result = response.text
             logger.debug(f"AccessToken获取结果: {result}")
 
             # 解析JSONP响应
             # 匹配 try{miloJsonpCb_86690({...});}catch(e){} 格式
-            jsonp_match = re.search(r"try\{miloJsonpCb_86690\((\{.*?\})\);\}catch\(e\)\{\}", result)
+            jsonp_match = re.search(
+                r"try\{miloJsonpCb_86690\((\{.*?\})\);\}catch\(e\)\{\}", result
+            )
             if not jsonp_match:
                 # 尝试匹配不带try-catch的格式
                 jsonp_match = re.search(r"miloJsonpCb_86690\((\{.*?\})\)", result)
@@ -496,8 +611,13 @@ class DeltaApi:
             }
 
             url = "https://comm.ams.game.qq.com/ide/"
-            client = await get_global_client()
-            response = await client.post(CONSTANTS["GAMEBASEURL"], data=form_data, cookies=cookies)
+            response = await self._request(
+                "bind",
+                "POST",
+                CONSTANTS["GAMEBASEURL"],
+                data=form_data,
+                cookies=cookies,
+            )
 
             data = response.json()
             if data["ret"] != 0:
@@ -529,8 +649,9 @@ class DeltaApi:
                 }
 
                 url = API_CONSTANTS["GAME_API_URL"]
-                client = await get_global_client()
-                response = await client.get(url, params=params, headers=headers)
+                response = await self._request(
+                    "bind", "GET", url, params=params, headers=headers
+                )
                 result = response.text
                 # logger.debug(f"获取角色信息结果: {result}")
 
@@ -585,8 +706,9 @@ class DeltaApi:
                 }
 
                 url = "https://comm.ams.game.qq.com/ide/"
-                client = await get_global_client()
-                response = await client.post(url, data=form_data, cookies=cookies)
+                response = await self._request(
+                    "bind", "POST", url, data=form_data, cookies=cookies
+                )
                 result = response.json()
 
                 if result["ret"] != 0:
@@ -613,9 +735,18 @@ class DeltaApi:
                 "data": {},
             }
 
-    async def get_player_info(self, access_token: str, openid: str, season_id: int = 0):
+    async def get_player_info(
+        self,
+        access_token: str,
+        openid: str,
+        season_id: int = 0,
+        with_currency: bool = True,
+    ):
+        """
+        获取玩家信息
+        :param with_currency: 是否同时获取货币信息, 仅需昵称/头像时可关闭以省去3次请求
+        """
         access_type = self.platform
-        client = await get_global_client()
         try:
             # 参数验证
             if not openid or not access_token:
@@ -645,16 +776,28 @@ class DeltaApi:
                 "seasonid": str(season_id),
             }
 
-            response = await client.post(url, params=form_params, cookies=cookies, headers=headers)
+            response = await self._request(
+                "get_player_info",
+                "POST",
+                url,
+                params=form_params,
+                cookies=cookies,
+                headers=headers,
+            )
             data = response.json()
 
             if data["ret"] == 0:
                 # 处理玩家数据
                 player_data = data["jData"]["userData"].copy()
-                player_data["charac_name"] = urllib.parse.unquote(player_data["charac_name"])
+                player_data["charac_name"] = urllib.parse.unquote(
+                    player_data["charac_name"]
+                )
                 game_data["player"] = player_data
                 game_data["game"] = data["jData"]["careerData"]
 
+            if not with_currency:
+                return {"status": True, "message": "获取成功", "data": game_data}
+
             # 第二步：并发获取3种货币信息 性能提升300%
             currency_items = {
                 "coin": 17888808888,
@@ -672,16 +815,22 @@ class DeltaApi:
                     "item": item_id,
                 }
                 try:
-                    resp = await client.post(url, data=form_data, cookies=cookies)
+                    resp = await self._request(
+                        "get_player_info", "POST", url, data=form_data, cookies=cookies
+                    )
                     resp_data = resp.json()
                     if resp_data["ret"] == 0:
-                        return key, int(resp_data["jData"]["data"][0].get("totalMoney", 0))
+                        return key, int(
+                            resp_data["jData"]["data"][0].get("totalMoney", 0)
+                        )
                 except Exception:
                     pass
                 return key, 0
 
             # 并发执行所有货币请求
-            tasks = [fetch_currency(key, item_id) for key, item_id in currency_items.items()]
+            tasks = [
+                fetch_currency(key, item_id) for key, item_id in currency_items.items()
+            ]
             results = await asyncio.gather(*tasks)
 
             # 合并结果
@@ -720,8 +869,9 @@ class DeltaApi:
             }
 
             url = CONSTANTS["GAMEBASEURL"]
-            client = await get_global_client()
-            response = await client.post(url, data=form_data, cookies=cookies)
+            response = await self._request(
+                "get_password", "POST", url, data=form_data, cookies=cookies
+            )
 
             data = response.json()
             if data["ret"] != 0:
@@ -745,7 +895,9 @@ class DeltaApi:
                 "data": {},
             }
 
-    async def get_record(self, access_token: str, openid: str, type_id: int = 4, page: int = 1):
+    async def get_record(
+        self, access_token: str, openid: str, type_id: int = 4, page: int = 1
+    ):
         """
         获取战绩记录
         :param openid: openid
@@ -785,8 +937,9 @@ class DeltaApi:
             }
 
             url = CONSTANTS["GAMEBASEURL"]
-            client = await get_global_client()
-            response = await client.post(url, data=form_data, cookies=cookies)
+            response = await self._request(
+                "get_record", "POST", url, data=form_data, cookies=cookies
+            )
             try:
                 data = response.json()
             except json.JSONDecodeError:
@@ -802,6 +955,7 @@ class DeltaApi:
                 game_data[key].extend(data["jData"]["data"])
             elif data["ret"] == -203:
                 logger.error(f"获取战绩失败: {data}")
+                rate_limiter.penalize(API_THROTTLE_PAUSE)
                 return {
                     "status": False,
                     "message": "请求超时，请稍后重试",
@@ -845,8 +999,13 @@ class DeltaApi:
             }
 
             url = CONSTANTS["GAMEBASEURL"]
-            client = await get_global_client()
-            response = await client.post(url, params=params, cookies=cookies)
+            response = await self._request(
+                "get_safehousedevice_status",
+                "POST",
+                url,
+                params=params,
+                cookies=cookies,
+            )
 
             data = response.json()
             if data["ret"] == 0:
@@ -878,7 +1037,9 @@ class DeltaApi:
                 "data": {},
             }
 
-    async def get_object_info(self, access_token: str, openid: str, object_id: str = ""):
+    async def get_object_info(
+        self, access_token: str, openid: str, object_id: str = ""
+    ):
         access_type = self.platform
         try:
             # 参数验证
@@ -905,8 +1066,9 @@ class DeltaApi:
             }
 
             url = CONSTANTS["GAMEBASEURL"]
-            client = await get_global_client()
-            response = await client.post(url, params=params, cookies=cookies)
+            response = await self._request(
+                "get_object_info", "POST", url, params=params, cookies=cookies
+            )
 
             data = response.json()
             if data["ret"] == 0:
@@ -953,8 +1115,9 @@ class DeltaApi:
 
             url = CONSTANTS["GAMEBASEURL"]
 
-            client = await get_global_client()
-            response = await client.post(url, params=params, cookies=cookies)
+            response = await self._request(
+                "get_daily_report", "POST", url, params=params, cookies=cookies
+            )
 
             data = response.json()
             if data["ret"] == 0:
@@ -993,7 +1156,9 @@ class DeltaApi:
                 "data": {},
             }
 
-    async def get_weekly_report(self, access_token: str, openid: str, statDate: str = ""):
+    async def get_weekly_report(
+        self, access_token: str, openid: str, statDate: str = ""
+    ):
         access_type = self.platform
         try:
             # 参数验证
@@ -1022,8 +1187,9 @@ class DeltaApi:
             }
 
             url = CONSTANTS["GAMEBASEURL"]
-            client = await get_global_client()
-            response = await client.post(url, params=params, cookies=cookies)
+            response = await self._request(
+                "get_weekly_report", "POST", url, params=params, cookies=cookies
+            )
 
             data = response.json()
             if data["ret"] == 0:
@@ -1047,7 +1213,9 @@ class DeltaApi:
                 "data": {},
             }
 
-    async def get_weekly_friend_report(self, access_token: str, openid: str, statDate: str = ""):
+    async def get_weekly_friend_report(
+        self, access_token: str, openid: str, statDate: str = ""
+    ):
         access_type = self.platform
         try:
             # 参数验证
@@ -1076,8 +1244,9 @@ class DeltaApi:
             }
 
             url = CONSTANTS["GAMEBASEURL"]
-            client = await get_global_client()
-            response = await client.post(url, params=params, cookies=cookies)
+            response = await self._request(
+                "get_weekly_friend_report", "POST", url, params=params, cookies=cookies
+            )
 
             data = response.json()
             if data["ret"] == 0:
@@ -1101,7 +1270,9 @@ class DeltaApi:
                 "data": {},
             }
 
-    async def get_user_info(self, access_token: str, openid: str, user_openid: str = ""):
+    async def get_user_info(
+        self, access_token: str, openid: str, user_openid: str = ""
+    ):
         access_type = self.platform
         try:
             # 参数验证
@@ -1124,8 +1295,9 @@ class DeltaApi:
             }
 
             url = CONSTANTS["GAMEBASEURL"]
-            client = await get_global_client()
-            response = await client.post(url, params=params, cookies=cookies)
+            response = await self._request(
+                "get_user_info", "POST", url, params=params, cookies=cookies
+            )
 
             data = response.json()
             if data["ret"] == 0:
@@ -1149,7 +1321,9 @@ class DeltaApi:
                 "data": {},
             }
 
-    async def get_person_center_info(self, access_token: str, openid: str, resource_type: str = "sol"):
+    async def get_person_center_info(
+        self, access_token: str, openid: str, resource_type: str = "sol"
+    ):
         access_type = self.platform
         try:
             # 参数验证
@@ -1177,8 +1351,9 @@ class DeltaApi:
             }
 
             url = CONSTANTS["GAMEBASEURL"]
-            client = await get_global_client()
-            response = await client.post(url, params=params, cookies=cookies)
+            response = await self._request(
+                "get_person_center_info", "POST", url, params=params, cookies=cookies
+            )
 
             data = response.json()
             if data["ret"] == 0:
@@ -1232,8 +1407,9 @@ class DeltaApi:
             }
 
             url = CONSTANTS["GAMEBASEURL"]
-            client = await get_global_client()
-            response = await client.post(url, params=params, cookies=cookies)
+            response = await self._request(
+                "get_tdm_detail", "POST", url, params=params, cookies=cookies
+            )
 
             data = response.json()
             if data["ret"] == 0:
@@ -1282,8 +1458,9 @@ class DeltaApi:
 
             # 发送GET请求
             url = "https://open.weixin.qq.com/connect/qrconnect"
-            client = await get_global_client()
-            response = await client.get(url, params=params, headers=headers)
+            response = await self._request(
+                "get_wechat_login_qr", "GET", url, params=params, headers=headers
+            )
 
             # 获取响应内容
             result = response.text
@@ -1348,8 +1525,9 @@ class DeltaApi:
 
             # 发送GET请求检查登录状态
             url = "https://lp.open.weixin.qq.com/connect/l/qrconnect"
-            client = await get_global_client()
-            response = await client.get(url, params=params)
+            response = await self._request(
+                "check_wechat_login_status", "GET", url, params=params
+            )
 
             # 获取响应内容
             result = response.text
@@ -1364,7 +1542,9 @@ class DeltaApi:
             wx_errcode = int(errcode_match.group(1)) if errcode_match else None
             wx_code = code_match.group(1) if code_match else None
 
-            logger.info(f"微信登录状态检查 - UUID: {uuid}, errcode: {wx_errcode}, code: {wx_code}")
+            logger.info(
+                f"微信登录状态检查 - UUID: {uuid}, errcode: {wx_errcode}, code: {wx_code}"
+            )
 
             # 根据错误码返回不同的状态
             if wx_errcode == 402:
@@ -1411,7 +1591,9 @@ class DeltaApi:
                 }
 
             # 其他错误代码
-            logger.error(f"微信登录状态检查 - UUID: {uuid}, errcode: {wx_errcode}, code: {wx_code}")
+            logger.error(
+                f"微信登录状态检查 - UUID: {uuid}, errcode: {wx_errcode}, code: {wx_code}"
+            )
             return {
                 "status": False,
                 "message": "其他错误代码",
@@ -1464,8 +1646,9 @@ class DeltaApi:
 
             # 发送GET请求获取访问令牌
             url = "https://apps.game.qq.com/ams/ame/codeToOpenId.php"
-            client = await get_global_client()
-            response = await client.get(url, params=params, headers=headers)
+            response = await self._request(
+                "get_wechat_access_token", "GET", url, params=params, headers=headers
+            )
 
             # 获取响应内容
             result = response.text
@@ -1487,7 +1670,9 @@ class DeltaApi:
                 try:
                     token_data = json.loads(data["sMsg"])
 
-                    logger.info(f"微信访问令牌获取成功，openid: {token_data.get('openid', 'unknown')}")
+                    logger.info(
+                        f"微信访问令牌获取成功，openid: {token_data.get('openid', 'unknown')}"
+                    )
 
                     return {
                         "status": True,
@@ -1551,8 +1736,14 @@ class DeltaApi:
             }
 
             url = API_CONSTANTS["GAME_API_URL"]
-            client = await get_global_client()
-            response = await client.get(url, params=params, headers=headers)
+            response = await self._request(
+                "get_role_basic_info",
+                "GET",
+                url,
+                params=params,
+                headers=headers,
+                cacheable=lambda r: "propcapital=" in r.text,
+            )
             result = response.text
             logger.debug(f"获取角色信息结果: {result}")
 
@@ -1601,8 +1792,14 @@ class DeltaApi:
             access_type = self.platform
             is_qq = access_type == "qq"
             cookies = self.create_cookie(openid, access_token, is_qq)
-            client = await get_global_client()
-            response = await client.get(url, params=params, headers=headers, cookies=cookies)
+            response = await self._request(
+                "get_depot_red_info",
+                "GET",
+                url,
+                params=params,
+                headers=headers,
+                cookies=cookies,
+            )
 
             # 安全校验响应
             response.raise_for_status()
@@ -1682,8 +1879,14 @@ class DeltaApi:
             cookies = self.create_cookie(openid, access_token, is_qq)
 
             url = API_CONSTANTS["GAME_API_URL"]
-            client = await get_global_client()
-            response = await client.get(url, params=params, headers=headers, cookies=cookies)
+            response = await self._request(
+                "get_item_hour_price",
+                "GET",
+                url,
+                params=params,
+                headers=headers,
+                cookies=cookies,
+            )
             result = response.json()
             logger.debug(f"获取物品小时均价结果: {result}")
 
@@ -1766,8 +1969,14 @@ class DeltaApi:
             cookies = self.create_cookie(openid, access_token, is_qq)
 
             url = API_CONSTANTS["GAMEBASEURL"]
-            client = await get_global_client()
-            response = await client.get(url, params=params, headers=headers, cookies=cookies)
+            response = await self._request(
+                "get_place_list_with_profit",
+                "GET",
+                url,
+                params=params,
+                headers=headers,
+                cookies=cookies,
+            )
             result = response.json()
             # logger.info(f"获取特勤处利润信息结果: {result}")
 
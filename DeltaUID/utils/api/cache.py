@@ -0,0 +1,132 @@
+import time
+from typing import (
+    Any,
+    Dict,
+    Tuple,
+    Generic,
+    Hashable,
+    TypeVar,
+    Callable,
+    Optional,
+    Awaitable,
+)
+from collections import OrderedDict
+
+from .coalesce import SingleFlight
+from ..const import API_CACHE_MAX_BYTES, API_CACHE_MAX_ENTRIES
+
+V = TypeVar("V")
+
+
+class ResponseCache(Generic[V]):
+    """异步响应缓存
+
+    - 每个条目独立 TTL, 过期后惰性淘汰
+    - 按条目数和 sizeof 估算的字节数双重上限做 LRU 淘汰
+    - 相同 key 的并发加载只会真正请求一次(single-flight)
+    - 缓存值应为只读对象(如已读取完毕的 httpx.Response), 调用方不得修改
+    """
+
+    def __init__(
+        self,
+        max_entries: int = API_CACHE_MAX_ENTRIES,
+        max_bytes: int = API_CACHE_MAX_BYTES,
+        sizeof: Callable[[Any], int] = len,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._data: "OrderedDict[Hashable, Tuple[float, int, V]]" = OrderedDict()
+        self._flight = SingleFlight()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expire, _, value = entry
+        if expire <= time.monotonic():
+            self._pop(key)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V, ttl: float) -> None:
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        if key in self._data:
+            self._pop(key)
+        self._data[key] = (time.monotonic() + ttl, size, value)
+        self._bytes += size
+        while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._pop(oldest)
+            self.evictions += 1
+
+    def _pop(self, key: Hashable) -> None:
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[V]],
+        ttl: float,
+        cacheable: Callable[[V], bool] = lambda _: True,
+    ) -> V:
+        """命中缓存直接返回, 否则调用 loader 加载; 并发的相同请求共享同一次加载"""
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        async def load() -> V:
+            value = await loader()
+            if cacheable(value):
+                self.set(key, value, ttl)
+            return value
+
+        value, shared = await self._flight.do(key, load)
+        if shared:
+            self.shared += 1
+        else:
+            self.misses += 1
+        return value
+
+    def invalidate(self, match: Optional[Callable[[Hashable], bool]] = None) -> None:
+        """清空缓存, 指定 match 时只清除 key 匹配的条目"""
+        if match is None:
+            self._data.clear()
+            self._bytes = 0
+            return
+        for key in [k for k in self._data if match(k)]:
+            self._pop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def freeze(value: Any) -> Hashable:
+    """将 dict/list 参数转换为可哈希的缓存键"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
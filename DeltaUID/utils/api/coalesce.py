@@ -0,0 +1,62 @@
+import asyncio
+from typing import Any, Dict, Tuple, Hashable, Callable, Awaitable
+
+
+class SingleFlight:
+    """进行中请求登记表: 相同 key 的并发调用共享同一个 future"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """执行或等待 key 对应的调用, 返回 (结果, 是否复用了他人的请求)"""
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # 发起者被取消时由当前等待者接手重新请求
+                if future.cancelled():
+                    continue
+                raise
+            self.coalesced += 1
+            return result, True
+
+        self.leaders += 1
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 没有其他等待者时避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._calls.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "inflight": len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
+
+
+# 全局接口请求合并登记表
+request_flight = SingleFlight()
@@ -0,0 +1,166 @@
+import time
+import heapq
+import asyncio
+import itertools
+from typing import Any, Dict, List, Iterator, Optional
+from contextlib import contextmanager
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from ..const import (
+    API_RATE_GLOBAL,
+    API_RATE_PER_USER,
+    API_RATE_MAX_USERS,
+    API_RATE_GLOBAL_BURST,
+    API_RATE_PER_USER_BURST,
+)
+
+# 请求优先级: 数值越小越优先
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+request_priority: ContextVar[int] = ContextVar(
+    "df_request_priority", default=PRIORITY_INTERACTIVE
+)
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """将当前上下文(及其创建的子任务)中的请求标记为后台优先级"""
+    token = request_priority.set(PRIORITY_BACKGROUND)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+class TokenBucket:
+    """令牌桶: rate 为每秒补充的令牌数, capacity 为桶容量(允许的突发量)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def try_acquire(self, now: Optional[float] = None) -> float:
+        """尝试取走一个令牌, 成功返回 0, 否则返回需要等待的秒数"""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """全局 + 按 openid 的双层令牌桶限流器
+
+    先在各自 openid 的桶中排队, 再进入全局优先级队列;
+    全局队列按 (优先级, 到达顺序) 出队, 交互命令总是排在定时任务之前.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = API_RATE_GLOBAL,
+        global_burst: float = API_RATE_GLOBAL_BURST,
+        per_user_rate: float = API_RATE_PER_USER,
+        per_user_burst: float = API_RATE_PER_USER_BURST,
+        max_users: int = API_RATE_MAX_USERS,
+    ):
+        self.per_user_rate = per_user_rate
+        self.per_user_burst = per_user_burst
+        self.max_users = max_users
+        self._global = TokenBucket(global_rate, global_burst)
+        self._users: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._queue: List[List[Any]] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._paused_until = 0.0
+        self.acquired = 0
+        self.delayed = 0
+        self.wait_time = 0.0
+        self.throttled = 0
+
+    def _user_bucket(self, openid: str) -> TokenBucket:
+        bucket = self._users.get(openid)
+        if bucket is None:
+            bucket = TokenBucket(self.per_user_rate, self.per_user_burst)
+            self._users[openid] = bucket
+            if len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(openid)
+        return bucket
+
+    async def acquire(
+        self, openid: Optional[str] = None, priority: Optional[int] = None
+    ) -> None:
+        """等待直到允许发出一个请求"""
+        start = time.monotonic()
+        if openid:
+            bucket = self._user_bucket(openid)
+            while True:
+                wait = bucket.try_acquire()
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+        entry = [
+            request_priority.get() if priority is None else priority,
+            next(self._seq),
+            asyncio.get_running_loop().create_future(),
+        ]
+        heapq.heappush(self._queue, entry)
+        self._dispatch()
+        await entry[2]
+
+        self.acquired += 1
+        waited = time.monotonic() - start
+        if waited > 0.001:
+            self.delayed += 1
+            self.wait_time += waited
+
+    def penalize(self, seconds: float) -> None:
+        """上游返回限流错误时暂停放行一段时间"""
+        self.throttled += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._queue:
+            future = self._queue[0][2]
+            if future.done():
+                # 等待者已被取消
+                heapq.heappop(self._queue)
+                continue
+
+            now = time.monotonic()
+            wait = self._paused_until - now
+            if wait <= 0:
+                wait = self._global.try_acquire(now)
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(
+                    wait, self._dispatch
+                )
+                return
+
+            heapq.heappop(self._queue)
+            future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "wait_time": round(self.wait_time, 3),
+            "waiting": len(self._queue),
+            "throttled": self.throttled,
+        }
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,249 @@
+import time
+import asyncio
+from typing import Any, Dict, List, Callable, Optional, Awaitable
+from dataclasses import field, dataclass
+
+import httpx
+
+from gsuid_core.logger import logger
+
+from .utils import API_CONSTANTS
+from .cache import ResponseCache, freeze
+from .limiter import RateLimiter, request_priority
+from .coalesce import SingleFlight
+from ..const import API_CACHE_TTL, DEFAULT_RETRY_COUNT
+
+# 游戏数据接口域名 启用请求合并与限流
+GAME_API_HOSTS = {
+    httpx.URL(API_CONSTANTS["GAMEBASEURL"]).host,
+    httpx.URL(API_CONSTANTS["GAME_API_URL"]).host,
+}
+
+
+def is_json_ok(response: httpx.Response) -> bool:
+    """默认的可缓存判定: HTTP 200 且返回 JSON 的 ret/iRet 为 0"""
+    if response.status_code != 200:
+        return False
+    try:
+        data = response.json()
+    except ValueError:
+        return False
+    if not isinstance(data, dict):
+        return False
+    return data.get("ret", data.get("iRet")) in (0, "0")
+
+
+@dataclass
+class ApiRequest:
+    """流经请求管道的一次接口请求"""
+
+    endpoint: str
+    method: str
+    url: str
+    params: Optional[Dict[str, Any]] = None
+    data: Optional[Dict[str, Any]] = None
+    cookies: Optional[Dict[str, str]] = None
+    headers: Optional[Dict[str, str]] = None
+    openid: Optional[str] = None
+    priority: int = field(default_factory=request_priority.get)
+    cacheable: Callable[[httpx.Response], bool] = is_json_ok
+    # 各中间件记录的附加信息, 如 retries / cache / coalesced
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.openid is None:
+            self.openid = (self.cookies or {}).get("openid") or (self.params or {}).get(
+                "sAMSAppOpenId"
+            )
+
+    @property
+    def host(self) -> str:
+        return httpx.URL(self.url).host
+
+    def key(self, with_token: bool = True) -> tuple:
+        """请求的身份键, with_token=False 时忽略 access_token 以便跨令牌复用缓存"""
+        cookies = dict(self.cookies or {})
+        if not with_token:
+            cookies.pop("access_token", None)
+        return (
+            self.endpoint,
+            self.method,
+            self.url,
+            freeze(self.params or {}),
+            freeze(self.data or {}),
+            freeze(cookies),
+        )
+
+
+Handler = Callable[[ApiRequest], Awaitable[httpx.Response]]
+Middleware = Callable[[ApiRequest, Handler], Awaitable[httpx.Response]]
+
+
+class RequestPipeline:
+    """接口请求管道: 按注册顺序由外到内依次经过各个中间件, 最内层真正发出请求"""
+
+    def __init__(self, send: Handler, middlewares: Optional[List[Middleware]] = None):
+        self.send = send
+        self.middlewares: List[Middleware] = list(middlewares or [])
+
+    def use(self, middleware: Middleware) -> "RequestPipeline":
+        """在最内层追加一个中间件"""
+        self.middlewares.append(middleware)
+        return self
+
+    async def __call__(self, request: ApiRequest) -> httpx.Response:
+        async def dispatch(index: int, req: ApiRequest) -> httpx.Response:
+            if index == len(self.middlewares):
+                return await self.send(req)
+            return await self.middlewares[index](req, lambda r: dispatch(index + 1, r))
+
+        return await dispatch(0, request)
+
+
+class TracingMiddleware:
+    """记录每次接口请求的耗时与结果"""
+
+    async def __call__(self, request: ApiRequest, call_next: Handler) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+        except Exception as e:
+            logger.debug(
+                f"[DF][API] {request.endpoint} {request.method} 失败 "
+                f"{(time.perf_counter() - start) * 1000:.1f}ms: {e!r}"
+            )
+            raise
+        flags = ",".join(k for k in ("cache", "coalesced") if request.extra.get(k))
+        logger.debug(
+            f"[DF][API] {request.endpoint} {request.method} {response.status_code} "
+            f"{(time.perf_counter() - start) * 1000:.1f}ms"
+            f"{f' [{flags}]' if flags else ''}"
+        )
+        return response
+
+
+class CacheMiddleware:
+    """按 API_CACHE_TTL 缓存成功响应, 未配置 TTL 的接口直接放行"""
+
+    def __init__(
+        self,
+        cache: ResponseCache[httpx.Response],
+        ttl: Optional[Dict[str, float]] = None,
+    ):
+        self.cache = cache
+        self.ttl = API_CACHE_TTL if ttl is None else ttl
+
+    async def __call__(self, request: ApiRequest, call_next: Handler) -> httpx.Response:
+        ttl = self.ttl.get(request.endpoint, 0)
+        if ttl <= 0:
+            return await call_next(request)
+
+        loaded = False
+
+        async def load() -> httpx.Response:
+            nonlocal loaded
+            loaded = True
+            return await call_next(request)
+
+        response = await self.cache.get_or_load(
+            request.key(with_token=False), load, ttl, request.cacheable
+        )
+        request.extra["cache"] = not loaded
+        return response
+
+
+class CoalesceMiddleware:
+    """合并游戏接口的并发相同请求, 后来者直接复用先到者的响应"""
+
+    def __init__(self, flight: SingleFlight, hosts: Optional[set] = None):
+        self.flight = flight
+        self.hosts = GAME_API_HOSTS if hosts is None else hosts
+
+    async def __call__(self, request: ApiRequest, call_next: Handler) -> httpx.Response:
+        if request.host not in self.hosts:
+            return await call_next(request)
+        response, shared = await self.flight.do(
+            request.key(), lambda: call_next(request)
+        )
+        request.extra["coalesced"] = shared
+        return response
+
+
+class MetricsMiddleware:
+    """统计各接口的真实上游请求次数、耗时与失败数
+
+    游戏接口按与缓存相同的判定(默认 is_json_ok)计算成功,
+    HTTP 200 但 ret/iRet 非 0 (如 -203 限流)同样记为失败;
+    登录等非 JSON 接口仍按 HTTP 状态码判断.
+    """
+
+    def __init__(
+        self,
+        observe: Callable[[str, float, bool, int], None],
+        hosts: Optional[set] = None,
+    ):
+        self.observe = observe
+        self.hosts = GAME_API_HOSTS if hosts is None else hosts
+
+    async def __call__(self, request: ApiRequest, call_next: Handler) -> httpx.Response:
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = await call_next(request)
+            if request.host in self.hosts:
+                ok = request.cacheable(response)
+            else:
+                ok = response.status_code < 400
+            return response
+        finally:
+            self.observe(
+                request.endpoint,
+                time.perf_counter() - start,
+                ok,
+                request.extra.get("retries", 0),
+            )
+
+
+class RetryMiddleware:
+    """网络错误或超时时指数退避重试: 1, 2, 4 秒, 最长 5 秒"""
+
+    def __init__(self, max_attempts: int = DEFAULT_RETRY_COUNT):
+        self.max_attempts = max(1, max_attempts)
+
+    async def __call__(self, request: ApiRequest, call_next: Handler) -> httpx.Response:
+        for attempt in range(1, self.max_attempts):
+            try:
+                return await call_next(request)
+            except (httpx.TransportError, httpx.TimeoutException) as e:
+                wait_time = min(2 ** (attempt - 1), 5)
+                request.extra["retries"] = attempt
+                logger.warning(
+                    f"[DF][API] {request.endpoint} 请求失败 (尝试 {attempt}/{self.max_attempts}), "
+                    f"{wait_time}秒后重试: {e!r}"
+                )
+                await asyncio.sleep(wait_time)
+        try:
+            return await call_next(request)
+        except (httpx.TransportError, httpx.TimeoutException) as e:
+            logger.error(
+                f"[DF][API] {request.endpoint} 请求失败已达到最大重试次数: {e!r}"
+            )
+            raise
+
+
+class RateLimitMiddleware:
+    """向限流器申请令牌后再发出请求, 仅对游戏接口生效"""
+
+    def __init__(self, limiter: RateLimiter, hosts: Optional[set] = None):
+        self.limiter = limiter
+        self.hosts = GAME_API_HOSTS if hosts is None else hosts
+
+    async def __call__(self, request: ApiRequest, call_next: Handler) -> httpx.Response:
+        if request.host in self.hosts:
+            await self.limiter.acquire(request.openid, request.priority)
+        return await call_next(request)
+
+
+response_cache: ResponseCache[httpx.Response] = ResponseCache(
+    sizeof=lambda r: len(r.content)
+)
@@ -0,0 +1,214 @@
+import io
+import json
+import time
+import asyncio
+import hashlib
+from typing import Any, Dict, Tuple, Literal, Optional
+from pathlib import Path
+
+import httpx
+from PIL import Image
+
+from gsuid_core.models import Event
+from gsuid_core.logger import logger
+from gsuid_core.data_store import get_res_path
+from gsuid_core.utils.image.image_tools import get_event_avatar, draw_pic_with_ring
+
+from .image_cache import ImageCache
+from .api.coalesce import SingleFlight
+from .api.api import get_global_client
+from .const import (
+    AVATAR_SIZE,
+    AVATAR_RING_SIZE,
+    AVATAR_CACHE_MAX_BYTES,
+    AVATAR_REVALIDATE_INTERVAL,
+)
+
+AVATAR_CACHE_PATH = get_res_path() / "DeltaUID" / "avatar"
+
+Variant = Literal["base", "ring"]
+VARIANTS: Tuple[Variant, ...] = ("base", "ring")
+
+
+async def make_variants(image: Image.Image) -> Dict[Variant, Image.Image]:
+    """由原图生成 150x150 头像与带圆环的头像"""
+    base = image.convert("RGBA").resize(
+        (AVATAR_SIZE, AVATAR_SIZE), Image.Resampling.LANCZOS
+    )
+    ring = await draw_pic_with_ring(base, AVATAR_RING_SIZE)
+    return {"base": base, "ring": ring}
+
+
+class AvatarCache:
+    """两级头像缓存
+
+    内存中按 LRU 保存已解码、已缩放的头像, 解码后总字节数不超过 max_bytes;
+    磁盘上保存各尺寸的 PNG 及源站的 ETag/Last-Modified, 超过重新验证间隔后
+    以条件请求确认是否变化, 304 时直接沿用磁盘文件. 同一头像的并发下载只进行一次.
+    """
+
+    def __init__(
+        self,
+        path: Path = AVATAR_CACHE_PATH,
+        max_bytes: int = AVATAR_CACHE_MAX_BYTES,
+        revalidate_interval: float = AVATAR_REVALIDATE_INTERVAL,
+    ):
+        self.path = path
+        self.revalidate_interval = revalidate_interval
+        self._memory: ImageCache[Tuple[str, Variant]] = ImageCache(max_bytes)
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._flight = SingleFlight()
+        self.disk_hits = 0
+        self.downloads = 0
+        self.not_modified = 0
+        self.errors = 0
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _file(self, key: str, suffix: str) -> Path:
+        return self.path / key[:2] / f"{key}{suffix}"
+
+    # 内存层
+    def _memory_get(self, key: str, variant: Variant) -> Optional[Image.Image]:
+        return self._memory.get((key, variant))
+
+    def _memory_put(self, key: str, variant: Variant, image: Image.Image) -> None:
+        # 重新下载的头像替换旧图片
+        self._memory.pop((key, variant))
+        self._memory.put((key, variant), image)
+
+    # 磁盘层
+    def _read_meta(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._file(key, ".json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _read_variants(self, key: str) -> Optional[Dict[Variant, Image.Image]]:
+        try:
+            images: Dict[Variant, Image.Image] = {}
+            for variant in VARIANTS:
+                with Image.open(self._file(key, f"_{variant}.png")) as image:
+                    images[variant] = image.convert("RGBA")
+            return images
+        except OSError:
+            return None
+
+    def _write(
+        self,
+        key: str,
+        meta: Dict[str, Any],
+        images: Optional[Dict[Variant, Image.Image]],
+    ) -> None:
+        self._file(key, "").parent.mkdir(parents=True, exist_ok=True)
+        if images is not None:
+            for variant, image in images.items():
+                image.save(self._file(key, f"_{variant}.png"))
+        with open(self._file(key, ".json"), mode="w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    async def _load_disk(self, key: str) -> bool:
+        if all((key, variant) in self._memory for variant in VARIANTS):
+            return True
+        images = await asyncio.to_thread(self._read_variants, key)
+        if images is None:
+            return False
+        for variant, image in images.items():
+            self._memory_put(key, variant, image)
+        return True
+
+    async def _refresh(self, url: str, key: str) -> bool:
+        """向源站(条件)请求头像并更新两级缓存, 返回是否有可用的头像"""
+        meta = self._meta.get(key) or {}
+        has_disk = bool(meta) and all(
+            self._file(key, f"_{v}.png").exists() for v in VARIANTS
+        )
+        headers = {}
+        if has_disk and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if has_disk and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            client = await get_global_client()
+            response = await client.get(url, headers=headers, follow_redirects=True)
+            if response.status_code == 304 and has_disk:
+                self.not_modified += 1
+                meta["checked"] = time.time()
+                await asyncio.to_thread(self._write, key, meta, None)
+                return await self._load_disk(key)
+            response.raise_for_status()
+            with Image.open(io.BytesIO(response.content)) as image:
+                images = await make_variants(image)
+        except (httpx.HTTPError, OSError) as e:
+            self.errors += 1
+            logger.warning(f"[DF] 下载头像失败 {url}: {e}")
+            # 源站不可用时沿用内存或磁盘上的旧头像
+            return all((key, v) in self._memory for v in VARIANTS) or (
+                has_disk and await self._load_disk(key)
+            )
+
+        self.downloads += 1
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "checked": time.time(),
+        }
+        self._meta[key] = meta
+        for variant, image in images.items():
+            self._memory_put(key, variant, image)
+        await asyncio.to_thread(self._write, key, meta, images)
+        return True
+
+    async def get(self, url: str, variant: Variant = "base") -> Optional[Image.Image]:
+        """获取头像, 返回的图片为共享对象, 调用方不应原地修改; 获取失败返回 None"""
+        if not url:
+            return None
+        key = self.key(url)
+        if key not in self._meta:
+            meta = await asyncio.to_thread(self._read_meta, key)
+            if meta is not None:
+                self._meta[key] = meta
+        meta = self._meta.get(key)
+        fresh = (
+            meta is not None
+            and time.time() - meta.get("checked", 0) < self.revalidate_interval
+        )
+
+        image = self._memory_get(key, variant)
+        if image is not None and fresh:
+            return image
+        if fresh and await self._load_disk(key):
+            self.disk_hits += 1
+            return self._memory_get(key, variant)
+
+        ok, _ = await self._flight.do(key, lambda: self._refresh(url, key))
+        return self._memory_get(key, variant) if ok else None
+
+    async def get_event_avatar(
+        self, ev: Event, variant: Variant = "ring"
+    ) -> Image.Image:
+        """获取消息发送者的头像, 能确定头像地址时走缓存"""
+        url = ev.sender.get("avatar") if ev.sender else None
+        if not url and ev.bot_id == "onebot" and str(ev.user_id).isdigit():
+            url = f"https://q1.qlogo.cn/g?b=qq&nk={ev.user_id}&s=640"
+        image = await self.get(url, variant) if url else None
+        if image is None:
+            image = (await make_variants(await get_event_avatar(ev)))[variant]
+        return image
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._memory.stats(),
+            "disk_hits": self.disk_hits,
+            "downloads": self.downloads,
+            "not_modified": self.not_modified,
+            "errors": self.errors,
+        }
+
+
+avatar_cache = AvatarCache()
@@ -14,6 +14,105 @@ DEFAULT_REQUEST_TIMEOUT = 30
 DEFAULT_RETRY_COUNT = 3
 DEFAULT_RETRY_DELAY = 1
 
+# 推送调度配置
+NOTIFY_WORKERS = 16  # 单次推送的最大并发用户数
+NOTIFY_USER_TIMEOUT = 60  # 单个用户处理超时(秒)
+NOTIFY_SLOWEST_COUNT = 5  # 每轮报告中列出的最慢用户数
+
+# 后台轮询配置
+SCHEDULER_SYNC_INTERVAL = 120  # 重新读取订阅列表的间隔(秒)
+SCHEDULER_BATCH_WINDOW = 5  # 合并为同一批执行的到期时间窗口(秒)
+SCHEDULER_MIN_SLEEP = 1  # 调度循环两次唤醒之间的最短间隔(秒)
+RECORD_POLL_INTERVAL = 120  # 战绩轮询的基础间隔(秒)
+RECORD_POLL_MAX_INTERVAL = 1800  # 不活跃玩家的战绩轮询退避上限(秒)
+RECORD_ACTIVE_WINDOW = 1800  # 最近一局或最近一次命令在此时长内视为活跃(秒)
+
+# 特勤处推送配置
+TQC_IDLE_RECHECK = 600  # 全部设备空闲时的复查间隔(秒)
+TQC_MAX_RECHECK = 1800  # 生产中时的最长复查间隔(秒)
+TQC_FINISH_GRACE = 30  # 预计完成后再等待的秒数
+
+# 接口缓存配置
+API_CACHE_MAX_ENTRIES = 2048  # 最大缓存条目数
+API_CACHE_MAX_BYTES = 32 * 1024 * 1024  # 最大缓存字节数
+# 各接口缓存时间(秒), 未列出或为 0 的接口不缓存
+API_CACHE_TTL = {
+    "get_player_info": 60,
+    "get_role_basic_info": 60,
+    "get_person_center_info": 120,
+    "get_safehousedevice_status": 30,
+    "get_daily_report": 300,
+    "get_weekly_report": 1800,
+    "get_weekly_friend_report": 1800,
+    "get_user_info": 3600,
+    "get_object_info": 3600,
+    "get_tdm_detail": 3600,
+    "get_item_hour_price": 300,
+    "get_place_list_with_profit": 300,
+}
+
+# 接口限流配置(令牌桶)
+API_RATE_GLOBAL = 30  # 全局每秒请求数
+API_RATE_GLOBAL_BURST = 60  # 全局突发请求数
+API_RATE_PER_USER = 2  # 单个openid每秒请求数
+API_RATE_PER_USER_BURST = 8  # 单个openid突发请求数
+API_RATE_MAX_USERS = 4096  # 最多保留的openid令牌桶数量
+API_THROTTLE_PAUSE = 5  # 上游返回限流错误后暂停放行的秒数
+
+# 指标统计配置
+METRICS_ENDPOINT_SAMPLES = 1024  # 每个接口保留的最近请求样本数
+METRICS_TICK_SAMPLES = 128  # 每个定时任务保留的最近轮次数
+
+# 物品目录配置
+ITEM_CATALOG_CHECK_INTERVAL = 5  # 检查 item.json 是否更新的最小间隔(秒)
+ITEM_SEARCH_LIMIT = 8  # 物品模糊搜索最多返回的候选数
+
+# 物品价格配置
+PRICE_QUERY_CONCURRENCY = 4  # 批量查价的最大并发请求数
+PRICE_QUERY_MAX_ITEMS = 20  # 单次查价最多物品数
+PRICE_HOUR_GRACE = 60  # 整点后等待上游出数的秒数
+PRICE_CACHE_MAX_ITEMS = 4096  # 小时均价缓存的最大物品数
+
+# 价格历史配置
+PRICE_HISTORY_DAYS = 30  # 价格/利润历史保留天数
+PRICE_TREND_HOURS = 24 * 7  # 价格趋势默认回看小时数
+PRICE_MA_WINDOWS = (6, 24)  # 价格趋势展示的移动平均窗口(小时)
+PRICE_SELL_MIN_DAYS = 3  # 计算最佳出售时段至少需要的天数
+# 特勤处工作台类型 -> 名称
+TQC_PLACES = {
+    "workbench": "工作台",
+    "tech": "技术中心",
+    "pharmacy": "制药台",
+    "armory": "防具台",
+}
+TQC_RANK_TOP = 3  # 特勤处利润排行每个工作台展示的配方数
+
+# 图片缓存配置
+# 纹理缓存的解码后字节数上限, 为所有进程合计;
+# 渲染执行器为 process 模式时由主进程与各 worker 平分(每个进程都会预加载纹理)
+ASSET_CACHE_MAX_BYTES = 96 * 1024 * 1024
+AVATAR_CACHE_MAX_BYTES = 32 * 1024 * 1024  # 内存中头像的解码后字节数上限
+AVATAR_REVALIDATE_INTERVAL = 6 * 3600  # 头像向源站重新验证的间隔(秒)
+AVATAR_SIZE = 150  # 头像边长
+AVATAR_RING_SIZE = 200  # 带圆环头像的边长
+
+# 渲染配置
+# 渲染执行器类型: thread(线程池) 或 process(进程池)
+# process 模式下每个 worker 都会重新导入整个插件包(注册命令、读取配置等), 仅在确认启动方式支持 spawn 时使用
+RENDER_POOL_MODE = "thread"
+RENDER_POOL_WORKERS = 2  # 渲染 worker 数量
+RENDER_CACHE_TTL = 60  # 相同输入的出图结果缓存时间(秒)
+RENDER_CACHE_MAX_ENTRIES = 256  # 出图缓存最大条目数
+RENDER_CACHE_MAX_BYTES = 32 * 1024 * 1024  # 出图缓存最大字节数
+# 各卡片的编码预设, 字段见 utils/encoder.py::EncodePreset; format 为 DEFAULT 时沿用 convert_img
+RENDER_ENCODE_PRESETS = {
+    "info": {"format": "JPEG", "quality": 88},
+    "record_sol": {"format": "JPEG", "quality": 85, "max_bytes": 1536 * 1024},
+    "record_tdm": {"format": "JPEG", "quality": 88},
+    "sol_record": {"format": "JPEG", "quality": 90},
+    "text": {"format": "PNG", "colors": 16},
+}
+
 # 缓存配置
 IMAGE_CACHE_SIZE = 32
 HELP_CACHE_TTL = 3600
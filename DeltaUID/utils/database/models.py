@@ -1,6 +1,7 @@
-from typing import Optional, cast
+from typing import Dict, List, Tuple, TypeVar, Iterable, Optional, cast
 
-from sqlmodel import Field, select
+from sqlmodel import Field, col, select
+from sqlalchemy import Index, String, func, delete, insert, update, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from gsuid_core.bot import Event
@@ -8,13 +9,33 @@ from gsuid_core.logger import logger
 from gsuid_core.webconsole import site
 from gsuid_core.webconsole.mount_app import GsAdminModel
 from gsuid_core.utils.database.startup import exec_list
-from gsuid_core.utils.database.base_models import Bind, User, with_session
+from gsuid_core.utils.database.base_models import Bind, User, BaseIDModel, with_session
 
 from ..models import UserData
 
 exec_list.append('ALTER TABLE DFUser ADD COLUMN latest_record TEXT DEFAULT ""')
 exec_list.append('ALTER TABLE DFUser ADD COLUMN latest_tdm_record TEXT DEFAULT ""')
 
+# SQLite 单条语句的绑定参数数量有限, 批量 IN 查询按此大小分块
+BULK_CHUNK_SIZE = 500
+
+# (uid, bot_id) -> (最新烽火战绩id, 最新战场战绩id), None 表示保留原值
+RecordPointers = Dict[Tuple[str, str], Tuple[Optional[str], Optional[str]]]
+
+# (统计整点时间戳, 物品id) -> 小时均价
+PriceSamples = Dict[Tuple[int, str], float]
+
+# (统计整点时间戳, 特勤处, 物品id) -> (等级, 单次利润, 每小时利润)
+ProfitSamples = Dict[Tuple[int, str, str], Tuple[int, float, float]]
+
+T = TypeVar("T")
+
+
+def _chunks(items: Iterable[T], size: int = BULK_CHUNK_SIZE) -> Iterable[List[T]]:
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
 
 class DFBind(Bind, table=True):
     group_id: Optional[str] = Field(default=None, title="群组ID")
@@ -48,6 +69,24 @@ class DFBind(Bind, table=True):
         data = await cls.select_data(user_id, bot_id)
         return data.uid if data else None
 
+    @classmethod
+    @with_session
+    async def get_uid_map(
+        cls,
+        session: AsyncSession,
+        user_ids: Iterable[str],
+    ) -> Dict[Tuple[str, str], str]:
+        """批量获取 (用户ID, BotID) -> 三角洲UID 的映射"""
+        uid_map: Dict[Tuple[str, str], str] = {}
+        for chunk in _chunks(set(user_ids)):
+            result = await session.execute(
+                select(cls).where(col(cls.user_id).in_(chunk))
+            )
+            for data in result.scalars().all():
+                if data.uid:
+                    uid_map[(data.user_id, data.bot_id)] = data.uid
+        return uid_map
+
     @classmethod
     @with_session
     async def insert_uid(
@@ -152,6 +191,56 @@ class DFUser(User, table=True):
             logger.error(f"get_all_data error: {e}")
             return []
 
+    @classmethod
+    @with_session
+    async def select_by_uids(
+        cls,
+        session: AsyncSession,
+        uids: Iterable[str],
+    ) -> Dict[str, "DFUser"]:
+        """批量获取三角洲UID -> 用户数据的映射"""
+        users: Dict[str, DFUser] = {}
+        for chunk in _chunks(set(uids)):
+            result = await session.execute(select(cls).where(col(cls.uid).in_(chunk)))
+            for data in result.scalars().all():
+                users.setdefault(data.uid, data)
+        return users
+
+    @classmethod
+    @with_session
+    async def update_records(
+        cls,
+        session: AsyncSession,
+        records: RecordPointers,
+    ) -> int:
+        """用一条批量 UPDATE 在同一事务中更新最新战绩id, 返回提交的行数"""
+        if not records:
+            return 0
+        table = cls.__table__  # type: ignore[attr-defined]
+        stmt = (
+            update(table)
+            .where(
+                table.c.uid == bindparam("b_uid"),
+                table.c.bot_id == bindparam("b_bot_id"),
+            )
+            .values(
+                latest_record=func.coalesce(
+                    bindparam("b_sol", type_=String), table.c.latest_record
+                ),
+                latest_tdm_record=func.coalesce(
+                    bindparam("b_tdm", type_=String), table.c.latest_tdm_record
+                ),
+            )
+        )
+        rows = [
+            {"b_uid": uid, "b_bot_id": bot_id, "b_sol": sol, "b_tdm": tdm}
+            for (uid, bot_id), (sol, tdm) in records.items()
+        ]
+        conn = await session.connection()
+        await conn.execute(stmt, rows)
+        await session.commit()
+        return len(rows)
+
     @classmethod
     @with_session
     async def get_user_cookie_by_uid(
@@ -212,6 +301,147 @@ class DFUser(User, table=True):
         )
 
 
+class DFPriceHistory(BaseIDModel, table=True):
+    """物品小时均价历史, 每个物品每个整点一条"""
+
+    __table_args__ = (Index("ix_dfpricehistory_item_ts", "item_id", "ts", unique=True),)
+
+    item_id: str = Field(title="物品id")
+    ts: int = Field(index=True, title="统计整点时间戳")
+    price: float = Field(title="小时均价")
+
+    @classmethod
+    @with_session
+    async def append_samples(
+        cls,
+        session: AsyncSession,
+        samples: PriceSamples,
+    ) -> int:
+        """批量追加均价样本, 已存在的 (物品id, 整点) 跳过, 返回写入的行数"""
+        if not samples:
+            return 0
+        existing = set()
+        for ts in {ts for ts, _ in samples}:
+            ids = [item_id for t, item_id in samples if t == ts]
+            for chunk in _chunks(ids):
+                result = await session.execute(
+                    select(cls.item_id).where(cls.ts == ts, col(cls.item_id).in_(chunk))
+                )
+                existing.update((ts, item_id) for item_id in result.scalars().all())
+        rows = [
+            {"item_id": item_id, "ts": ts, "price": price}
+            for (ts, item_id), price in samples.items()
+            if (ts, item_id) not in existing
+        ]
+        if rows:
+            conn = await session.connection()
+            await conn.execute(insert(cls.__table__), rows)  # type: ignore[attr-defined]
+            await session.commit()
+        return len(rows)
+
+    @classmethod
+    @with_session
+    async def get_series(
+        cls,
+        session: AsyncSession,
+        item_id: str,
+        since: int,
+    ) -> List[Tuple[int, float]]:
+        """按时间顺序获取物品自 since 起的 (整点时间戳, 均价)"""
+        result = await session.execute(
+            select(cls.ts, cls.price)
+            .where(cls.item_id == item_id, cls.ts >= since)
+            .order_by(col(cls.ts))
+        )
+        return [(ts, price) for ts, price in result.all()]
+
+    @classmethod
+    @with_session
+    async def prune(cls, session: AsyncSession, before: int) -> int:
+        """删除 before 之前的样本, 返回删除的行数"""
+        result = await session.execute(delete(cls).where(col(cls.ts) < before))
+        await session.commit()
+        return result.rowcount or 0
+
+
+class DFProfitHistory(BaseIDModel, table=True):
+    """特勤处制造利润历史, 每个工作台的每个产物每个整点一条"""
+
+    __table_args__ = (
+        Index(
+            "ix_dfprofithistory_item_place_ts", "item_id", "place", "ts", unique=True
+        ),
+    )
+
+    place: str = Field(title="特勤处")
+    level: int = Field(default=0, title="工作台等级")
+    item_id: str = Field(title="产物id")
+    ts: int = Field(index=True, title="统计整点时间戳")
+    profit: float = Field(title="单次利润")
+    profit_per_hour: float = Field(title="每小时利润")
+
+    @classmethod
+    @with_session
+    async def append_samples(
+        cls,
+        session: AsyncSession,
+        samples: ProfitSamples,
+    ) -> int:
+        """批量追加利润样本, 已存在的 (产物id, 特勤处, 整点) 跳过, 返回写入的行数"""
+        if not samples:
+            return 0
+        existing = set()
+        for ts in {ts for ts, _, _ in samples}:
+            result = await session.execute(
+                select(cls.place, cls.item_id).where(cls.ts == ts)
+            )
+            existing.update((ts, place, item_id) for place, item_id in result.all())
+        rows = [
+            {
+                "place": place,
+                "level": level,
+                "item_id": item_id,
+                "ts": ts,
+                "profit": profit,
+                "profit_per_hour": per_hour,
+            }
+            for (ts, place, item_id), (level, profit, per_hour) in samples.items()
+            if (ts, place, item_id) not in existing
+        ]
+        if rows:
+            conn = await session.connection()
+            await conn.execute(insert(cls.__table__), rows)  # type: ignore[attr-defined]
+            await session.commit()
+        return len(rows)
+
+    @classmethod
+    @with_session
+    async def get_series(
+        cls,
+        session: AsyncSession,
+        item_id: str,
+        since: int,
+    ) -> List[Tuple[int, str, float, float]]:
+        """按时间顺序获取产物自 since 起的 (整点时间戳, 特勤处, 单次利润, 每小时利润)"""
+        result = await session.execute(
+            select(cls.ts, cls.place, cls.profit, cls.profit_per_hour)
+            .where(cls.item_id == item_id, cls.ts >= since)
+            .order_by(col(cls.ts))
+        )
+        return [
+            (ts, place, profit, per_hour)
+            for ts, place, profit, per_hour in result.all()
+        ]
+
+    @classmethod
+    @with_session
+    async def prune(cls, session: AsyncSession, before: int) -> int:
+        """删除 before 之前的样本, 返回删除的行数"""
+        result = await session.execute(delete(cls).where(col(cls.ts) < before))
+        await session.commit()
+        return result.rowcount or 0
+
+
 @site.register_admin
 class DFBindadmin(GsAdminModel):
     pk_name = "id"
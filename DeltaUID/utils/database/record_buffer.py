@@ -0,0 +1,85 @@
+import asyncio
+from typing import Dict, Tuple, Optional
+
+from gsuid_core.logger import logger
+
+from .models import DFUser, RecordPointers
+
+RecordKey = Tuple[str, str]
+Pointer = Tuple[Optional[str], Optional[str]]
+
+
+class RecordPointerBuffer:
+    """最新战绩id的写回缓冲
+
+    内存中保存每个 (uid, bot_id) 的最新烽火/战场战绩id, 只有值变化时才标记为脏,
+    由 flush 在一次批量 UPDATE 中写回数据库; 写回失败的条目保留到下次再写.
+    """
+
+    def __init__(self):
+        self._pointers: Dict[RecordKey, Pointer] = {}
+        self._dirty: Dict[RecordKey, Pointer] = {}
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pointers)
+
+    @property
+    def dirty(self) -> int:
+        return len(self._dirty)
+
+    def get(self, uid: str, bot_id: str, user_data: Optional[DFUser] = None) -> Pointer:
+        """读取最新战绩id, 缓冲中没有时以数据库中的用户数据为准"""
+        key = (uid, bot_id)
+        pointer = self._pointers.get(key)
+        if pointer is None:
+            pointer = (
+                (user_data.latest_record, user_data.latest_tdm_record)
+                if user_data
+                else (None, None)
+            )
+            self._pointers[key] = pointer
+        return pointer
+
+    def set(
+        self,
+        uid: str,
+        bot_id: str,
+        latest_record: Optional[str] = None,
+        latest_tdm_record: Optional[str] = None,
+    ) -> bool:
+        """更新最新战绩id, None 表示保留原值; 返回是否产生了变化"""
+        key = (uid, bot_id)
+        old_sol, old_tdm = self._pointers.get(key, (None, None))
+        pointer = (
+            old_sol if latest_record is None else latest_record,
+            old_tdm if latest_tdm_record is None else latest_tdm_record,
+        )
+        if pointer == (old_sol, old_tdm):
+            return False
+        self._pointers[key] = pointer
+        self._dirty[key] = pointer
+        return True
+
+    async def flush(self) -> int:
+        """将所有脏条目批量写回数据库, 返回写回的条目数"""
+        async with self._lock:
+            if not self._dirty:
+                return 0
+            pending: RecordPointers = self._dirty
+            self._dirty = {}
+            try:
+                count = await DFUser.update_records(pending)
+            except Exception as e:
+                # 期间若有更新的值以新值为准
+                for key, pointer in pending.items():
+                    self._dirty.setdefault(key, pointer)
+                logger.error(
+                    f"[DF] 写回最新战绩记录失败, 共 {len(pending)} 条待下次重试: {e}"
+                )
+                return 0
+            logger.debug(f"[DF] 已写回 {count} 条最新战绩记录")
+            return count
+
+
+record_buffer = RecordPointerBuffer()
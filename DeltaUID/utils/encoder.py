@@ -0,0 +1,135 @@
+import io
+import time
+from typing import Any, Dict, List, Iterable, Optional
+from dataclasses import dataclass
+
+from PIL import Image
+
+from .render_pool import encode_image
+from .const import RENDER_ENCODE_PRESETS
+
+# 超出目标字节数时依次尝试的质量降档与最小缩放比例
+QUALITY_STEP = 15
+MIN_QUALITY = 60
+MIN_SCALE = 0.5
+MAX_SCALE_STEPS = 3
+
+
+@dataclass(frozen=True)
+class EncodePreset:
+    """出图编码参数"""
+
+    format: str = "DEFAULT"
+    """JPEG / WEBP / PNG, DEFAULT 沿用 gsuid_core 的 convert_img"""
+    quality: int = 85
+    """JPEG/WEBP 质量"""
+    colors: int = 0
+    """PNG 调色板颜色数, 0 为真彩色"""
+    max_bytes: int = 0
+    """目标字节数, 超出时先降质量再缩小尺寸; 0 为不限制"""
+
+
+PRESETS: Dict[str, EncodePreset] = {
+    name: EncodePreset(**cfg) for name, cfg in RENDER_ENCODE_PRESETS.items()
+}
+
+
+def get_preset(name: str) -> EncodePreset:
+    return PRESETS.get(name, EncodePreset())
+
+
+def _save(img: Image.Image, preset: EncodePreset, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    if preset.format == "JPEG":
+        img.convert("RGB").save(
+            buffer,
+            "JPEG",
+            quality=quality,
+            optimize=True,
+            progressive=True,
+            subsampling=0,
+        )
+    elif preset.format == "WEBP":
+        img.convert("RGB").save(buffer, "WEBP", quality=quality, method=4)
+    elif preset.colors:
+        # 文字卡片颜色很少, 快速八叉树量化与 optimize 的体积相差无几但快数倍
+        img.convert("RGB").quantize(preset.colors, Image.Quantize.FASTOCTREE).save(
+            buffer, "PNG"
+        )
+    else:
+        img.convert("RGB").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _quality_tiers(preset: EncodePreset) -> List[int]:
+    if preset.format not in ("JPEG", "WEBP"):
+        return [preset.quality]
+    return [preset.quality] + (
+        [max(MIN_QUALITY, preset.quality - QUALITY_STEP)]
+        if preset.quality > MIN_QUALITY
+        else []
+    )
+
+
+def encode(img: Image.Image, preset: EncodePreset) -> bytes:
+    """按预设编码图片; 设置了 max_bytes 时先逐档降低质量, 仍超出则按比例缩小后重试"""
+    if preset.format == "DEFAULT":
+        return encode_image(img)
+
+    data = b""
+    scaled = img
+    for step in range(MAX_SCALE_STEPS + 1):
+        for quality in _quality_tiers(preset):
+            data = _save(scaled, preset, quality)
+            if not preset.max_bytes or len(data) <= preset.max_bytes:
+                return data
+        if step == MAX_SCALE_STEPS:
+            break
+        # 体积约与像素数成正比, 按面积比估算缩放并留出余量
+        scale = max(
+            MIN_SCALE,
+            (scaled.width / img.width) * (preset.max_bytes / len(data)) ** 0.5 * 0.95,
+        )
+        size = (int(img.width * scale), int(img.height * scale))
+        if size == scaled.size:
+            break
+        scaled = img.resize(size, Image.Resampling.LANCZOS)
+    return data
+
+
+def encode_card(img: Image.Image, card: str) -> bytes:
+    """按卡片类型对应的预设编码"""
+    return encode(img, get_preset(card))
+
+
+def benchmark(
+    img: Image.Image,
+    presets: Optional[Dict[str, EncodePreset]] = None,
+    repeat: int = 3,
+) -> List[Dict[str, Any]]:
+    """比较各预设对同一张图片的编码耗时与体积"""
+    results = []
+    for name, preset in (presets or {"default": EncodePreset(), **PRESETS}).items():
+        costs = []
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            data = encode(img, preset)
+            costs.append(time.perf_counter() - start)
+        results.append(
+            {
+                "preset": name,
+                "format": preset.format,
+                "bytes": len(data),
+                "ms": round(min(costs) * 1000, 1),
+            }
+        )
+    return results
+
+
+def format_benchmark(title: str, results: Iterable[Dict[str, Any]]) -> str:
+    lines = [title]
+    for r in results:
+        lines.append(
+            f"{r['preset']}({r['format']}): {r['bytes'] / 1024:.0f}KB {r['ms']}ms"
+        )
+    return "\n".join(lines)
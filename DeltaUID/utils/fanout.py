@@ -0,0 +1,119 @@
+import time
+import heapq
+import asyncio
+from typing import (
+    Any,
+    List,
+    Tuple,
+    Generic,
+    TypeVar,
+    Callable,
+    Iterable,
+    Optional,
+    Awaitable,
+)
+from dataclasses import field, dataclass
+
+from gsuid_core.logger import logger
+
+from .metrics import metrics
+from .const import NOTIFY_WORKERS, NOTIFY_USER_TIMEOUT, NOTIFY_SLOWEST_COUNT
+
+T = TypeVar("T")
+
+
+@dataclass
+class TickReport:
+    """单轮扇出执行报告"""
+
+    name: str
+    wall_time: float = 0.0
+    total: int = 0
+    processed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    slowest: List[Tuple[float, str]] = field(default_factory=list)
+
+    def summary(self) -> str:
+        slowest = ", ".join(f"{key}({cost:.2f}s)" for cost, key in self.slowest) or "无"
+        return (
+            f"[DF][{self.name}] 本轮耗时 {self.wall_time:.2f}s, "
+            f"处理 {self.processed}/{self.total} 个用户, 成功 {self.succeeded}, "
+            f"失败 {self.failed}, 超时 {self.timed_out}, 最慢: {slowest}"
+        )
+
+
+class FanoutExecutor(Generic[T]):
+    """有界并发扇出执行器
+
+    固定数量的 worker 从队列中取任务执行, 每个任务有独立超时.
+    调用方(DueScheduler 的单个循环)逐批 await, 同一执行器不会并发运行两轮.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: int = NOTIFY_WORKERS,
+        timeout: float = NOTIFY_USER_TIMEOUT,
+        slowest_count: int = NOTIFY_SLOWEST_COUNT,
+    ):
+        self.name = name
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.slowest_count = slowest_count
+        self.last_report: Optional[TickReport] = None
+
+    async def run(
+        self,
+        items: Iterable[T],
+        handler: Callable[[T], Awaitable[Any]],
+        key: Callable[[T], str] = str,
+    ) -> TickReport:
+        """并发执行 handler, 返回本轮报告
+
+        handler 返回 False 视为失败, 其余返回值(包括 None)视为成功.
+        """
+        queue: asyncio.Queue[T] = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+
+        report = TickReport(name=self.name, total=queue.qsize())
+        costs: List[Tuple[float, str]] = []
+        start = time.perf_counter()
+
+        async def worker():
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                item_key = key(item)
+                item_start = time.perf_counter()
+                try:
+                    result = await asyncio.wait_for(handler(item), self.timeout)
+                    if result is False:
+                        report.failed += 1
+                    else:
+                        report.succeeded += 1
+                except asyncio.TimeoutError:
+                    report.timed_out += 1
+                    logger.warning(
+                        f"[DF][{self.name}] 用户 {item_key} 处理超时({self.timeout}s)"
+                    )
+                except Exception as e:
+                    report.failed += 1
+                    logger.exception(f"[DF][{self.name}] 用户 {item_key} 处理异常: {e}")
+                finally:
+                    report.processed += 1
+                    costs.append((time.perf_counter() - item_start, item_key))
+
+        await asyncio.gather(
+            *(worker() for _ in range(min(self.workers, report.total)))
+        )
+
+        report.wall_time = time.perf_counter() - start
+        report.slowest = heapq.nlargest(self.slowest_count, costs)
+        self.last_report = report
+        metrics.observe_tick(self.name, report.wall_time)
+        return report
@@ -0,0 +1,74 @@
+from typing import Any, Dict, Tuple, Union, Iterable
+
+from PIL.ImageFont import FreeTypeFont
+
+from gsuid_core.utils.fonts.fonts import core_font
+
+BBox = Tuple[float, float, float, float]
+# 测量缓存的最大条目数, 超过后整体清空(常用标签会在下次使用时重新测量)
+FONT_METRICS_MAX = 4096
+
+
+class FontManager:
+    """渲染用字体管理
+
+    core_font 每次调用都会从磁盘加载一次字体文件, 这里按字号只加载一次并在所有渲染函数间共享;
+    常用标签的尺寸测量结果同样缓存, 便于排版时直接取用.
+    """
+
+    def __init__(self):
+        self._fonts: Dict[int, FreeTypeFont] = {}
+        self._metrics: Dict[Tuple[str, str, int, str], Union[BBox, float]] = {}
+        self.loads = 0
+
+    def get(self, size: int) -> FreeTypeFont:
+        font = self._fonts.get(size)
+        if font is None:
+            font = self._fonts.setdefault(size, core_font(size))
+            self.loads += 1
+        return font
+
+    def preload(self, sizes: Iterable[int]) -> None:
+        for size in sizes:
+            self.get(size)
+
+    def _measure(
+        self, kind: str, text: str, size: int, anchor: str
+    ) -> Union[BBox, float]:
+        key = (kind, text, size, anchor)
+        value = self._metrics.get(key)
+        if value is None:
+            font = self.get(size)
+            value = (
+                font.getbbox(text, anchor=anchor)
+                if kind == "bbox"
+                else font.getlength(text)
+            )
+            if len(self._metrics) >= FONT_METRICS_MAX:
+                self._metrics.clear()
+            self._metrics[key] = value
+        return value
+
+    def bbox(self, text: str, size: int, anchor: str = "la") -> BBox:
+        """文字的包围盒, 与 ImageDraw.textbbox 在 (0, 0) 处的结果一致"""
+        return self._measure("bbox", text, size, anchor)  # type: ignore[return-value]
+
+    def length(self, text: str, size: int) -> float:
+        """文字的前进宽度"""
+        return self._measure("length", text, size, "")  # type: ignore[return-value]
+
+    def premeasure(self, labels: Iterable[Tuple[str, int]]) -> None:
+        """预先测量常用标签"""
+        for text, size in labels:
+            self.bbox(text, size)
+            self.length(text, size)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sizes": sorted(self._fonts),
+            "loads": self.loads,
+            "measured": len(self._metrics),
+        }
+
+
+fonts = FontManager()
@@ -1,19 +1,15 @@
 from pathlib import Path
-from functools import lru_cache
 
 from PIL import Image
 
+from .resource_manager import assets
+
 TEXT_PATH = Path(__file__).parent / "texture2d"
 
 
-@lru_cache(maxsize=1)
-def get_footer():
-    return Image.open(TEXT_PATH / "footer.png")
+def get_footer() -> Image.Image:
+    return assets.get(TEXT_PATH / "footer.png").copy()
 
 
-@lru_cache(maxsize=1)
-def get_ICON():
-    icon = Image.open(Path(__file__).parents[2] / "ICON.png")
-    if icon.mode != "RGBA":
-        icon = icon.convert("RGBA")
-    return icon
+def get_ICON() -> Image.Image:
+    return assets.get(Path(__file__).parents[2] / "ICON.png").copy()
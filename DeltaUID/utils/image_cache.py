@@ -0,0 +1,90 @@
+import threading
+from typing import Any, Dict, Generic, TypeVar, Hashable, Optional
+from collections import OrderedDict
+
+from PIL import Image
+
+K = TypeVar("K", bound=Hashable)
+
+
+def image_bytes(image: Image.Image) -> int:
+    """解码后图片占用的内存字节数(宽 x 高 x 通道数)"""
+    return image.width * image.height * len(image.getbands())
+
+
+class ImageCache(Generic[K]):
+    """按解码后字节数限制容量的 LRU 图片缓存
+
+    超过 max_bytes 时从最久未使用的条目开始淘汰; 单张超过容量的图片不缓存.
+    线程安全, 可在渲染线程池中共享.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._images: "OrderedDict[K, Image.Image]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._images
+
+    @property
+    def resident_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: K) -> Optional[Image.Image]:
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._images.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def put(self, key: K, image: Image.Image) -> Image.Image:
+        """写入缓存并返回缓存中的图片; 已有同 key 的图片时保留旧图片"""
+        size = image_bytes(image)
+        if size > self.max_bytes:
+            return image
+        with self._lock:
+            old = self._images.get(key)
+            if old is not None:
+                return old
+            self._images[key] = image
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self._bytes -= image_bytes(evicted)
+                self.evictions += 1
+            return image
+
+    def pop(self, key: K) -> Optional[Image.Image]:
+        with self._lock:
+            image = self._images.pop(key, None)
+            if image is not None:
+                self._bytes -= image_bytes(image)
+            return image
+
+    def clear(self) -> None:
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._images),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,180 @@
+import os
+import re
+import json
+import time
+import bisect
+import asyncio
+import difflib
+import unicodedata
+from typing import Dict, List, Iterable, Optional, cast
+from pathlib import Path
+
+from pypinyin import lazy_pinyin
+from gsuid_core.logger import logger
+from gsuid_core.data_store import get_res_path
+
+from .models import ItemIdData
+from .const import ITEM_SEARCH_LIMIT, ITEM_CATALOG_CHECK_INTERVAL
+
+ITEM_JSON_PATH = get_res_path() / "DeltaUID" / "item.json"
+
+_STRIP_PATTERN = re.compile(r"[\s\-_·•()（）\[\]【】<>《》,，.。:：'\"“”/|]+")
+
+
+def normalize_name(name: str) -> str:
+    """统一全半角与大小写, 去掉空白和常见符号"""
+    return _STRIP_PATTERN.sub("", unicodedata.normalize("NFKC", name).lower())
+
+
+def pinyin_name(name: str) -> str:
+    """名称的全拼"""
+    return "".join(lazy_pinyin(normalize_name(name)))
+
+
+class ItemCatalog:
+    """物品目录: 按 objectID / 名称 / 规范化名称(含拼音) 建立索引
+
+    首次使用时加载 item.json, 之后按 ITEM_CATALOG_CHECK_INTERVAL 检查文件修改时间,
+    文件被更新后自动重新加载. 写入统一走 save, 先写临时文件再原子替换.
+    """
+
+    def __init__(
+        self,
+        path: Path = ITEM_JSON_PATH,
+        check_interval: float = ITEM_CATALOG_CHECK_INTERVAL,
+    ):
+        self.path = path
+        self.check_interval = check_interval
+        self.items: List[ItemIdData] = []
+        self.by_id: Dict[str, ItemIdData] = {}
+        self.by_name: Dict[str, ItemIdData] = {}
+        self.by_normalized: Dict[str, ItemIdData] = {}
+        self._keys: List[str] = []
+        self._mtime: Optional[float] = None
+        self._checked = 0.0
+        self.lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        self._maybe_reload()
+        return len(self.by_id)
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if self._mtime is not None and now - self._checked < self.check_interval:
+            return
+        self._checked = now
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, mode="r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"[DF] 读取物品目录 {self.path} 失败: {e}")
+            return
+        self._mtime = mtime
+        self.load(cast(List[ItemIdData], data))
+        logger.debug(f"[DF] 已加载物品目录, 共 {len(self.by_id)} 个物品")
+
+    def load(self, items: Iterable[ItemIdData]) -> None:
+        """用给定的物品列表重建全部索引, 同一 objectID 以先出现的为准"""
+        by_id: Dict[str, ItemIdData] = {}
+        by_name: Dict[str, ItemIdData] = {}
+        by_normalized: Dict[str, ItemIdData] = {}
+        for item in items:
+            object_id = str(item.get("objectID", ""))
+            if not object_id or object_id in by_id:
+                continue
+            by_id[object_id] = item
+            name = item.get("objectName", "")
+            if not name:
+                continue
+            by_name.setdefault(name, item)
+            by_normalized.setdefault(normalize_name(name), item)
+            pinyin = pinyin_name(name)
+            if pinyin:
+                by_normalized.setdefault(pinyin, item)
+        self.items = list(by_id.values())
+        self.by_id = by_id
+        self.by_name = by_name
+        self.by_normalized = by_normalized
+        self._keys = sorted(by_normalized)
+
+    async def save(self, items: List[ItemIdData]) -> None:
+        """原子写入 item.json 并重建索引, 并发保存按顺序进行"""
+        async with self.lock:
+            await asyncio.to_thread(self._write, items)
+            self.load(items)
+            self._mtime = self.path.stat().st_mtime
+            self._checked = time.monotonic()
+
+    def _write(self, items: List[ItemIdData]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, mode="w", encoding="utf-8") as f:
+            json.dump(items, f, ensure_ascii=False, indent=4)
+        os.replace(tmp, self.path)
+
+    def get(self, object_id: str | int) -> Optional[ItemIdData]:
+        """按 objectID 查找物品"""
+        self._maybe_reload()
+        return self.by_id.get(str(object_id))
+
+    def find(self, name: str) -> Optional[ItemIdData]:
+        """按名称查找物品: 先精确匹配, 再按规范化名称/拼音匹配"""
+        self._maybe_reload()
+        name = name.strip()
+        item = self.by_name.get(name)
+        if item is not None:
+            return item
+        item = self.by_normalized.get(normalize_name(name))
+        if item is None:
+            pinyin = pinyin_name(name)
+            if pinyin:
+                item = self.by_normalized.get(pinyin)
+        return item
+
+    def search(self, query: str, limit: int = ITEM_SEARCH_LIMIT) -> List[ItemIdData]:
+        """模糊搜索物品: 依次按 精确 -> 前缀 -> 包含 -> 相似度 匹配, 结果按 objectID 去重"""
+        item = self.find(query)
+        if item is not None:
+            return [item]
+
+        keys = {normalize_name(query), pinyin_name(query)}
+        keys.discard("")
+
+        results: Dict[str, ItemIdData] = {}
+
+        def add(key: str) -> bool:
+            item = self.by_normalized[key]
+            results.setdefault(str(item["objectID"]), item)
+            return len(results) >= limit
+
+        for key in keys:
+            index = bisect.bisect_left(self._keys, key)
+            while index < len(self._keys) and self._keys[index].startswith(key):
+                if add(self._keys[index]):
+                    return list(results.values())
+                index += 1
+        if results:
+            return list(results.values())
+
+        for candidate in self._keys:
+            if any(key in candidate for key in keys) and add(candidate):
+                break
+        if results:
+            return list(results.values())
+
+        for key in keys:
+            for candidate in difflib.get_close_matches(
+                key, self._keys, n=limit, cutoff=0.6
+            ):
+                if add(candidate):
+                    break
+        return list(results.values())[:limit]
+
+
+item_catalog = ItemCatalog()
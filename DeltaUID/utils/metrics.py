@@ -0,0 +1,139 @@
+import json
+import math
+import time
+from typing import Any, Dict, List, Tuple, Union, Iterator, Optional
+from pathlib import Path
+from contextlib import contextmanager
+from collections import deque
+
+from .const import METRICS_TICK_SAMPLES, METRICS_ENDPOINT_SAMPLES
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """最近秩法计算百分位数, values 需已排序"""
+    if not values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(values)) - 1)
+    return values[index]
+
+
+class EndpointMetrics:
+    """单个接口的指标, 最近 size 次请求保存在环形缓冲区中"""
+
+    def __init__(self, size: int = METRICS_ENDPOINT_SAMPLES):
+        # (完成时间, 耗时秒, 是否成功, 重试次数)
+        self.samples: "deque[Tuple[float, float, bool, int]]" = deque(maxlen=size)
+        self.total = 0
+        self.errors = 0
+        self.retries = 0
+
+    def record(self, elapsed: float, ok: bool, retries: int = 0) -> None:
+        self.samples.append((time.time(), elapsed, ok, retries))
+        self.total += 1
+        self.errors += 0 if ok else 1
+        self.retries += retries
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, Any]:
+        now = time.time() if now is None else now
+        samples = list(self.samples)
+        costs = sorted(s[1] for s in samples)
+        errors = sum(1 for s in samples if not s[2])
+        return {
+            "total": self.total,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rpm": sum(1 for s in samples if now - s[0] <= 60),
+            "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+            "p50_ms": round(percentile(costs, 50) * 1000, 1),
+            "p95_ms": round(percentile(costs, 95) * 1000, 1),
+            "p99_ms": round(percentile(costs, 99) * 1000, 1),
+        }
+
+
+class TickMetrics:
+    """定时任务单轮耗时, 最近 size 轮保存在环形缓冲区中"""
+
+    def __init__(self, size: int = METRICS_TICK_SAMPLES):
+        # (完成时间, 耗时秒)
+        self.samples: "deque[Tuple[float, float]]" = deque(maxlen=size)
+
+    def record(self, elapsed: float) -> None:
+        self.samples.append((time.time(), elapsed))
+
+    def summary(self) -> Dict[str, Any]:
+        costs = sorted(s[1] for s in self.samples)
+        last_at, last = self.samples[-1] if self.samples else (0.0, 0.0)
+        return {
+            "ticks": len(costs),
+            "last_s": round(last, 3),
+            "last_at": int(last_at),
+            "p50_s": round(percentile(costs, 50), 3),
+            "p95_s": round(percentile(costs, 95), 3),
+            "max_s": round(costs[-1], 3) if costs else 0.0,
+        }
+
+
+class MetricsRegistry:
+    """进程内指标登记表: 接口请求与定时任务耗时"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self.ticks: Dict[str, TickMetrics] = {}
+
+    def observe(
+        self, endpoint: str, elapsed: float, ok: bool, retries: int = 0
+    ) -> None:
+        """记录一次接口请求, 签名与 MetricsMiddleware 的回调一致"""
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        metrics.record(elapsed, ok, retries)
+
+    def observe_tick(self, name: str, elapsed: float) -> None:
+        """记录一轮定时任务耗时"""
+        metrics = self.ticks.get(name)
+        if metrics is None:
+            metrics = self.ticks[name] = TickMetrics()
+        metrics.record(elapsed)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """统计 with 块耗时并记为一轮定时任务"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_tick(name, time.perf_counter() - start)
+
+    def endpoint_summary(self) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        return {name: m.summary(now) for name, m in sorted(self.endpoints.items())}
+
+    def tick_summary(self) -> Dict[str, Dict[str, Any]]:
+        return {name: m.summary() for name, m in sorted(self.ticks.items())}
+
+    def snapshot(self, **extra: Any) -> Dict[str, Any]:
+        """当前全部指标的快照, extra 中的内容(如缓存/限流统计)一并附带"""
+        return {
+            "time": int(time.time()),
+            "uptime": int(time.time() - self.started),
+            "endpoints": self.endpoint_summary(),
+            "ticks": self.tick_summary(),
+            **extra,
+        }
+
+    def dump(
+        self, path: Union[str, Path], snapshot: Optional[Dict[str, Any]] = None
+    ) -> Path:
+        """将快照写入 JSON 文件, 未传入 snapshot 时使用当前快照"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(snapshot or self.snapshot(), ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        return path
+
+
+metrics = MetricsRegistry()
@@ -220,6 +220,8 @@ class TQCData(TypedDict):
     """剩余时间"""
     finish_time: str
     """完成时间"""
+    push_time: int
+    """完成时间戳, 空闲时为 0"""
     object_id: str
     """物品id"""
 
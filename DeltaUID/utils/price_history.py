@@ -0,0 +1,281 @@
+import time
+import asyncio
+import datetime
+from typing import Any, Dict, List, Tuple, Iterable, Optional
+from dataclasses import field, dataclass
+
+from gsuid_core.logger import logger
+
+from .models import TQCPriceData, PlaceWithProfitData
+from .const import (
+    PRICE_MA_WINDOWS,
+    PRICE_HOUR_GRACE,
+    PRICE_HISTORY_DAYS,
+    PRICE_TREND_HOURS,
+    PRICE_SELL_MIN_DAYS,
+)
+from .database.models import (
+    PriceSamples,
+    ProfitSamples,
+    DFPriceHistory,
+    DFProfitHistory,
+)
+
+# 一天内至少有这么多个整点样本才参与最佳出售时段的计算
+_MIN_SAMPLES_PER_DAY = 6
+
+
+def stat_hour(now: Optional[float] = None) -> int:
+    """当前可用的小时均价所属的整点时间戳"""
+    now = time.time() if now is None else now
+    return int((now - PRICE_HOUR_GRACE) // 3600 * 3600)
+
+
+def moving_average(values: List[float], window: int) -> List[float]:
+    """尾随移动平均, 前 window-1 个点按已有的样本数平均"""
+    result: List[float] = []
+    total = 0.0
+    for i, value in enumerate(values):
+        total += value
+        if i >= window:
+            total -= values[i - window]
+        result.append(total / min(i + 1, window))
+    return result
+
+
+def best_sell_hours(
+    series: List[Tuple[int, float]], limit: int = 3
+) -> List[Tuple[int, float]]:
+    """按一天中的小时统计相对当日均价的平均溢价, 返回溢价为正且最高的 [(小时, 溢价比例)]
+
+    样本不足 PRICE_SELL_MIN_DAYS 天时返回空列表.
+    """
+    days: Dict[datetime.date, List[Tuple[int, float]]] = {}
+    for ts, price in series:
+        dt = datetime.datetime.fromtimestamp(ts)
+        days.setdefault(dt.date(), []).append((dt.hour, price))
+
+    premiums: Dict[int, List[float]] = {}
+    used = 0
+    for samples in days.values():
+        if len(samples) < _MIN_SAMPLES_PER_DAY:
+            continue
+        mean = sum(price for _, price in samples) / len(samples)
+        if mean <= 0:
+            continue
+        used += 1
+        for hour, price in samples:
+            premiums.setdefault(hour, []).append(price / mean - 1)
+    if used < PRICE_SELL_MIN_DAYS:
+        return []
+
+    averaged = ((hour, sum(v) / len(v)) for hour, v in premiums.items())
+    ranked = sorted((x for x in averaged if x[1] > 0), key=lambda x: x[1], reverse=True)
+    return ranked[:limit]
+
+
+def iter_place_profits(data: TQCPriceData) -> Iterable[Tuple[int, PlaceWithProfitData]]:
+    """遍历特勤处数据中各等级工作台的可制造物品, 产出 (等级, 利润数据)"""
+    for entry in data.get("list", []):
+        props = entry.get("placeDetail", {}).get("unlock", {}).get("props")
+        if isinstance(props, dict):
+            props = [props]
+        for prop in props or []:
+            if isinstance(prop, dict) and prop.get("objectID"):
+                yield entry.get("level", 0), prop
+
+
+def _number(value) -> float:
+    """上游字段可能缺失、为 None 或字符串, 无法转换时按 0 处理"""
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def recipe_inputs(
+    prop: PlaceWithProfitData, relate: Dict[str, Any]
+) -> Tuple[float, float, float, float, float]:
+    """单个配方的 (售价, 材料成本, 手续费, 保证金, 制造时长)
+
+    缺失的售价/成本用 relateMap 均价补全.
+    """
+
+    def avg_price(object_id) -> float:
+        item = relate.get(str(object_id))
+        if not isinstance(item, dict):
+            return 0.0
+        return _number(item.get("avgPrice"))
+
+    sale = _number(prop.get("salePrice"))
+    if not sale:
+        per_count = max(_number(prop.get("perCount")), 1)
+        sale = avg_price(prop.get("objectID")) * per_count
+    cost = _number(prop.get("costPrice"))
+    if not cost:
+        cost = sum(
+            avg_price(req.get("objectID")) * _number(req.get("count"))
+            for req in prop.get("required") or []
+            if isinstance(req, dict)
+        )
+    fee = _number(prop.get("fee"))
+    bail = _number(prop.get("bail"))
+    return sale, cost, fee, bail, _number(prop.get("period"))
+
+
+def craft_profit(
+    prop: PlaceWithProfitData, relate: Dict[str, Any]
+) -> Tuple[float, float]:
+    """单次制造利润(售价-成本-手续费)与每小时利润, 与利润排行同一算法"""
+    sale, cost, fee, _, period = recipe_inputs(prop, relate)
+    profit = sale - cost - fee
+    return profit, profit / period if period > 0 else 0.0
+
+
+@dataclass
+class PriceTrend:
+    """物品价格趋势"""
+
+    item_id: str
+    series: List[Tuple[int, float]]
+    moving_averages: Dict[int, float] = field(default_factory=dict)
+    """窗口(小时) -> 最新的移动平均"""
+    best_hours: List[Tuple[int, float]] = field(default_factory=list)
+    """[(小时, 平均溢价比例)]"""
+
+    @property
+    def first(self) -> float:
+        return self.series[0][1]
+
+    @property
+    def last(self) -> float:
+        return self.series[-1][1]
+
+    @property
+    def low(self) -> float:
+        return min(price for _, price in self.series)
+
+    @property
+    def high(self) -> float:
+        return max(price for _, price in self.series)
+
+    @property
+    def change(self) -> float:
+        """区间涨跌幅"""
+        return self.last / self.first - 1 if self.first else 0.0
+
+
+class PriceHistory:
+    """物品均价与特勤处利润的本地时序存储
+
+    查价和定时任务得到的数据先按 (整点, 物品) 暂存在内存中, 由 flush 批量追加到数据库;
+    趋势/移动平均/最佳出售时段都只读本地数据, 不再请求上游.
+    """
+
+    def __init__(self):
+        self._prices: PriceSamples = {}
+        self._profits: ProfitSamples = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._prices) + len(self._profits)
+
+    def observe_price(
+        self, item_id: str, price: float, ts: Optional[int] = None
+    ) -> None:
+        """记录一个物品的小时均价"""
+        if price > 0:
+            self._prices[(stat_hour() if ts is None else ts, str(item_id))] = price
+
+    def observe_places(
+        self, place: str, data: TQCPriceData, ts: Optional[int] = None
+    ) -> int:
+        """记录一个特勤处的各产物利润及相关物品均价, 返回记录的产物数"""
+        ts = stat_hour() if ts is None else ts
+        relate = data.get("relateMap", {})
+        for object_id, item in relate.items():
+            price = item.get("avgPrice") if isinstance(item, dict) else None
+            if price:
+                self.observe_price(object_id, float(price), ts)
+        count = 0
+        for level, prop in iter_place_profits(data):
+            profit, per_hour = craft_profit(prop, relate)
+            self._profits[(ts, place, str(prop["objectID"]))] = (
+                level,
+                profit,
+                per_hour,
+            )
+            count += 1
+        return count
+
+    async def _append(self, model, samples: dict, pending: dict) -> int:
+        if not samples:
+            return 0
+        try:
+            return await model.append_samples(samples)
+        except Exception as e:
+            # 期间若有更新的值以新值为准
+            for key, value in samples.items():
+                pending.setdefault(key, value)
+            logger.error(
+                f"[DF] 写入{model.__name__}失败, 共 {len(samples)} 条待下次重试: {e}"
+            )
+            return 0
+
+    async def flush(self) -> Tuple[int, int]:
+        """将暂存的样本追加到数据库, 返回写入的 (均价行数, 利润行数)"""
+        async with self._lock:
+            prices, self._prices = self._prices, {}
+            profits, self._profits = self._profits, {}
+            return (
+                await self._append(DFPriceHistory, prices, self._prices),
+                await self._append(DFProfitHistory, profits, self._profits),
+            )
+
+    async def prune(self, days: int = PRICE_HISTORY_DAYS) -> int:
+        """删除超过保留天数的历史"""
+        before = stat_hour() - days * 86400
+        return await DFPriceHistory.prune(before) + await DFProfitHistory.prune(before)
+
+    async def get_series(
+        self, item_id: str, hours: int = PRICE_TREND_HOURS
+    ) -> List[Tuple[int, float]]:
+        """物品最近 hours 小时的均价序列, 包含尚未写入数据库的样本"""
+        since = stat_hour() - hours * 3600
+        series = dict(await DFPriceHistory.get_series(item_id, since))
+        for (ts, pending_id), price in self._prices.items():
+            if pending_id == item_id and ts >= since:
+                series[ts] = price
+        return sorted(series.items())
+
+    async def trend(
+        self, item_id: str, hours: int = PRICE_TREND_HOURS
+    ) -> Optional[PriceTrend]:
+        """物品价格趋势, 没有历史数据时返回 None"""
+        item_id = str(item_id)
+        series = await self.get_series(item_id, hours)
+        if not series:
+            return None
+        prices = [price for _, price in series]
+        return PriceTrend(
+            item_id=item_id,
+            series=series,
+            moving_averages={
+                w: moving_average(prices, w)[-1]
+                for w in PRICE_MA_WINDOWS
+                if len(prices) >= w
+            },
+            best_hours=best_sell_hours(series),
+        )
+
+    async def profit_series(
+        self, item_id: str, hours: int = PRICE_TREND_HOURS
+    ) -> List[Tuple[int, str, float, float]]:
+        """产物最近 hours 小时的特勤处利润序列 [(整点, 特勤处, 单次利润, 每小时利润)]"""
+        return await DFProfitHistory.get_series(
+            str(item_id), stat_hour() - hours * 3600
+        )
+
+
+price_history = PriceHistory()
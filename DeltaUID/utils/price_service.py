@@ -0,0 +1,95 @@
+import time
+import asyncio
+from typing import Dict, List, Tuple, Iterable, Optional
+
+from gsuid_core.logger import logger
+
+from .api.api import DeltaApi
+from .api.coalesce import SingleFlight
+from .price_history import price_history
+from .const import PRICE_HOUR_GRACE, PRICE_CACHE_MAX_ITEMS, PRICE_QUERY_CONCURRENCY
+
+
+def next_stat_hour(now: Optional[float] = None) -> float:
+    """下一个整点统计时刻(留出 PRICE_HOUR_GRACE 秒给上游出数)"""
+    now = time.time() if now is None else now
+    return (now - PRICE_HOUR_GRACE) // 3600 * 3600 + 3600 + PRICE_HOUR_GRACE
+
+
+class PriceService:
+    """物品小时均价服务
+
+    批量查询时以全局有界并发逐个请求 get_item_hour_price, 结果缓存到下一个整点统计时刻;
+    同一物品的并发查询只请求一次. 查到的均价同时记入价格历史.
+    """
+
+    def __init__(self, concurrency: int = PRICE_QUERY_CONCURRENCY):
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        # 物品id -> (过期时间, 均价)
+        self._cache: Dict[str, Tuple[float, float]] = {}
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, item_id: str) -> Optional[float]:
+        entry = self._cache.get(item_id)
+        if entry is None or entry[0] <= time.time():
+            return None
+        return entry[1]
+
+    def _store(self, item_id: str, price: float) -> None:
+        now = time.time()
+        if len(self._cache) >= PRICE_CACHE_MAX_ITEMS:
+            self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+        self._cache[item_id] = (next_stat_hour(now), price)
+        price_history.observe_price(item_id, price)
+
+    async def _fetch(
+        self, deltaapi: DeltaApi, access_token: str, openid: str, item_id: str
+    ) -> Optional[float]:
+        async with self._semaphore:
+            res = await deltaapi.get_item_hour_price(access_token, openid, item_id)
+        if not res["status"] or not res["data"]:
+            logger.warning(
+                f"[DF] 获取物品 {item_id} 小时均价失败: {res.get('message', '未知错误')}"
+            )
+            return None
+        try:
+            price = float(res["data"][item_id]["avg_buyprice"])
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"[DF] 物品 {item_id} 小时均价数据格式异常: {res['data']}")
+            return None
+        self._store(item_id, price)
+        return price
+
+    async def get_prices(
+        self,
+        deltaapi: DeltaApi,
+        access_token: str,
+        openid: str,
+        item_ids: Iterable[str],
+    ) -> Dict[str, Optional[float]]:
+        """批量获取物品小时均价, 返回 {物品id: 均价}, 获取失败的为 None"""
+        prices: Dict[str, Optional[float]] = {}
+        missing: List[str] = []
+        for item_id in dict.fromkeys(str(i) for i in item_ids):
+            price = self.cached(item_id)
+            if price is None:
+                missing.append(item_id)
+            else:
+                prices[item_id] = price
+        self.hits += len(prices)
+        self.misses += len(missing)
+
+        async def fetch(item_id: str) -> None:
+            price, _ = await self._flight.do(
+                item_id,
+                lambda: self._fetch(deltaapi, access_token, openid, item_id),
+            )
+            prices[item_id] = price
+
+        await asyncio.gather(*(fetch(item_id) for item_id in missing))
+        return prices
+
+
+price_service = PriceService()
@@ -0,0 +1,114 @@
+import json
+import asyncio
+import hashlib
+import multiprocessing
+from typing import Any, TypeVar, Callable, Optional
+from concurrent.futures.process import BrokenProcessPool
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+
+from PIL import Image
+
+from gsuid_core.logger import logger
+from gsuid_core.utils.image.convert import convert_img
+
+from .const import RENDER_POOL_MODE, RENDER_POOL_WORKERS
+
+T = TypeVar("T")
+
+
+def encode_image(img: Image.Image) -> bytes:
+    """在工作线程/进程中编码图片; convert_img 是协程但不含真实 IO, 直接同步运行"""
+    return asyncio.run(convert_img(img))  # type: ignore[return-value]
+
+
+def image_digest(img: Optional[Image.Image]) -> str:
+    """图片内容的摘要, 用作出图缓存键中头像等图片参数的标识"""
+    if img is None:
+        return ""
+    digest = hashlib.sha1(img.tobytes())
+    digest.update(f"{img.mode}{img.size}".encode())
+    return digest.hexdigest()
+
+
+def content_key(*parts: Any) -> str:
+    """渲染输入(纯数据)的稳定摘要, 字典按键排序"""
+    raw = json.dumps(
+        parts, sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":")
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _ping() -> None:
+    return None
+
+
+class RenderPool:
+    """图片渲染执行器
+
+    PIL 绘图与编码是 CPU 密集的同步操作, 放在事件循环里会阻塞其他命令和后台轮询.
+    渲染任务以纯数据(字典、列表、PIL 图片)为参数提交到线程池或进程池, 返回编码后的字节.
+    默认使用线程池(PIL 的缩放与编码等耗时操作会释放 GIL), 启动时执行一次 warm_up 预加载字体与贴图;
+    进程池的 worker 会以 spawn 方式重新导入整个插件包, 只作为可选模式, 不可用时退回线程池.
+    """
+
+    def __init__(
+        self,
+        warm_up: Optional[Callable[[], None]] = None,
+        mode: str = RENDER_POOL_MODE,
+        workers: int = RENDER_POOL_WORKERS,
+    ):
+        self.warm_up = warm_up
+        self.mode = mode
+        self.workers = max(1, workers)
+        self._executor: Optional[Executor] = None
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def _create(self) -> Executor:
+        if self.mode == "process":
+            try:
+                # spawn 避免在持有锁的多线程进程中 fork
+                return ProcessPoolExecutor(
+                    self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self.warm_up,
+                )
+            except (OSError, ValueError, NotImplementedError) as e:
+                logger.warning(f"[DF] 渲染进程池创建失败, 改用线程池: {e}")
+                self.mode = "thread"
+        return ThreadPoolExecutor(self.workers, thread_name_prefix="df-render")
+
+    def start(self) -> None:
+        """创建执行器并在后台预热所有 worker"""
+        if self._executor is not None:
+            return
+        self._executor = self._create()
+        if self.mode == "process":
+            # 进程按需启动, 提前提交空任务让所有进程完成导入与预热
+            for _ in range(self.workers):
+                self._executor.submit(_ping)
+        elif self.warm_up is not None:
+            # 线程共享同一份缓存, 预热一次即可
+            self._executor.submit(self.warm_up)
+        logger.info(f"[DF] 渲染执行器已启动: {self.mode} x{self.workers}")
+
+    def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """在执行器中运行渲染函数; func 与参数在进程模式下需可被 pickle"""
+        if self._executor is None:
+            self.start()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, func, *args)
+        except BrokenProcessPool as e:
+            logger.warning(f"[DF] 渲染进程池异常退出, 改用线程池: {e}")
+            self.stop()
+            self.mode = "thread"
+            self.start()
+            return await loop.run_in_executor(self._executor, func, *args)
@@ -1,47 +1,122 @@
-from typing import Dict, Optional
+import time
+from typing import Any, Dict, Tuple, Union, Optional
 from pathlib import Path
-from functools import lru_cache
 
 from PIL import Image
 
+from gsuid_core.logger import logger
 
-class ResourceManager:
-    """全局资源管理器 - 统一管理静态资源加载与缓存"""
+from .image_cache import ImageCache
+from .const import (
+    TEXTURE_PATH,
+    RENDER_POOL_MODE,
+    RENDER_POOL_WORKERS,
+    ASSET_CACHE_MAX_BYTES,
+)
 
-    _instance: Optional["ResourceManager"] = None
-    _image_cache: Dict[Path, Image.Image] = {}
-    _base_path: Path = Path()
+Size = Tuple[int, int]
+AssetKey = Tuple[Path, Optional[Size], str]
+TEXTURE_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
 
-    def __new__(cls) -> "ResourceManager":
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._base_path = Path(__file__).parent.parent
-        return cls._instance
+# 命名尺寸变体
+SIZE_VARIANTS: Dict[str, Size] = {
+    "icon_small": (50, 50),  # 仓库资产栏图标
+    "icon_large": (120, 120),  # 日报收益图标、战绩干员头像
+    "item": (250, 250),  # 特勤处生产物品图标
+    "week_bg": (1000, 2300),  # 无战绩的周报背景
+    "week_bg_wide": (2000, 2300),  # 带战绩的周报背景
+    "week_hero": (315, 460),  # 周报干员卡底
+    "week_hero_avatar": (245, 255),  # 周报干员头像
+    "record_map": (844, 120),  # 战绩列表地图条
+    "record_armed": (432, 692),  # 战绩播报干员立绘
+    "record_footer": (800, 104),  # 战绩播报页脚
+}
 
-    @classmethod
-    def get_instance(cls) -> "ResourceManager":
-        return cls()
 
-    def get_texture_path(self, name: str) -> Path:
-        """获取纹理资源路径"""
-        return self._base_path / "Delta_help" / "texture2d" / name
+def process_budget(total: int) -> int:
+    """把所有进程合计的缓存上限平分到当前进程"""
+    if RENDER_POOL_MODE != "process":
+        return total
+    return total // (max(1, RENDER_POOL_WORKERS) + 1)
 
-    @lru_cache(maxsize=32)
-    def load_image(self, path: Path) -> Image.Image:
-        """加载并缓存图片资源"""
-        if path not in self._image_cache:
-            self._image_cache[path] = Image.open(path).convert("RGBA")
-        return self._image_cache[path].copy()
 
-    def get_texture(self, name: str) -> Image.Image:
-        """直接获取纹理图片"""
-        return self.load_image(self.get_texture_path(name))
+class AssetRegistry:
+    """纹理资源注册表 - 统一管理静态图片的解码、缩放与缓存
 
-    def clear_cache(self) -> None:
+    每个 (文件, 尺寸, 模式) 只解码/缩放一次, 返回的图片为共享对象,
+    调用方只能读取或作为 paste 的来源, 需要在其上绘制时先 copy().
+    缓存按解码后字节数限制, 默认为 ASSET_CACHE_MAX_BYTES 在各渲染进程间平分后的份额.
+    """
+
+    def __init__(
+        self,
+        root: Path = TEXTURE_PATH,
+        max_bytes: int = process_budget(ASSET_CACHE_MAX_BYTES),
+    ):
+        self.root = root
+        self.cache: ImageCache[AssetKey] = ImageCache(max_bytes)
+
+    def path(self, name: Union[str, Path]) -> Path:
+        """相对路径按纹理目录解析, 绝对路径原样返回"""
+        path = Path(name)
+        return path if path.is_absolute() else self.root / path
+
+    def _load(self, key: AssetKey) -> Image.Image:
+        path, size, mode = key
+        if size is None:
+            with Image.open(path) as raw:
+                image = raw.convert(mode)
+        else:
+            image = self.get(path, None, mode).resize(size, Image.Resampling.LANCZOS)
+        return self.cache.put(key, image)
+
+    def get(
+        self,
+        name: Union[str, Path],
+        size: Union[Size, str, None] = None,
+        mode: str = "RGBA",
+    ) -> Image.Image:
+        """获取共享的只读图片, size 可以是 (宽, 高) 或 SIZE_VARIANTS 中的名称"""
+        if isinstance(size, str):
+            size = SIZE_VARIANTS[size]
+        key = (self.path(name), size, mode)
+        image = self.cache.get(key)
+        if image is None:
+            image = self._load(key)
+        return image
+
+    def preload(self, root: Optional[Path] = None) -> int:
+        """按目录层级由浅到深解码纹理, 放不下的跳过, 返回新加载的数量; 在渲染 worker 预热时调用"""
+        start = time.perf_counter()
+        count = 0
+        paths = sorted((root or self.root).rglob("*"), key=lambda p: (len(p.parts), p))
+        for path in paths:
+            key = (path, None, "RGBA")
+            if path.suffix.lower() not in TEXTURE_SUFFIXES or key in self.cache:
+                continue
+            try:
+                # 只读文件头估算解码后的大小, 预加载不挤掉已缓存的纹理
+                with Image.open(path) as raw:
+                    size = raw.width * raw.height * 4
+                if self.cache.resident_bytes + size > self.cache.max_bytes:
+                    continue
+                self._load(key)
+                count += 1
+            except OSError as e:
+                logger.warning(f"[DF] 纹理 {path} 加载失败: {e}")
+        logger.debug(
+            f"[DF] 预加载纹理 {count} 张, 占用 {self.cache.resident_bytes / 1024 / 1024:.1f}MB, "
+            f"用时 {time.perf_counter() - start:.2f}s"
+        )
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    def clear(self) -> None:
         """清空资源缓存"""
-        self._image_cache.clear()
-        self.load_image.cache_clear()
+        self.cache.clear()
 
 
 # 全局实例
-resource_manager = ResourceManager.get_instance()
+assets = AssetRegistry()
@@ -0,0 +1,181 @@
+import time
+import heapq
+import asyncio
+import itertools
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Generic,
+    TypeVar,
+    Callable,
+    Hashable,
+    Optional,
+    Awaitable,
+)
+
+from gsuid_core.logger import logger
+
+from .fanout import FanoutExecutor
+from .api.limiter import background_priority
+from .const import SCHEDULER_MIN_SLEEP, SCHEDULER_BATCH_WINDOW, SCHEDULER_SYNC_INTERVAL
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+class DueQueue(Generic[K]):
+    """按到期时间排序的最小堆, 每个 key 只保留最近一次安排的时间
+
+    重新安排时不删除堆中的旧条目, 出堆时与 _due 比对丢弃过期条目.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, K]] = []
+        self._due: Dict[K, float] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._due
+
+    def get(self, key: K) -> Optional[float]:
+        return self._due.get(key)
+
+    def schedule(self, key: K, at: float) -> None:
+        self._due[key] = at
+        heapq.heappush(self._heap, (at, next(self._counter), key))
+        # 旧条目过多时重建堆
+        if len(self._heap) > 4 * len(self._due) + 64:
+            self._heap = [
+                (at, next(self._counter), key) for key, at in self._due.items()
+            ]
+            heapq.heapify(self._heap)
+
+    def remove(self, key: K) -> None:
+        self._due.pop(key, None)
+
+    def next_at(self) -> Optional[float]:
+        while self._heap:
+            at, _, key = self._heap[0]
+            if self._due.get(key) == at:
+                return at
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, until: float) -> List[K]:
+        """取出所有到期时间不晚于 until 的 key"""
+        keys: List[K] = []
+        while self._heap and self._heap[0][0] <= until:
+            at, _, key = heapq.heappop(self._heap)
+            if self._due.get(key) == at:
+                del self._due[key]
+                keys.append(key)
+        return keys
+
+
+class DueScheduler(Generic[K, T]):
+    """按到期时间驱动的后台轮询
+
+    load 定期(SCHEDULER_SYNC_INTERVAL)读取全部订阅项, 新出现的立即到期, 消失的移出队列;
+    循环只在最早到期时间醒来, 把 SCHEDULER_BATCH_WINDOW 内到期的项合并成一批交给
+    FanoutExecutor 执行. handler 内通过 reschedule 安排下一次时间, 未安排的按 default_interval.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        load: Callable[[], Awaitable[Dict[K, T]]],
+        handler: Callable[[K, T], Awaitable[Any]],
+        default_interval: float,
+        after_batch: Optional[Callable[[], Awaitable[Any]]] = None,
+    ):
+        self.name = name
+        self.load = load
+        self.handler = handler
+        self.default_interval = default_interval
+        self.after_batch = after_batch
+        self.queue: DueQueue[K] = DueQueue()
+        self.executor: FanoutExecutor[K] = FanoutExecutor(name)
+        self._items: Dict[K, T] = {}
+        self._next_sync = 0.0
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def reschedule(self, key: K, at: float) -> None:
+        """安排 key 的下一次执行时间, 提前时唤醒循环"""
+        if key not in self._items:
+            return
+        earliest = self.queue.next_at()
+        self.queue.schedule(key, at)
+        if earliest is None or at < earliest:
+            self._wake.set()
+
+    def sync(self, items: Dict[K, T]) -> None:
+        for key in self._items.keys() - items.keys():
+            self.queue.remove(key)
+        for key in items.keys() - self._items.keys():
+            self.queue.schedule(key, 0)
+        self._items = items
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run_one(self, key: K) -> Any:
+        try:
+            return await self.handler(key, self._items[key])
+        finally:
+            if key in self._items and key not in self.queue:
+                self.queue.schedule(key, time.time() + self.default_interval)
+
+    async def tick(self) -> None:
+        """同步订阅项并执行一批到期项"""
+        now = time.time()
+        if now >= self._next_sync:
+            self._next_sync = now + SCHEDULER_SYNC_INTERVAL
+            try:
+                self.sync(await self.load())
+            except Exception as e:
+                logger.exception(f"[DF][{self.name}] 加载订阅失败: {e}")
+
+        due = [
+            key
+            for key in self.queue.pop_due(now + SCHEDULER_BATCH_WINDOW)
+            if key in self._items
+        ]
+        if not due:
+            return
+        with background_priority():
+            report = await self.executor.run(due, self._run_one, key=str)
+        if self.after_batch is not None:
+            await self.after_batch()
+        logger.debug(report.summary())
+
+    async def _loop(self) -> None:
+        logger.info(f"[DF][{self.name}] 调度器已启动")
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.exception(f"[DF][{self.name}] 调度异常: {e}")
+            wake_at = min(self.queue.next_at() or self._next_sync, self._next_sync)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wake.wait(), max(wake_at - time.time(), SCHEDULER_MIN_SLEEP)
+                )
+            except asyncio.TimeoutError:
+                pass
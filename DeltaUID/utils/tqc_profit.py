@@ -0,0 +1,141 @@
+from typing import Dict, List, Tuple, Optional
+from dataclasses import dataclass
+
+from .models import TQCPriceData
+from .const import TQC_PLACES, TQC_RANK_TOP
+from .price_history import recipe_inputs, iter_place_profits
+
+
+@dataclass
+class RankedRecipe:
+    """特勤处配方的利润排行结果"""
+
+    place: str
+    level: int
+    object_id: str
+    name: str
+    cost: float
+    """单次投入(材料成本+手续费+保证金)"""
+    profit: float
+    """单次利润"""
+    period: float
+    """制造时长(小时)"""
+    profit_per_hour: float
+    batches: int
+    """时间限制内可完成的批次数, 不限时间时为 1"""
+    total_profit: float
+    """时间限制内的总利润"""
+
+    @property
+    def place_name(self) -> str:
+        return TQC_PLACES.get(self.place, self.place)
+
+
+class RecipeTable:
+    """全部特勤处配方的列式数据, 每列一个等长列表, 排行时批量计算"""
+
+    def __init__(self):
+        self.places: List[str] = []
+        self.levels: List[int] = []
+        self.object_ids: List[str] = []
+        self.names: List[str] = []
+        self.sale: List[float] = []
+        self.cost: List[float] = []
+        self.fee: List[float] = []
+        self.bail: List[float] = []
+        self.period: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self.object_ids)
+
+    @classmethod
+    def from_places(cls, places: Dict[str, TQCPriceData]) -> "RecipeTable":
+        """由各工作台的 get_place_list_with_profit 数据构建, 缺失的售价/成本用 relateMap 均价补全"""
+        table = cls()
+        for place, data in places.items():
+            relate = data.get("relateMap", {})
+            for level, prop in iter_place_profits(data):
+                object_id = str(prop["objectID"])
+                sale, cost, fee, bail, period = recipe_inputs(prop, relate)
+                item = relate.get(object_id)
+                table.places.append(place)
+                table.levels.append(level)
+                table.object_ids.append(object_id)
+                table.names.append(
+                    item.get("objectName", f"物品{object_id}")
+                    if isinstance(item, dict)
+                    else f"物品{object_id}"
+                )
+                table.sale.append(sale)
+                table.cost.append(cost)
+                table.fee.append(fee)
+                table.bail.append(bail)
+                table.period.append(period)
+        return table
+
+    def compute(
+        self,
+        budget: Optional[float] = None,
+        hours: Optional[float] = None,
+    ) -> Tuple[List[float], List[float], List[int], List[float], List[bool]]:
+        """批量计算 (单次利润, 每小时利润, 批次数, 总利润, 是否满足约束)"""
+        profit = [s - c - f for s, c, f in zip(self.sale, self.cost, self.fee)]
+        per_hour = [p / t if t > 0 else 0.0 for p, t in zip(profit, self.period)]
+        if hours is None:
+            batches = [1] * len(self)
+        else:
+            batches = [int(hours // t) if t > 0 else 0 for t in self.period]
+        total = [p * b for p, b in zip(profit, batches)]
+        mask = [t > 0 and b > 0 for t, b in zip(self.period, batches)]
+        if budget is not None:
+            mask = [
+                m and c + f + b <= budget
+                for m, c, f, b in zip(mask, self.cost, self.fee, self.bail)
+            ]
+        return profit, per_hour, batches, total, mask
+
+
+def rank_recipes(
+    places: Dict[str, TQCPriceData],
+    budget: Optional[float] = None,
+    hours: Optional[float] = None,
+    top: int = TQC_RANK_TOP,
+) -> Dict[str, List[RankedRecipe]]:
+    """按工作台给可制造配方排行
+
+    不限时间时按每小时利润排序; 给定剩余小时数时只保留能在此期间完成的配方,
+    按期间内的总利润排序. 给定预算时过滤掉单次投入超出预算的配方.
+    """
+    table = RecipeTable.from_places(places)
+    profit, per_hour, batches, total, mask = table.compute(budget, hours)
+    score = per_hour if hours is None else total
+
+    ranked: Dict[str, List[RankedRecipe]] = {place: [] for place in places}
+    # 同一工作台的同一产物只保留得分最高的一条(不同等级可能有重复配方)
+    order = sorted(
+        (i for i in range(len(table)) if mask[i]),
+        key=lambda i: (score[i], per_hour[i]),
+        reverse=True,
+    )
+    seen = set()
+    for i in order:
+        place = table.places[i]
+        key = (place, table.object_ids[i])
+        if key in seen or len(ranked[place]) >= top:
+            continue
+        seen.add(key)
+        ranked[place].append(
+            RankedRecipe(
+                place=place,
+                level=table.levels[i],
+                object_id=table.object_ids[i],
+                name=table.names[i],
+                cost=table.cost[i] + table.fee[i] + table.bail[i],
+                profit=profit[i],
+                period=table.period[i],
+                profit_per_hour=per_hour[i],
+                batches=batches[i],
+                total_profit=total[i],
+            )
+        )
+    return ranked